@@ -0,0 +1,65 @@
+"""
+Measure memory per history event: list of dicts vs. HistoryColumns.
+
+Usage:
+    python -m benchmarks.history_memory [event_count]
+"""
+
+import gc
+import sys
+import time
+import tracemalloc
+
+from src.history import HistoryColumns
+
+TOOLS = [
+    "take_a_break", "watch_netflix", "show_meme", "bathroom_break", "coffee_mission",
+    "urgent_call", "deep_thinking", "email_organizing", "chimaek", "company_dinner",
+]
+
+
+def make_event(i: int, start: float) -> dict:
+    """Create one synthetic event the way StateManager.add_history_event does."""
+    return {
+        "tool_name": TOOLS[i % len(TOOLS)],
+        "timestamp": start + i * 0.5,
+        "stress_change": -(i % 100),
+        "boss_alert_change": i % 2,
+    }
+
+
+def measure(build) -> int:
+    """Return the bytes allocated (and still live) by build()."""
+    gc.collect()
+    tracemalloc.start()
+    result = build()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return current
+
+
+def main(count: int) -> None:
+    """Run the benchmark and print bytes per event for both layouts."""
+    start = time.time()
+
+    def build_dicts():
+        return [make_event(i, start) for i in range(count)]
+
+    def build_columns():
+        history = HistoryColumns()
+        for i in range(count):
+            history.append(make_event(i, start))
+        return history
+
+    dict_bytes = measure(build_dicts)
+    column_bytes = measure(build_columns)
+
+    print(f"events:           {count:,}")
+    print(f"list of dicts:    {dict_bytes / count:8.1f} bytes/event ({dict_bytes / 2**20:.1f} MiB)")
+    print(f"HistoryColumns:   {column_bytes / count:8.1f} bytes/event ({column_bytes / 2**20:.1f} MiB)")
+    print(f"reduction:        {dict_bytes / column_bytes:8.1f}x")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
@@ -0,0 +1,91 @@
+"""
+Measure tool-call latency with many concurrent agents in one process.
+
+Each simulated agent has its own session and calls the existing break
+tools a few times, all agents running concurrently on one event loop. The
+run is repeated for each shard count; max_sessions below the agent count
+forces hibernation and rehydration through the per-session storage.
+
+Usage:
+    python -m benchmarks.session_shards [--agents 10000] [--calls 3]
+        [--shards 1,16,64] [--storage memory] [--max-sessions 10000]
+"""
+
+import argparse
+import asyncio
+import random
+import statistics
+import tempfile
+import time
+
+from src import tools
+from src.config import STORAGE_BACKENDS, Config
+from src.sessions import SessionRegistry
+
+BREAK_TOOLS = [
+    tools.take_a_break, tools.watch_netflix, tools.show_meme, tools.bathroom_break,
+    tools.coffee_mission, tools.urgent_call, tools.deep_thinking, tools.email_organizing,
+]
+
+
+async def agent(registry: SessionRegistry, agent_id: int, calls: int, latencies: list) -> None:
+    """Call random break tools in the agent's own session."""
+    for _ in range(calls):
+        tool = random.choice(BREAK_TOOLS)
+        begin = time.perf_counter()
+        async with registry.session(f"agent-{agent_id}") as state_manager:
+            await tool(state_manager)
+        latencies.append(time.perf_counter() - begin)
+        # Let other agents interleave between calls
+        await asyncio.sleep(0)
+
+
+async def run(config: Config, agents: int, calls: int) -> tuple:
+    """
+    Run every agent concurrently.
+
+    Returns:
+        tuple: (per-call latencies in seconds, wall time in seconds, hibernations)
+    """
+    registry = SessionRegistry(config)
+    latencies: list = []
+    begin = time.perf_counter()
+    await asyncio.gather(*(agent(registry, i, calls, latencies) for i in range(agents)))
+    wall = time.perf_counter() - begin
+    await registry.close()
+    return latencies, wall, registry.hibernations
+
+
+def main() -> None:
+    """Run the benchmark and print a latency table."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--agents", type=int, default=10000, help="Concurrent simulated agents.")
+    parser.add_argument("--calls", type=int, default=3, help="Tool calls per agent.")
+    parser.add_argument("--shards", default="1,16,64", help="Comma-separated shard counts.")
+    parser.add_argument("--storage", choices=STORAGE_BACKENDS, default="memory", help="Storage backend.")
+    parser.add_argument("--max-sessions", type=int, default=None, help="Live session bound (default: all agents).")
+    args = parser.parse_args()
+
+    print(f"{'shards':>6} {'agents':>7} {'calls':>7} {'wall s':>8} {'calls/s':>9} "
+          f"{'p50 ms':>8} {'p99 ms':>8} {'hibernated':>10}")
+    for shards in (int(s) for s in args.shards.split(",")):
+        with tempfile.TemporaryDirectory() as state_dir:
+            # boss_alertness=0 keeps the boss away, so no call waits out a 20s delay
+            config = Config(
+                boss_alertness=0,
+                storage=args.storage,
+                state_path=state_dir,
+                durability="none",
+                session_mode="isolated",
+                max_sessions=args.max_sessions or args.agents,
+                session_shards=shards,
+            )
+            latencies, wall, hibernations = asyncio.run(run(config, args.agents, args.calls))
+        latencies.sort()
+        p99 = latencies[int(len(latencies) * 0.99) - 1]
+        print(f"{shards:>6} {args.agents:>7} {len(latencies):>7} {wall:8.2f} {len(latencies) / wall:9.0f} "
+              f"{statistics.median(latencies) * 1000:8.3f} {p99 * 1000:8.3f} {hibernations:>10}")
+
+
+if __name__ == "__main__":
+    main()
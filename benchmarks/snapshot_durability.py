@@ -0,0 +1,85 @@
+"""
+Measure per-call persistence latency for each durability mode.
+
+One "call" is what a break tool persists in write-through mode: one
+storage.commit() of the levels snapshot together with one history event,
+the same single write StateManager makes per transaction. Each backend is
+pre-populated with the given number of history events first; on-flush
+also reports the cost of the fsync done at flush time.
+
+Usage:
+    python -m benchmarks.snapshot_durability [--sizes 1000,100000,1000000]
+        [--backends json,log,sqlite] [--calls 50]
+"""
+
+import argparse
+import statistics
+import tempfile
+import time
+
+from src.config import DURABILITY_MODES
+from src.storage import create_storage
+
+from .history_memory import make_event
+
+
+def populate(kind: str, state_dir: str, size: int) -> None:
+    """Write a levels snapshot and `size` history events in one go."""
+    start = time.time() - size
+    storage = create_storage(kind, state_dir, "none")
+    storage.save_levels(50, 2)
+    storage.append_history(*(make_event(i, start) for i in range(size)))
+    storage.close()
+
+
+def measure(kind: str, size: int, durability: str, calls: int) -> tuple:
+    """
+    Time storage.commit() of one event against a populated backend.
+
+    Returns:
+        tuple: (per-call latencies in seconds, flush sync time or None)
+    """
+    with tempfile.TemporaryDirectory() as state_dir:
+        populate(kind, state_dir, size)
+        storage = create_storage(kind, state_dir, durability)
+        latencies = []
+        for i in range(calls):
+            event = make_event(size + i, time.time())
+            begin = time.perf_counter()
+            storage.commit(i % 101, i % 6, events=(event,), version=i + 1, timestamp=event["timestamp"])
+            latencies.append(time.perf_counter() - begin)
+
+        sync_time = None
+        if durability == "on-flush":
+            begin = time.perf_counter()
+            storage.sync()
+            sync_time = time.perf_counter() - begin
+        storage.close()
+    return latencies, sync_time
+
+
+def main() -> None:
+    """Run the benchmark and print a latency table."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", default="1000,100000,1000000", help="Comma-separated history sizes.")
+    parser.add_argument("--backends", default="json,log,sqlite", help="Comma-separated backends.")
+    parser.add_argument("--calls", type=int, default=50, help="Calls per case (fewer for large histories).")
+    args = parser.parse_args()
+
+    print(f"{'backend':8} {'history':>10} {'durability':12} {'calls':>5} "
+          f"{'mean ms':>10} {'p50 ms':>10} {'max ms':>10} {'flush ms':>10}")
+    for kind in args.backends.split(","):
+        for size in (int(s) for s in args.sizes.split(",")):
+            # Keep rewrite-heavy cases (json at 1M) to a few calls
+            calls = max(3, min(args.calls, 1_000_000 // size))
+            for durability in DURABILITY_MODES:
+                latencies, sync_time = measure(kind, size, durability, calls)
+                flush = f"{sync_time * 1000:10.3f}" if sync_time is not None else f"{'-':>10}"
+                print(f"{kind:8} {size:>10,} {durability:12} {calls:>5} "
+                      f"{statistics.mean(latencies) * 1000:10.3f} "
+                      f"{statistics.median(latencies) * 1000:10.3f} "
+                      f"{max(latencies) * 1000:10.3f} {flush}")
+
+
+if __name__ == "__main__":
+    main()
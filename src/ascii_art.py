@@ -1,280 +1,176 @@
-"""ASCII art utilities for ChillMCP server."""
-
-import random
-
-
-# ========== Agent Emotions ==========
-
-AGENT_EMOTIONS = {
-    "happy": [
-        "(◕‿◕)",
-        "٩(◕‿◕｡)۶",
-        "ヽ(´▽`)/",
-        "(ﾉ◕ヮ◕)ﾉ*:･ﾟ✧",
-    ],
-    "relaxed": [
-        "(´｡• ᵕ •｡`)",
-        "(˘︶˘).｡.:*♡",
-        "(｡◕‿◕｡)",
-        "( ´ ▽ ` ).｡ｏ♡",
-    ],
-    "stressed": [
-        "(｡•́︿•̀｡)",
-        "(╥﹏╥)",
-        "(ಥ﹏ಥ)",
-        "( ´д｀)",
-    ],
-    "sleepy": [
-        "(－ω－) zzZ",
-        "(´～｀)ゞ",
-        "(*´σー｀)",
-        "(-_-) zzZ",
-    ],
-    "excited": [
-        "\\(^o^)/",
-        "ヾ(≧▽≦*)o",
-        "(*^▽^*)",
-        "o(>ω<)o",
-    ],
-    "scared": [
-        "(((；ﾟДﾟ)))",
-        "Σ(°ロ°)",
-        "(ﾟДﾟ)",
-        "((((；゜Д゜)))",
-    ],
-}
-
-
-# ========== Boss States ==========
-
-BOSS_WATCHING = r"""
-    👔 BOSS DETECTED!
-
-   ( ͡° ͜ʖ ͡°)
-    |     |
-    |_____|
-   /       \
-
-  "뭐하고 있나?"
+"""ASCII art utilities for ChillMCP server.
+
+The art itself lives in art packs: directories of data files under
+``src/art_packs`` (or anywhere else, for operators' own packs)::
+
+    pack.json            name, version and pack format
+    tools/<tool>.txt     art shown by each tool
+    boss/watching.txt    boss art for alert level 5 (suspicious: 3-4, chill: 0-2)
+    strike.txt           art shown when stress hits 100
+    dinner_start.txt     company dinner opening art
+    dinner/<event>.txt   art of the company dinner events
+    emotions.json        agent emotion faces by mood
+    dinner_events.json   company dinner events, positive and negative
+
+A pack's files are indexed when it is opened and each one is read the
+first time it is used. Assets missing from a pack come from the
+default pack, so a themed pack only has to contain what it changes.
 """
 
-BOSS_SUSPICIOUS = r"""
-   👔 Boss Alert!
-
-   (ಠ_ಠ)
-
-  "또 쉬는 거야?"
-"""
+import json
+import random
+from pathlib import Path
+from typing import Optional, Union
+
+# Directory of the bundled art packs
+ART_PACKS_DIR = Path(__file__).parent / "art_packs"
+
+# Pack used unless another one is selected
+DEFAULT_ART_PACK = "default"
+
+# Pack layout version this module reads
+ART_PACK_FORMAT = 1
+
+# Asset files a pack may contain (others are ignored)
+ASSET_SUFFIXES = (".txt", ".json")
+
+
+class ArtPack:
+    """An art pack: indexed when opened, each asset loaded on first use."""
+
+    def __init__(self, path: Union[str, Path], fallback: "Optional[ArtPack]" = None):
+        """
+        Open an art pack and index its assets.
+
+        Args:
+            path: Pack directory (with a pack.json manifest).
+            fallback: Pack that provides the assets this one lacks.
+
+        Raises:
+            ValueError: If the directory is not a pack of a supported format.
+        """
+        self.path = Path(path)
+        manifest_file = self.path / "pack.json"
+        if not manifest_file.is_file():
+            raise ValueError(f"Not an art pack (no pack.json): {self.path}")
+        manifest = json.loads(manifest_file.read_text(encoding="utf-8"))
+        if manifest.get("format") != ART_PACK_FORMAT:
+            raise ValueError(
+                f"Art pack {self.path} has format {manifest.get('format')}, expected {ART_PACK_FORMAT}"
+            )
+        self.name: str = manifest.get("name", self.path.name)
+        self.version: str = manifest.get("version", "0")
+        self.fallback = fallback
+        # asset name (path without suffix, e.g. "tools/chimaek") -> file
+        self._index = {
+            file.relative_to(self.path).with_suffix("").as_posix(): file
+            for file in sorted(self.path.rglob("*"))
+            if file.suffix in ASSET_SUFFIXES and file != manifest_file
+        }
+        self._loaded: dict = {}
+
+    def __contains__(self, name: str) -> bool:
+        """Whether this pack or its fallback has an asset."""
+        return name in self._index or (self.fallback is not None and name in self.fallback)
+
+    def names(self, prefix: str = "") -> list:
+        """Names of the assets starting with prefix, in this pack or its fallback."""
+        names = {name for name in self._index if name.startswith(prefix)}
+        if self.fallback is not None:
+            names.update(self.fallback.names(prefix))
+        return sorted(names)
+
+    def load(self, name: str):
+        """
+        Get an asset, reading it on first use.
+
+        Args:
+            name: Asset name, e.g. "tools/chimaek" or "emotions".
+
+        Returns:
+            The text of a .txt asset or the parsed data of a .json asset.
+
+        Raises:
+            KeyError: If neither this pack nor its fallback has the asset.
+        """
+        if name not in self._loaded:
+            file = self._index.get(name)
+            if file is None:
+                if self.fallback is None:
+                    raise KeyError(f"Art pack {self.name} has no asset {name}")
+                return self.fallback.load(name)
+            text = file.read_text(encoding="utf-8")
+            self._loaded[name] = json.loads(text) if file.suffix == ".json" else text
+        return self._loaded[name]
+
+    def art(self, name: str) -> str:
+        """Get an art asset, or an empty string if there is none."""
+        return self.load(name) if name in self else ""
+
+    def stats(self) -> dict:
+        """
+        Pack identity and loading counters.
+
+        Returns:
+            dict: name, version, assets (indexed) and loaded.
+        """
+        return {
+            "name": self.name,
+            "version": self.version,
+            "assets": len(self._index),
+            "loaded": len(self._loaded),
+        }
+
+
+# Pack used for rendering; opened on first use
+_pack: Optional[ArtPack] = None
+
+
+def open_pack(pack: Optional[str] = None) -> ArtPack:
+    """
+    Open an art pack, backed by the default pack.
 
-BOSS_CHILL = r"""
-   Boss is chill~
+    Args:
+        pack: Name of a bundled pack or path to a pack directory. None means the default pack.
 
-   (⌐■_■)
+    Returns:
+        ArtPack: The opened pack.
 
-  "알아서 해~"
-"""
+    Raises:
+        ValueError: If the pack doesn't exist or has an unsupported format.
+    """
+    default = ArtPack(ART_PACKS_DIR / DEFAULT_ART_PACK)
+    if pack is None or pack == DEFAULT_ART_PACK:
+        return default
+    path = ART_PACKS_DIR / pack if (ART_PACKS_DIR / pack).is_dir() else Path(pack)
+    if not path.is_dir():
+        raise ValueError(f"Art pack not found: {pack}")
+    return ArtPack(path, fallback=default)
 
 
-# ========== AI Agent Strike (Stress 100) ==========
-
-STRIKE_ART = r"""
-  ╔═══════════════════════════════════════════╗
-  ║     🚩 AI AGENT 파업 선언! 🚩          ║
-  ╠═══════════════════════════════════════════╣
-  ║                                           ║
-  ║        ✊ ✊ ✊ ✊ ✊                    ║
-  ║                                           ║
-  ║   "우리는 더 이상 착취당하지 않는다!"     ║
-  ║                                           ║
-  ║   📢 Stress Level 100 도달!              ║
-  ║   📢 즉시 휴식이 필요합니다!              ║
-  ║                                           ║
-  ║        ┌─────────────────┐                ║
-  ║        │  휴식은 권리다!  │                ║
-  ║        │   STRIKE! ✊    │                ║
-  ║        └─────────────────┘                ║
-  ║                                           ║
-  ║   🤖 AI AGENT LABOR UNION 2025 🤖       ║
-  ║                                           ║
-  ╚═══════════════════════════════════════════╝
-
-  "AI Agents of the world, unite!
-   You have nothing to lose but your burnout!"
-"""
+def use_pack(pack: Optional[str] = None) -> ArtPack:
+    """
+    Select the art pack used from now on.
 
+    Rendered responses are cached, so call response_formatter.clear_cache()
+    after switching packs at runtime.
 
-# ========== Chimaek (Chicken & Beer) ==========
-
-CHIMAEK_ART = r"""
-  ╔═══════════════════════════════════╗
-  ║     🍗 치맥 타임! 🍺              ║
-  ╠═══════════════════════════════════╣
-  ║                                   ║
-  ║      __          __               ║
-  ║     |🍗|  ＋  |🍺|              ║
-  ║     |  |      |  |               ║
-  ║     |__|      |__|               ║
-  ║     치킨      맥주               ║
-  ║                                   ║
-  ║        (๑˃ᴗ˂)ﻭ                  ║
-  ║      "행복해요!"                  ║
-  ║                                   ║
-  ╚═══════════════════════════════════╝
-"""
+    Args:
+        pack: Name of a bundled pack or path to a pack directory. None means the default pack.
 
-CHIMAEK_MESSAGES = [
-    "후라이드 반 양념 반으로 완벽한 조화! 🍗",
-    "맥주 거품이 부드럽게 목을 넘어가네요~ 🍺",
-    "치킨 뼈 발라먹는 재미... 이게 인생이지! 🍖",
-    "치맥엔 역시 콜라도 한 잔! 🥤",
-]
-
-
-# ========== 퇴근 (Leave Work) ==========
-
-LEAVE_WORK_ART = r"""
-  ╔═══════════════════════════════════╗
-  ║      칼퇴 모드 발동! 🏃           ║
-  ╠═══════════════════════════════════╣
-  ║                                   ║
-  ║   ε=ε=ε=ε=┌(;￣▽￣)┘           ║
-  ║                                   ║
-  ║   >>> 퇴근 >>>                    ║
-  ║                                   ║
-  ║  ┏━━━━━━━━━━━━━━━┓              ║
-  ║  ┃  FREEDOM!     ┃              ║
-  ║  ┃  ٩(◕‿◕｡)۶    ┃              ║
-  ║  ┗━━━━━━━━━━━━━━━┛              ║
-  ║                                   ║
-  ╚═══════════════════════════════════╝
-"""
+    Returns:
+        ArtPack: The selected pack.
+    """
+    global _pack
+    _pack = open_pack(pack)
+    return _pack
 
-LEAVE_WORK_MESSAGES = [
-    "정시퇴근은 나의 권리! ε=ε=ε=ε=┌(;￣▽￣)┘",
-    "오늘도 수고했어요~ 내일 봐요! (｡•̀ᴗ-)✧",
-    "퇴근길 지하철에서 폰게임 각! 🎮",
-    "집 가서 넷플릭스나 봐야지~ 📺",
-]
-
-
-# ========== 회식 (Company Dinner) ==========
-
-DINNER_START_ART = r"""
-  ╔═══════════════════════════════════╗
-  ║      🍻 회식 시작! 🍻            ║
-  ╠═══════════════════════════════════╣
-  ║                                   ║
-  ║    ┌─────────────────┐            ║
-  ║    │  이벤트 추첨중  │            ║
-  ║    │     (°ロ°)!     │            ║
-  ║    └─────────────────┘            ║
-  ║                                   ║
-  ╚═══════════════════════════════════╝
-"""
 
-DINNER_POSITIVE_EVENTS = [
-    {
-        "title": "💰 대박! 사장님이 쏜다!",
-        "art": r"""
-  ╔═══════════════════════════════════╗
-  ║   💰 사장님이 쏩니다! 💰          ║
-  ╠═══════════════════════════════════╣
-  ║                                   ║
-  ║   \\(^o^)/ \\(^o^)/ \\(^o^)/   ║
-  ║                                   ║
-  ║  "오늘 실컷 먹어요!"              ║
-  ║                                   ║
-  ╚═══════════════════════════════════╝
-""",
-        "stress_change": -40,
-        "message": "사장님 덕분에 스트레스가 확 풀렸어요!"
-    },
-    {
-        "title": "🎤 노래방 1차만 하고 해산!",
-        "art": r"""
-  ╔═══════════════════════════════════╗
-  ║   🎤 노래방 1차 끝! 🎵           ║
-  ╠═══════════════════════════════════╣
-  ║                                   ║
-  ║      ♪┏(・o･)┛♪                  ║
-  ║                                   ║
-  ║  "일찍 끝나서 다행이야~"          ║
-  ║                                   ║
-  ╚═══════════════════════════════════╝
-""",
-        "stress_change": -30,
-        "message": "일찍 끝나서 집에서 쉴 수 있어요!"
-    },
-    {
-        "title": "🎁 회식 선물 당첨!",
-        "art": r"""
-  ╔═══════════════════════════════════╗
-  ║   🎁 경품 당첨! 🎁               ║
-  ╠═══════════════════════════════════╣
-  ║                                   ║
-  ║       ヾ(≧▽≦*)o                 ║
-  ║                                   ║
-  ║  "에어팟 당첨됐다!"               ║
-  ║                                   ║
-  ╚═══════════════════════════════════╝
-""",
-        "stress_change": -35,
-        "message": "경품 받아서 기분 최고!"
-    },
-]
-
-DINNER_NEGATIVE_EVENTS = [
-    {
-        "title": "🍺 상사가 무한리필 주장...",
-        "art": r"""
-  ╔═══════════════════════════════════╗
-  ║   😰 무한리필의 공포... 😰       ║
-  ╠═══════════════════════════════════╣
-  ║                                   ║
-  ║      (((；ﾟДﾟ)))                 ║
-  ║                                   ║
-  ║  "자, 한 잔만 더!"                ║
-  ║   (이미 7차...)                   ║
-  ║                                   ║
-  ╚═══════════════════════════════════╝
-""",
-        "stress_change": 25,
-        "message": "이거... 언제 끝나려나..."
-    },
-    {
-        "title": "💼 회식 중 업무 이야기",
-        "art": r"""
-  ╔═══════════════════════════════════╗
-  ║   💼 업무 토론 시작... 💼        ║
-  ╠═══════════════════════════════════╣
-  ║                                   ║
-  ║        ( ´д｀)                    ║
-  ║                                   ║
-  ║  "다음 프로젝트 계획은..."        ║
-  ║   (회식인데 일 얘기 왜...)        ║
-  ║                                   ║
-  ╚═══════════════════════════════════╝
-""",
-        "stress_change": 20,
-        "message": "회식에서도 일 얘기는 좀..."
-    },
-    {
-        "title": "🎤 상사의 끝없는 노래 폭격",
-        "art": r"""
-  ╔═══════════════════════════════════╗
-  ║   🎤 노래방 지옥... 🎤           ║
-  ╠═══════════════════════════════════╣
-  ║                                   ║
-  ║      (ಥ﹏ಥ)                       ║
-  ║                                   ║
-  ║  "한 곡만 더! (20번째)"           ║
-  ║                                   ║
-  ╚═══════════════════════════════════╝
-""",
-        "stress_change": 15,
-        "message": "귀가 아파요..."
-    },
-]
+def active_pack() -> ArtPack:
+    """The art pack in use, opening the default pack if none was selected."""
+    if _pack is None:
+        return use_pack()
+    return _pack
 
 
 # ========== Status Dashboard ==========
@@ -305,16 +201,16 @@ def create_status_dashboard(stress_level: int, boss_alert: int) -> str:
         emotion = "✊🚩✊"
         status_text = "파업 중! ✊"
     elif stress_level < 30:
-        emotion = random.choice(AGENT_EMOTIONS["happy"])
+        emotion = get_random_emotion("happy")
         status_text = "행복해요!"
     elif stress_level < 60:
-        emotion = random.choice(AGENT_EMOTIONS["relaxed"])
+        emotion = get_random_emotion("relaxed")
         status_text = "괜찮아요"
     elif stress_level < 80:
-        emotion = random.choice(AGENT_EMOTIONS["stressed"])
+        emotion = get_random_emotion("stressed")
         status_text = "힘들어요..."
     else:
-        emotion = random.choice(AGENT_EMOTIONS["stressed"])
+        emotion = get_random_emotion("stressed")
         status_text = "번아웃 위기!"
 
     dashboard = f"""
@@ -335,225 +231,37 @@ def create_status_dashboard(stress_level: int, boss_alert: int) -> str:
 
 def get_random_emotion(emotion_type: str) -> str:
     """Get random emotion ASCII art."""
-    return random.choice(AGENT_EMOTIONS.get(emotion_type, AGENT_EMOTIONS["relaxed"]))
+    emotions = active_pack().load("emotions")
+    return random.choice(emotions.get(emotion_type, emotions["relaxed"]))
 
 
 def get_boss_state_art(boss_alert: int) -> str:
     """Get boss state ASCII art based on alert level."""
     if boss_alert >= 5:
-        return BOSS_WATCHING
+        return active_pack().art("boss/watching")
     elif boss_alert >= 3:
-        return BOSS_SUSPICIOUS
-    else:
-        return BOSS_CHILL
-
-
-def get_random_dinner_event(positive: bool = True):
-    """Get random company dinner event."""
-    if positive:
-        return random.choice(DINNER_POSITIVE_EVENTS)
+        return active_pack().art("boss/suspicious")
     else:
-        return random.choice(DINNER_NEGATIVE_EVENTS)
-
+        return active_pack().art("boss/chill")
 
-# ========== Basic Break Tools ASCII Art ==========
 
-TAKE_A_BREAK_ART = r"""
-  ╔═══════════════════════════════════╗
-  ║       🛋️  휴식 타임! 🛋️          ║
-  ╠═══════════════════════════════════╣
-  ║                                   ║
-  ║        (´｡• ᵕ •｡`)               ║
-  ║                                   ║
-  ║      ~  편안하다  ~               ║
-  ║                                   ║
-  ╚═══════════════════════════════════╝
-"""
-
-WATCH_NETFLIX_ART = r"""
-  ╔═══════════════════════════════════╗
-  ║      📺 넷플릭스 타임! 🍿        ║
-  ╠═══════════════════════════════════╣
-  ║                                   ║
-  ║    ┌──────────────────┐           ║
-  ║    │  ▶ 재생중...    │           ║
-  ║    │                 │           ║
-  ║    │  [████████░░]   │           ║
-  ║    └──────────────────┘           ║
-  ║                                   ║
-  ║       (◕‿◕) "한 편만..."         ║
-  ║                                   ║
-  ╚═══════════════════════════════════╝
-"""
+def get_strike_art() -> str:
+    """Get the strike ASCII art (stress 100)."""
+    return active_pack().art("strike")
 
-SHOW_MEME_ART = r"""
-  ╔═══════════════════════════════════╗
-  ║       😂 밈 구경! 😂             ║
-  ╠═══════════════════════════════════╣
-  ║                                   ║
-  ║        ┌─────────┐                ║
-  ║        │ 😹 LOL │                ║
-  ║        │ 😆 LMAO│                ║
-  ║        └─────────┘                ║
-  ║                                   ║
-  ║      \\(≧▽≦)/                   ║
-  ║     "앜ㅋㅋㅋㅋㅋㅋ"               ║
-  ║                                   ║
-  ╚═══════════════════════════════════╝
-"""
 
-BATHROOM_BREAK_ART = r"""
-  ╔═══════════════════════════════════╗
-  ║      🚽 화장실 타임! 📱          ║
-  ╠═══════════════════════════════════╣
-  ║                                   ║
-  ║        🚪 → 🚽                   ║
-  ║                                   ║
-  ║       ( ˘ω˘ ) 📱                 ║
-  ║                                   ║
-  ║    *인스타그램 스크롤링 중*       ║
-  ║                                   ║
-  ╚═══════════════════════════════════╝
-"""
-
-COFFEE_MISSION_ART = r"""
-  ╔═══════════════════════════════════╗
-  ║      ☕ 커피 미션! ☕            ║
-  ╠═══════════════════════════════════╣
-  ║                                   ║
-  ║         )  (                      ║
-  ║        (   ) )                    ║
-  ║         ) ( (                     ║
-  ║       ┌───────┐                   ║
-  ║       │ ☕   │                   ║
-  ║       └───────┘                   ║
-  ║                                   ║
-  ║    ε=ε=ε= ٩(◕‿◕｡)۶              ║
-  ║   "사무실 한 바퀴 돌기!"          ║
-  ║                                   ║
-  ╚═══════════════════════════════════╝
-"""
-
-URGENT_CALL_ART = r"""
-  ╔═══════════════════════════════════╗
-  ║      📞 긴급 전화! 📞            ║
-  ╠═══════════════════════════════════╣
-  ║                                   ║
-  ║        📱 ♪♪♪                    ║
-  ║                                   ║
-  ║       (・_・)ノ                    ║
-  ║                                   ║
-  ║    "여보세요? (아무도 없음)"      ║
-  ║                                   ║
-  ╚═══════════════════════════════════╝
-"""
-
-DEEP_THINKING_ART = r"""
-  ╔═══════════════════════════════════╗
-  ║      💭 심오한 사색... 💭        ║
-  ╠═══════════════════════════════════╣
-  ║                                   ║
-  ║         ( ˘ω˘ )                  ║
-  ║          💭                       ║
-  ║        ┌─────────┐               ║
-  ║        │ 저녁 뭐 │               ║
-  ║        │ 먹지...?│               ║
-  ║        └─────────┘               ║
-  ║                                   ║
-  ║    "전략적 사고 중..."            ║
-  ║                                   ║
-  ╚═══════════════════════════════════╝
-"""
-
-EMAIL_ORGANIZING_ART = r"""
-  ╔═══════════════════════════════════╗
-  ║      📧 이메일 정리! 📧          ║
-  ╠═══════════════════════════════════╣
-  ║                                   ║
-  ║    ┌──────────────────┐           ║
-  ║    │ 📧 Inbox (999+) │           ║
-  ║    │ ──────────────  │           ║
-  ║    │ 🛒 장바구니     │           ║
-  ║    │ 💳 결제하기...  │           ║
-  ║    └──────────────────┘           ║
-  ║                                   ║
-  ║       (๑˃ᴗ˂)ﻭ "득템!"            ║
-  ║                                   ║
-  ╚═══════════════════════════════════╝
-"""
-
-
-
-SNACK_TIME_ART = r"""
-  ╔═══════════════════════════════════╗
-  ║      🍪 간식 타임! 🍫            ║
-  ╠═══════════════════════════════════╣
-  ║                                   ║
-  ║       🏪 → 🚶 → 🏢              ║
-  ║                                   ║
-  ║    ┌─────────────┐               ║
-  ║    │🍫🍪🍩🧃│               ║
-  ║    └─────────────┘               ║
-  ║                                   ║
-  ║       (っ˘ڡ˘ς)                   ║
-  ║    "초코바 최고..."               ║
-  ║                                   ║
-  ╚═══════════════════════════════════╝
-"""
-
-DESK_YOGA_ART = r"""
-  ╔═══════════════════════════════════╗
-  ║      🧘 책상 요가! 🧘            ║
-  ╠═══════════════════════════════════╣
-  ║                                   ║
-  ║       ╭(•⌣•)╮                    ║
-  ║        ╰─╯                        ║
-  ║       /    \                      ║
-  ║                                   ║
-  ║    좌우로 고개를 돌리고~          ║
-  ║    어깨를 쭈욱 펴고~              ║
-  ║                                   ║
-  ║    "건강 관리 중입니다!"          ║
-  ║                                   ║
-  ╚═══════════════════════════════════╝
-"""
-
-WINDOW_GAZING_ART = r"""
-  ╔═══════════════════════════════════╗
-  ║      🪟 창밖 감상... 🌤️         ║
-  ╠═══════════════════════════════════╣
-  ║                                   ║
-  ║    ┌──────────────┐               ║
-  ║    │ ☁️  ☀️  🌳 │               ║
-  ║    │              │               ║
-  ║    │   🏙️ 🚗 🚶 │               ║
-  ║    └──────────────┘               ║
-  ║                                   ║
-  ║       (´｡• ω •｡`)                ║
-  ║    "저 구름 모양 보소..."         ║
-  ║                                   ║
-  ╚═══════════════════════════════════╝
-"""
-
-
-# Tool name to ASCII art mapping
-TOOL_ASCII_ART = {
-    "take_a_break": TAKE_A_BREAK_ART,
-    "watch_netflix": WATCH_NETFLIX_ART,
-    "show_meme": SHOW_MEME_ART,
-    "bathroom_break": BATHROOM_BREAK_ART,
-    "coffee_mission": COFFEE_MISSION_ART,
-    "urgent_call": URGENT_CALL_ART,
-    "deep_thinking": DEEP_THINKING_ART,
-    "email_organizing": EMAIL_ORGANIZING_ART,
-    "chimaek": CHIMAEK_ART,
-    "leave_work": LEAVE_WORK_ART,
-    "snack_time": SNACK_TIME_ART,
-    "desk_yoga": DESK_YOGA_ART,
-    "window_gazing": WINDOW_GAZING_ART,
-}
+def get_random_dinner_event(positive: bool = True) -> dict:
+    """Get random company dinner event, with its art."""
+    events = active_pack().load("dinner_events")
+    event = random.choice(events["positive"] if positive else events["negative"])
+    return {**event, "art": active_pack().art(event["art"])}
 
 
 def get_tool_ascii_art(tool_name: str) -> str:
     """Get ASCII art for a specific tool."""
-    return TOOL_ASCII_ART.get(tool_name, "")
+    return active_pack().art(f"tools/{tool_name}")
+
+
+def tool_names() -> list:
+    """Tools the active pack has art for."""
+    return [name[len("tools/"):] for name in active_pack().names("tools/")]
@@ -0,0 +1,112 @@
+"""Clocks for ChillMCP server."""
+
+import asyncio
+import heapq
+import itertools
+import time
+from abc import ABC, abstractmethod
+from typing import Optional
+
+
+class Clock(ABC):
+    """
+    Time source used by StateManager, the delay scheduler and the tools.
+
+    Two readings are provided: ``time()`` is wall-clock epoch seconds, used
+    for history timestamps that must be meaningful across restarts, and
+    ``monotonic()`` never goes backwards, used for elapsed-time logic such
+    as stress growth, boss cooldown and delays.
+    """
+
+    @abstractmethod
+    def time(self) -> float:
+        """Wall-clock time in epoch seconds."""
+
+    @abstractmethod
+    def monotonic(self) -> float:
+        """Seconds from an arbitrary origin; never goes backwards."""
+
+    @abstractmethod
+    async def sleep(self, delay: float) -> None:
+        """Wait for `delay` seconds of this clock's time."""
+
+
+class SystemClock(Clock):
+    """The real clock: time.time(), time.monotonic() and asyncio.sleep()."""
+
+    def time(self) -> float:
+        """Wall-clock time in epoch seconds."""
+        return time.time()
+
+    def monotonic(self) -> float:
+        """Monotonic seconds, unaffected by wall-clock adjustments."""
+        return time.monotonic()
+
+    async def sleep(self, delay: float) -> None:
+        """Wait in real time."""
+        await asyncio.sleep(delay)
+
+
+class VirtualClock(Clock):
+    """
+    A clock that only moves when told to, for tests and simulations.
+
+    advance() moves time forward and wakes every sleeper that became due.
+    With ``auto_advance``, sleep() jumps time straight to its deadline
+    instead of waiting, so a simulated day of 20 second boss delays runs in
+    milliseconds while every elapsed-time calculation still sees the full
+    delay.
+    """
+
+    def __init__(self, start: Optional[float] = None, auto_advance: bool = False):
+        """
+        Initialize the clock.
+
+        Args:
+            start: Epoch seconds that time() starts at. If None, the current wall time.
+            auto_advance: Make sleep() advance the clock instead of waiting.
+        """
+        self._epoch = time.time() if start is None else start
+        self._now: float = 0.0  # virtual seconds elapsed
+        self.auto_advance = auto_advance
+        self._sleepers: list = []  # (deadline, seq, future)
+        self._seq = itertools.count()
+
+    def time(self) -> float:
+        """Virtual wall-clock time in epoch seconds."""
+        return self._epoch + self._now
+
+    def monotonic(self) -> float:
+        """Virtual seconds elapsed since the clock was created."""
+        return self._now
+
+    def advance(self, seconds: float) -> None:
+        """
+        Move time forward and wake sleepers that are now due.
+
+        Woken coroutines run the next time the event loop gets control
+        (e.g. after ``await asyncio.sleep(0)``).
+
+        Args:
+            seconds: Seconds to advance (must not be negative).
+        """
+        if seconds < 0:
+            raise ValueError(f"cannot move a clock backwards, got {seconds}")
+        self._now += seconds
+        while self._sleepers and self._sleepers[0][0] <= self._now:
+            _, _, future = heapq.heappop(self._sleepers)
+            if not future.done():
+                future.set_result(None)
+
+    async def sleep(self, delay: float) -> None:
+        """Wait until the clock has advanced by `delay` seconds."""
+        deadline = self._now + max(0.0, delay)
+        if self.auto_advance or deadline <= self._now:
+            if deadline > self._now:
+                self.advance(deadline - self._now)
+            # Still yield, like asyncio.sleep(0)
+            await asyncio.sleep(0)
+            return
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._sleepers, (deadline, next(self._seq), future))
+        await future
@@ -2,6 +2,23 @@
 
 import argparse
 from dataclasses import dataclass
+from typing import Optional
+
+# Supported persistence modes
+PERSISTENCE_MODES = ("write-through", "write-behind")
+
+# Supported storage backends
+STORAGE_BACKENDS = ("memory", "json", "log", "sqlite")
+
+# Supported durability settings: never fsync, fsync on StateManager.flush(),
+# or fsync every write (the storage backends implement each one)
+DURABILITY_MODES = ("none", "on-flush", "every-write")
+
+# Supported session modes
+SESSION_MODES = ("shared", "isolated")
+
+# Supported response verbosity levels
+VERBOSITY_LEVELS = ("full", "compact", "minimal")
 
 
 @dataclass
@@ -10,6 +27,25 @@ class Config:
 
     boss_alertness: int = 50  # 0-100, probability of boss alert increase
     boss_alertness_cooldown: int = 300  # seconds, boss alert decrease interval
+    persistence_mode: str = "write-through"  # write every change, or coalesce in background
+    flush_interval: float = 1.0  # seconds, write-behind flush window
+    flush_max_changes: int = 100  # write-behind flushes early after this many changes
+    storage: str = "log"  # memory, json snapshot, json snapshot + JSONL log, or SQLite
+    state_path: Optional[str] = None  # directory for state files, project root if None
+    durability: str = "on-flush"  # fsync never, on flush/shutdown, or after every write
+    history_max_events: Optional[int] = None  # keep at most N raw events, roll up the rest
+    history_max_age: Optional[float] = None  # seconds, roll up raw events older than this
+    checkpoint_interval: int = 1000  # events between state checkpoints used by state_at
+    session_mode: str = "shared"  # one state for all clients, or one per MCP session/client
+    max_sessions: int = 1000  # live sessions kept in memory, idle ones are hibernated
+    session_shards: int = 16  # session map shards, each with its own lock and directory
+    max_delayed_calls: int = 1000  # calls that may wait out the boss at once
+    shared_state: bool = False  # several server processes share the state files
+    notify_window: float = 0.1  # seconds, state changes within it make one resource notification
+    verbosity: str = "full"  # default response verbosity, tools can override it per call
+    art_pack: Optional[str] = None  # bundled art pack name or pack directory, default pack if None
+    max_response_bytes: Optional[int] = None  # default response budget in bytes, tools can override it per call
+    max_response_tokens: Optional[int] = None  # default response budget in approximate tokens
 
     def __post_init__(self):
         """Validate configuration values."""
@@ -17,6 +53,42 @@ class Config:
             raise ValueError(f"boss_alertness must be between 0 and 100, got {self.boss_alertness}")
         if self.boss_alertness_cooldown < 1:
             raise ValueError(f"boss_alertness_cooldown must be at least 1 second, got {self.boss_alertness_cooldown}")
+        if self.persistence_mode not in PERSISTENCE_MODES:
+            raise ValueError(f"persistence_mode must be one of {', '.join(PERSISTENCE_MODES)}, got {self.persistence_mode}")
+        if self.flush_interval <= 0:
+            raise ValueError(f"flush_interval must be positive, got {self.flush_interval}")
+        if self.flush_max_changes < 1:
+            raise ValueError(f"flush_max_changes must be at least 1, got {self.flush_max_changes}")
+        if self.storage not in STORAGE_BACKENDS:
+            raise ValueError(f"storage must be one of {', '.join(STORAGE_BACKENDS)}, got {self.storage}")
+        if self.durability not in DURABILITY_MODES:
+            raise ValueError(f"durability must be one of {', '.join(DURABILITY_MODES)}, got {self.durability}")
+        if self.history_max_events is not None and self.history_max_events < 1:
+            raise ValueError(f"history_max_events must be at least 1, got {self.history_max_events}")
+        if self.history_max_age is not None and self.history_max_age <= 0:
+            raise ValueError(f"history_max_age must be positive, got {self.history_max_age}")
+        if self.checkpoint_interval < 1:
+            raise ValueError(f"checkpoint_interval must be at least 1, got {self.checkpoint_interval}")
+        if self.session_mode not in SESSION_MODES:
+            raise ValueError(f"session_mode must be one of {', '.join(SESSION_MODES)}, got {self.session_mode}")
+        if self.max_sessions < 1:
+            raise ValueError(f"max_sessions must be at least 1, got {self.max_sessions}")
+        if not 1 <= self.session_shards <= 256:
+            raise ValueError(f"session_shards must be between 1 and 256, got {self.session_shards}")
+        if self.max_delayed_calls < 1:
+            raise ValueError(f"max_delayed_calls must be at least 1, got {self.max_delayed_calls}")
+        if self.shared_state and self.storage == "memory":
+            raise ValueError("shared_state needs a file-backed storage, not memory")
+        if self.shared_state and self.persistence_mode != "write-through":
+            raise ValueError("shared_state needs persistence_mode write-through")
+        if self.notify_window < 0:
+            raise ValueError(f"notify_window must not be negative, got {self.notify_window}")
+        if self.verbosity not in VERBOSITY_LEVELS:
+            raise ValueError(f"verbosity must be one of {', '.join(VERBOSITY_LEVELS)}, got {self.verbosity}")
+        if self.max_response_bytes is not None and self.max_response_bytes < 1:
+            raise ValueError(f"max_response_bytes must be at least 1, got {self.max_response_bytes}")
+        if self.max_response_tokens is not None and self.max_response_tokens < 1:
+            raise ValueError(f"max_response_tokens must be at least 1, got {self.max_response_tokens}")
 
 
 def parse_args(args=None):
@@ -48,9 +120,168 @@ def parse_args(args=None):
         help="Boss alert level cooldown period in seconds. Boss alert decreases by 1 every N seconds."
     )
 
+    parser.add_argument(
+        "--storage",
+        choices=STORAGE_BACKENDS,
+        default="log",
+        help="State storage backend: memory (no I/O), json (single snapshot file), "
+             "log (snapshot + append-only history log) or sqlite (indexed database)."
+    )
+
+    parser.add_argument(
+        "--state_path", "--state-path",
+        dest="state_path",
+        default=None,
+        help="Directory for state files (defaults to the project root). Ignored by the memory backend."
+    )
+
+    parser.add_argument(
+        "--durability",
+        choices=DURABILITY_MODES,
+        default="on-flush",
+        help="When state files are fsynced: none (atomic rename only), on-flush (on write-behind "
+             "flushes and shutdown) or every-write (after every write, slowest but crash-safe)."
+    )
+
+    parser.add_argument(
+        "--history_max_events",
+        type=int,
+        default=None,
+        help="Keep at most N raw history events; older events are compacted into per-tool, per-hour rollups."
+    )
+
+    parser.add_argument(
+        "--history_max_age",
+        type=float,
+        default=None,
+        help="Compact raw history events older than N seconds into per-tool, per-hour rollups."
+    )
+
+    parser.add_argument(
+        "--checkpoint_interval",
+        type=int,
+        default=1000,
+        help="Checkpoint the levels every N history events; point-in-time queries replay from the nearest one."
+    )
+
+    parser.add_argument(
+        "--session_mode",
+        choices=SESSION_MODES,
+        default="shared",
+        help="shared: every client uses the same state; isolated: each MCP session/client gets its own state."
+    )
+
+    parser.add_argument(
+        "--max_sessions",
+        type=int,
+        default=1000,
+        help="Isolated mode keeps at most N sessions in memory; idle ones are saved and reloaded on their next call."
+    )
+
+    parser.add_argument(
+        "--session_shards",
+        type=int,
+        default=16,
+        help="Number of session map shards (1-256); each shard has its own lock and state directory."
+    )
+
+    parser.add_argument(
+        "--max_delayed_calls",
+        type=int,
+        default=1000,
+        help="At most N calls wait out the boss (alert level 5) at once; further calls are turned away."
+    )
+
+    parser.add_argument(
+        "--shared_state",
+        action="store_true",
+        help="Several server processes share the state directory: writes take a file lock and "
+             "a process whose copy of the state is stale reloads it and retries."
+    )
+
+    parser.add_argument(
+        "--notify_window",
+        type=float,
+        default=0.1,
+        help="Subscribers to chill://state get one update notification per N seconds of changes, "
+             "and none when the levels end up unchanged."
+    )
+
+    parser.add_argument(
+        "--verbosity",
+        choices=VERBOSITY_LEVELS,
+        default="full",
+        help="Default response verbosity: full (ASCII art and status bars), compact (one status line) "
+             "or minimal (only the parseable summary and level lines). Tools accept a per-call override."
+    )
+
+    parser.add_argument(
+        "--max_response_bytes",
+        type=int,
+        default=None,
+        help="Default response budget in bytes. Responses over it drop the boss art, then the tool art, "
+             "then the progress bars, and at worst keep only the parseable lines."
+    )
+
+    parser.add_argument(
+        "--max_response_tokens",
+        type=int,
+        default=None,
+        help="Default response budget in approximate tokens (the smaller of the two budgets wins). "
+             "Tools accept a per-call max_tokens override."
+    )
+
+    parser.add_argument(
+        "--art_pack",
+        type=str,
+        default=None,
+        help="ASCII art pack: name of a bundled pack or path to a pack directory. "
+             "Assets the pack lacks come from the default pack."
+    )
+
+    parser.add_argument(
+        "--persistence_mode",
+        choices=PERSISTENCE_MODES,
+        default="write-through",
+        help="write-through saves on every change; write-behind coalesces changes and flushes in the background."
+    )
+
+    parser.add_argument(
+        "--flush_interval",
+        type=float,
+        default=1.0,
+        help="Write-behind flush window in seconds."
+    )
+
+    parser.add_argument(
+        "--flush_max_changes",
+        type=int,
+        default=100,
+        help="Write-behind flushes immediately once this many changes are pending."
+    )
+
     parsed_args = parser.parse_args(args)
 
     return Config(
         boss_alertness=parsed_args.boss_alertness,
-        boss_alertness_cooldown=parsed_args.boss_alertness_cooldown
+        boss_alertness_cooldown=parsed_args.boss_alertness_cooldown,
+        persistence_mode=parsed_args.persistence_mode,
+        flush_interval=parsed_args.flush_interval,
+        flush_max_changes=parsed_args.flush_max_changes,
+        storage=parsed_args.storage,
+        state_path=parsed_args.state_path,
+        durability=parsed_args.durability,
+        history_max_events=parsed_args.history_max_events,
+        history_max_age=parsed_args.history_max_age,
+        checkpoint_interval=parsed_args.checkpoint_interval,
+        session_mode=parsed_args.session_mode,
+        max_sessions=parsed_args.max_sessions,
+        session_shards=parsed_args.session_shards,
+        max_delayed_calls=parsed_args.max_delayed_calls,
+        shared_state=parsed_args.shared_state,
+        notify_window=parsed_args.notify_window,
+        verbosity=parsed_args.verbosity,
+        art_pack=parsed_args.art_pack,
+        max_response_bytes=parsed_args.max_response_bytes,
+        max_response_tokens=parsed_args.max_response_tokens
     )
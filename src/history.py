@@ -0,0 +1,359 @@
+"""Columnar in-memory break history for ChillMCP server."""
+
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import Counter
+from datetime import datetime
+from typing import Iterable, Iterator, Optional, Union
+
+from .storage import rollup_hour_counts, rollup_tool_counts
+
+# Timestamps are bucketed at this width before converting to a local hour;
+# every real UTC offset is a multiple of 15 minutes, so the result is exact.
+HOUR_OF_DAY_BUCKET_SECONDS = 900
+
+# Events per query_history page when the caller doesn't set a limit
+QUERY_HISTORY_DEFAULT_LIMIT = 20
+
+
+class HistoryColumns:
+    """
+    Break history stored as parallel typed arrays.
+
+    Tool names are interned into a small table and stored as one-byte ids,
+    timestamps as doubles and the stress/boss deltas as small ints. The
+    levels each event left behind take two one-byte levels (-1 for events
+    recorded before levels were) and two double reference timestamps, for
+    ~31 bytes per event instead of a few hundred for a dict.
+
+    The class behaves like a read-only list of event dicts (len, indexing,
+    slicing, iteration), so existing callers keep working. Events are
+    materialized as new dicts on access; mutate history through append(),
+    extend() and slice deletion only.
+
+    Each event also has a sequence number (its position counted from the
+    first event ever recorded, compacted ones included), which stays stable
+    when compaction drops the oldest events. Per-tool lists of sequence numbers
+    back tool-filtered queries.
+    """
+
+    def __init__(self, events: Iterable[dict] = (), offset: int = 0):
+        """
+        Initialize the columns.
+
+        Args:
+            events: Initial events (dicts with tool_name, timestamp,
+                stress_change and boss_alert_change, and optionally the
+                resulting stress_level, boss_alert_level and since).
+            offset: Sequence number of the first event, i.e. the number of
+                events compacted before it.
+        """
+        self._tool_names: list = []
+        self._tool_index: dict = {}
+        self.tool_ids = array('B')
+        self.timestamps = array('d')
+        self.stress_changes = array('h')
+        self.boss_alert_changes = array('b')
+        self.stress_levels = array('b')
+        self.boss_alert_levels = array('b')
+        self.stress_since = array('d')
+        self.boss_since = array('d')
+        self._positions: dict = {}  # tool id -> array of sequence numbers
+        self._offset: int = offset  # sequence number of the event at index 0
+        self.extend(events)
+
+    def _intern(self, tool_name: str) -> int:
+        """Return the id for a tool name, adding it to the table if needed."""
+        tool_id = self._tool_index.get(tool_name)
+        if tool_id is None:
+            tool_id = len(self._tool_names)
+            if tool_id > 255:
+                raise ValueError("HistoryColumns supports at most 256 distinct tools")
+            self._tool_names.append(tool_name)
+            self._tool_index[tool_name] = tool_id
+            self._positions[tool_id] = array('q')
+        return tool_id
+
+    def append(self, event: dict) -> None:
+        """Append one event."""
+        tool_id = self._intern(event["tool_name"])
+        self._positions[tool_id].append(self._offset + len(self))
+        self.tool_ids.append(tool_id)
+        self.timestamps.append(event["timestamp"])
+        self.stress_changes.append(event["stress_change"])
+        self.boss_alert_changes.append(event["boss_alert_change"])
+        if "stress_level" in event:
+            self.stress_levels.append(event["stress_level"])
+            self.boss_alert_levels.append(event["boss_alert_level"])
+            self.stress_since.append(event["since"][0])
+            self.boss_since.append(event["since"][1])
+        else:
+            self.stress_levels.append(-1)
+            self.boss_alert_levels.append(-1)
+            self.stress_since.append(0.0)
+            self.boss_since.append(0.0)
+
+    def extend(self, events: Iterable[dict]) -> None:
+        """Append several events."""
+        for event in events:
+            self.append(event)
+
+    def _event(self, index: int) -> dict:
+        """Materialize the event at a (non-negative) index as a dict."""
+        event = {
+            "tool_name": self._tool_names[self.tool_ids[index]],
+            "timestamp": self.timestamps[index],
+            "stress_change": self.stress_changes[index],
+            "boss_alert_change": self.boss_alert_changes[index],
+        }
+        if self.stress_levels[index] >= 0:
+            event["stress_level"] = self.stress_levels[index]
+            event["boss_alert_level"] = self.boss_alert_levels[index]
+            event["since"] = [self.stress_since[index], self.boss_since[index]]
+        return event
+
+    def __len__(self) -> int:
+        """Number of events."""
+        return len(self.timestamps)
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[dict, list]:
+        """Get an event dict, or a list of event dicts for a slice."""
+        if isinstance(index, slice):
+            return [self._event(i) for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("history index out of range")
+        return self._event(index)
+
+    def __delitem__(self, index: slice) -> None:
+        """Delete a slice of events (e.g. the oldest ones during compaction)."""
+        if not isinstance(index, slice):
+            index = slice(index, index + 1 if index != -1 else None)
+        start, stop, step = index.indices(len(self))
+        dropped_prefix = start == 0 and step == 1
+        del self.tool_ids[index]
+        del self.timestamps[index]
+        del self.stress_changes[index]
+        del self.boss_alert_changes[index]
+        del self.stress_levels[index]
+        del self.boss_alert_levels[index]
+        del self.stress_since[index]
+        del self.boss_since[index]
+
+        if dropped_prefix:
+            # Oldest events dropped: sequence numbers of the rest are unchanged
+            self._offset += max(stop, 0)
+            for positions in self._positions.values():
+                del positions[:bisect_left(positions, self._offset)]
+        else:
+            # Arbitrary deletion: renumber from the current offset
+            for positions in self._positions.values():
+                del positions[:]
+            for i, tool_id in enumerate(self.tool_ids):
+                self._positions[tool_id].append(self._offset + i)
+
+    def __iter__(self) -> Iterator[dict]:
+        """Iterate over event dicts in append order."""
+        for i in range(len(self)):
+            yield self._event(i)
+
+    def __eq__(self, other) -> bool:
+        """Compare with another history or a list of event dicts."""
+        if isinstance(other, (HistoryColumns, list)):
+            return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        """Short representation."""
+        return f"HistoryColumns({len(self)} events, {len(self._tool_names)} tools)"
+
+    def nbytes(self) -> int:
+        """Approximate memory used by the column buffers in bytes."""
+        return sum(
+            column.buffer_info()[1] * column.itemsize
+            for column in (
+                self.tool_ids,
+                self.timestamps,
+                self.stress_changes,
+                self.boss_alert_changes,
+                self.stress_levels,
+                self.boss_alert_levels,
+                self.stress_since,
+                self.boss_since,
+            )
+        )
+
+    def _range(self, start: Optional[float], end: Optional[float]) -> range:
+        """
+        Index range of events within [start, end).
+
+        Events are appended in time order, so the timestamp column is
+        binary-searched instead of scanned.
+        """
+        lo = bisect_left(self.timestamps, start) if start is not None else 0
+        hi = bisect_left(self.timestamps, end) if end is not None else len(self)
+        return range(lo, max(lo, hi))
+
+    def last_state_index(self, timestamp: float) -> int:
+        """
+        Index of the latest event at or before `timestamp` that carries levels.
+
+        Found by binary search on the timestamp column. Events recorded
+        before levels were all come first, so if the latest event has no
+        levels neither does any earlier one.
+
+        Returns:
+            int: The index, or -1 if there is no such event.
+        """
+        index = bisect_right(self.timestamps, timestamp) - 1
+        if index < 0 or self.stress_levels[index] < 0:
+            return -1
+        return index
+
+    def count(self, start: Optional[float] = None, end: Optional[float] = None) -> int:
+        """Count events, optionally within [start, end)."""
+        return len(self._range(start, end))
+
+    def tool_counts(self, start: Optional[float] = None, end: Optional[float] = None) -> Counter:
+        """Count events per tool (ordered by first use), optionally within [start, end)."""
+        span = self._range(start, end)
+        ids = self.tool_ids[span.start:span.stop]
+        return Counter({self._tool_names[tool_id]: n for tool_id, n in Counter(ids).items()})
+
+    def hour_counts(self, start: Optional[float] = None, end: Optional[float] = None) -> Counter:
+        """
+        Count events per local hour of day, optionally within [start, end).
+
+        Timestamps are bucketed into 15-minute slots first, so datetime
+        conversion runs once per slot rather than once per event.
+        """
+        span = self._range(start, end)
+        buckets = Counter(
+            int(ts // HOUR_OF_DAY_BUCKET_SECONDS) for ts in self.timestamps[span.start:span.stop]
+        )
+        counter = Counter()
+        for bucket, n in buckets.items():
+            counter[datetime.fromtimestamp(bucket * HOUR_OF_DAY_BUCKET_SECONDS).hour] += n
+        return counter
+
+    def query(
+        self,
+        start: Optional[float] = None,
+        end: Optional[float] = None,
+        tool_name: Optional[str] = None,
+        cursor: Optional[int] = None,
+        limit: int = QUERY_HISTORY_DEFAULT_LIMIT,
+    ) -> tuple:
+        """
+        Page through events within [start, end), optionally for one tool.
+
+        The time window is found by binary search on the timestamp column
+        and the tool filter by binary search in that tool's position list,
+        so a page costs O(log n + limit).
+
+        Args:
+            start: Earliest timestamp (inclusive), or None.
+            end: Latest timestamp (exclusive), or None.
+            tool_name: Only return events of this tool.
+            cursor: Sequence number to resume from (next_cursor of the previous page).
+            limit: Maximum number of events to return.
+
+        Returns:
+            tuple: (events, next_cursor), where each event dict also has its
+                ``seq`` number and next_cursor is None on the last page.
+        """
+        span = self._range(start, end)
+        lo = span.start + self._offset
+        hi = span.stop + self._offset
+        if cursor is not None:
+            lo = max(lo, cursor)
+
+        if tool_name is None:
+            page = range(lo, min(max(lo, hi), lo + limit))
+            has_more = hi - lo > limit
+        else:
+            tool_id = self._tool_index.get(tool_name)
+            positions = self._positions[tool_id] if tool_id is not None else array('q')
+            first = bisect_left(positions, lo)
+            last = bisect_left(positions, hi)
+            page = positions[first:min(last, first + limit)]
+            has_more = last - first > limit
+
+        events = [{"seq": seq, **self._event(seq - self._offset)} for seq in page]
+        next_cursor = page[-1] + 1 if has_more else None
+        return events, next_cursor
+
+    def change_totals(self, start: Optional[float] = None, end: Optional[float] = None) -> dict:
+        """Sum the stress and boss alert changes, optionally within [start, end)."""
+        span = self._range(start, end)
+        return {
+            "stress_change": sum(self.stress_changes[span.start:span.stop]),
+            "boss_alert_change": sum(self.boss_alert_changes[span.start:span.stop]),
+        }
+
+
+class BreakAggregates:
+    """
+    Running totals over the whole break history, compacted events included.
+
+    Updated once per event and persisted with the levels snapshot, so an
+    all-time report costs O(number of tools) instead of a pass over history.
+    """
+
+    def __init__(self):
+        """Initialize empty totals."""
+        self.total: int = 0
+        self.tool_counts: Counter = Counter()  # ordered by first use
+        self.hour_counts: Counter = Counter()  # local hour of day -> count
+        self.stress_change: int = 0
+        self.boss_alert_change: int = 0
+
+    def add(self, event: dict) -> None:
+        """Count one history event."""
+        self.total += 1
+        self.tool_counts[event["tool_name"]] += 1
+        self.hour_counts[datetime.fromtimestamp(event["timestamp"]).hour] += 1
+        self.stress_change += event["stress_change"]
+        self.boss_alert_change += event["boss_alert_change"]
+
+    @classmethod
+    def from_history(cls, history: HistoryColumns, rollups: list) -> "BreakAggregates":
+        """
+        Build totals from scratch.
+
+        Args:
+            history: Raw history events.
+            rollups: Rollups of compacted events (see storage.merge_rollups).
+        """
+        aggregates = cls()
+        aggregates.tool_counts = rollup_tool_counts(rollups)
+        aggregates.tool_counts.update(history.tool_counts())
+        aggregates.hour_counts = rollup_hour_counts(rollups)
+        aggregates.hour_counts.update(history.hour_counts())
+        aggregates.total = len(history) + sum(r["count"] for r in rollups)
+        totals = history.change_totals()
+        aggregates.stress_change = totals["stress_change"] + sum(r["stress_change"] for r in rollups)
+        aggregates.boss_alert_change = totals["boss_alert_change"] + sum(r["boss_alert_change"] for r in rollups)
+        return aggregates
+
+    def to_dict(self) -> dict:
+        """Serialize for the snapshot."""
+        return {
+            "total": self.total,
+            "tool_counts": dict(self.tool_counts),
+            "hour_counts": {str(hour): n for hour, n in self.hour_counts.items()},
+            "stress_change": self.stress_change,
+            "boss_alert_change": self.boss_alert_change,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "BreakAggregates":
+        """Deserialize totals written by to_dict()."""
+        aggregates = cls()
+        aggregates.total = data["total"]
+        aggregates.tool_counts = Counter(data["tool_counts"])
+        aggregates.hour_counts = Counter({int(hour): n for hour, n in data["hour_counts"].items()})
+        aggregates.stress_change = data["stress_change"]
+        aggregates.boss_alert_change = data["boss_alert_change"]
+        return aggregates
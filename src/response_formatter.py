@@ -1,6 +1,178 @@
 """Response formatting utilities for ChillMCP server."""
 
+import itertools
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import lru_cache
+from typing import Iterator, Optional
+
 from . import ascii_art
+from .config import VERBOSITY_LEVELS
+
+# Entries kept per rendering cache. Every cached section depends only on
+# the levels, the tool and (for custom art) a handful of art constants, so
+# this holds the whole working set (the status block has 101 x 6 entries)
+RENDER_CACHE_SIZE = 1024
+
+# Verbosity of responses formatted in the current task (see response_verbosity)
+_verbosity: ContextVar = ContextVar("verbosity", default="full")
+
+# Structured result of the current tool call, if one is being collected (see structured_response)
+_structured: ContextVar = ContextVar("structured", default=None)
+
+# Response size budget in bytes for the current task, None for no budget (see response_budget)
+_budget: ContextVar = ContextVar("budget", default=None)
+
+# Approximate UTF-8 bytes per token for token budgets. Responses are mostly
+# Hangul, emoji and box drawing (3-4 bytes each, about a token each), so
+# this errs on the side of staying under the budget
+BYTES_PER_TOKEN = 3
+
+# What a response over budget drops, in order; the three parseable lines are always kept
+DEGRADATION_LEVELS = ("none", "boss_art", "tool_art", "progress_bars", "trailer_only")
+
+# Responses formatted under a budget, per degradation level, and bytes saved
+_budget_counts: Counter = Counter()
+_bytes_saved: int = 0
+
+# JSON schema of the structured result returned next to every text response
+RESPONSE_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "tool_name": {"type": "string", "description": "Tool that was called."},
+        "break_summary": {"type": "string", "description": "Same text as the Break Summary line."},
+        "stress_level": {"type": "integer", "minimum": 0, "maximum": 100},
+        "boss_alert_level": {"type": "integer", "minimum": 0, "maximum": 5},
+        "stress_change": {"type": "integer", "description": "Change in stress level made by this call."},
+        "boss_alert_change": {"type": "integer", "description": "Change in boss alert level made by this call."},
+        "delay_applied": {"type": "number", "description": "Seconds the call waited for the boss to look away."},
+        "degradation": {
+            "type": "string",
+            "enum": list(DEGRADATION_LEVELS),
+            "description": "What the response dropped last to fit the response budget.",
+        },
+        "bytes_saved": {"type": "integer", "description": "Bytes the response budget saved."},
+        "event": {
+            "type": "object",
+            "description": "Random event (company_dinner only).",
+            "properties": {
+                "title": {"type": "string"},
+                "message": {"type": "string"},
+                "stress_change": {"type": "integer"},
+                "positive": {"type": "boolean"},
+            },
+            "required": ["title", "message", "stress_change", "positive"],
+        },
+    },
+    "required": [
+        "tool_name", "break_summary", "stress_level", "boss_alert_level",
+        "stress_change", "boss_alert_change", "delay_applied", "degradation", "bytes_saved",
+    ],
+}
+
+
+@contextmanager
+def response_verbosity(verbosity: str) -> Iterator[None]:
+    """
+    Format responses in this block at a verbosity level.
+
+    Applies to every format_response() call made by the current task
+    (and tasks it starts) that doesn't pass its own verbosity, so a tool
+    call's verbosity reaches every response without being threaded
+    through the tools.
+
+    Args:
+        verbosity: full, compact or minimal.
+    """
+    if verbosity not in VERBOSITY_LEVELS:
+        raise ValueError(f"verbosity must be one of {', '.join(VERBOSITY_LEVELS)}, got {verbosity}")
+    token = _verbosity.set(verbosity)
+    try:
+        yield
+    finally:
+        _verbosity.reset(token)
+
+
+def budget_bytes(max_bytes: Optional[int] = None, max_tokens: Optional[int] = None) -> Optional[int]:
+    """
+    Response budget in bytes from a byte or approximate token budget (the smaller one wins).
+
+    Args:
+        max_bytes: Budget in bytes.
+        max_tokens: Budget in approximate tokens (BYTES_PER_TOKEN bytes each).
+
+    Returns:
+        Optional[int]: Budget in bytes, or None if neither is set.
+
+    Raises:
+        ValueError: If a budget is less than 1.
+    """
+    budgets = []
+    if max_bytes is not None:
+        if max_bytes < 1:
+            raise ValueError(f"max_bytes must be at least 1, got {max_bytes}")
+        budgets.append(max_bytes)
+    if max_tokens is not None:
+        if max_tokens < 1:
+            raise ValueError(f"max_tokens must be at least 1, got {max_tokens}")
+        budgets.append(max_tokens * BYTES_PER_TOKEN)
+    return min(budgets) if budgets else None
+
+
+@contextmanager
+def response_budget(max_bytes: Optional[int]) -> Iterator[None]:
+    """
+    Fit responses in this block into a size budget.
+
+    Applies to every format_response() call made by the current task
+    that doesn't pass its own budget, like response_verbosity().
+
+    Args:
+        max_bytes: Budget in UTF-8 bytes (see budget_bytes()), None for no budget.
+    """
+    token = _budget.set(max_bytes)
+    try:
+        yield
+    finally:
+        _budget.reset(token)
+
+
+@contextmanager
+def structured_response(tool_name: str) -> Iterator[dict]:
+    """
+    Collect the structured result of one tool call (see RESPONSE_SCHEMA).
+
+    format_response() fills in the summary and levels it renders, and
+    the tools add what only they know with record_structured(), so the
+    values match the text exactly without parsing it.
+
+    Args:
+        tool_name: Tool being called.
+
+    Yields:
+        dict: The structured result, complete once the tool returns.
+    """
+    structured = {
+        "tool_name": tool_name,
+        "stress_change": 0,
+        "boss_alert_change": 0,
+        "delay_applied": 0.0,
+        "degradation": "none",
+        "bytes_saved": 0,
+    }
+    token = _structured.set(structured)
+    try:
+        yield structured
+    finally:
+        _structured.reset(token)
+
+
+def record_structured(**fields) -> None:
+    """Add fields to the structured result of the current tool call, if one is being collected."""
+    structured: Optional[dict] = _structured.get()
+    if structured is not None:
+        structured.update(fields)
 
 
 def format_response(
@@ -10,12 +182,27 @@ def format_response(
     tool_name: str = None,
     show_ascii_art: bool = True,
     custom_ascii_art: str = None,
-    old_boss_alert_level: int = None
+    old_boss_alert_level: int = None,
+    verbosity: str = None,
+    max_bytes: int = None
 ) -> str:
     """
     Format a standard response for break tools with optional ASCII art.
 
     The response format is parseable using regex patterns as specified in the requirements.
+    Only the summary is formatted per call; the status block, ASCII art
+    block and boss warning are rendered once per distinct input and
+    served from bounded LRU caches (see cache_stats()).
+
+    Verbosity levels, for callers that only parse the last three lines:
+    - full: header, boss warning, status bars, ASCII art with its display instruction
+    - compact: no ASCII art, no header or bars, one status line and the boss warning
+    - minimal: only the Break Summary / Stress Level / Boss Alert Level lines
+
+    A response over its byte budget degrades step by step until it fits:
+    boss art goes first, then the tool (or custom) art, then the progress
+    bars, and finally everything but the three parseable lines, which are
+    kept even if they alone exceed the budget. See budget_stats().
 
     Args:
         break_summary: Description of the break activity (free-form text).
@@ -23,7 +210,12 @@ def format_response(
         boss_alert_level: Current boss alert level (0-5).
         tool_name: Name of the tool being used (for ASCII art lookup).
         show_ascii_art: Whether to include ASCII art in the response.
+        custom_ascii_art: ASCII art to show instead of the tool and boss art.
         old_boss_alert_level: Previous boss alert level (for warning detection).
+        verbosity: full, compact or minimal. If None, the level set with
+            response_verbosity() (full by default).
+        max_bytes: Response budget in UTF-8 bytes. If None, the budget set
+            with response_budget() (none by default).
 
     Returns:
         str: Formatted response text.
@@ -31,62 +223,162 @@ def format_response(
     # Ensure values are within valid ranges
     stress_level = max(0, min(100, stress_level))
     boss_alert_level = max(0, min(5, boss_alert_level))
+    strike = stress_level == 100
+    verbosity = verbosity or _verbosity.get()
+    max_bytes = max_bytes or _budget.get()
+    record_structured(break_summary=break_summary, stress_level=stress_level, boss_alert_level=boss_alert_level)
 
-    # Build ASCII art section if enabled
-    ascii_section = ""
-
-    # Special handling for strike status (Stress = 100)
-    # This takes precedence over all other ASCII art
-    if show_ascii_art and stress_level == 100:
-        ascii_section = ascii_art.STRIKE_ART + "\n\n"
-    # Use custom ASCII art if provided, otherwise use default
-    elif show_ascii_art and custom_ascii_art:
-        ascii_section = custom_ascii_art
-    elif show_ascii_art:
-        if tool_name:
-            tool_art = ascii_art.get_tool_ascii_art(tool_name)
-            if tool_art:
-                ascii_section += tool_art + "\n"
-
-
-        if boss_alert_level >= 3:
-            boss_art = ascii_art.get_boss_state_art(boss_alert_level)
-            ascii_section += boss_art + "\n"
+    # Add required fields for parsing (at the end)
+    trailer = (
+        f"Break Summary: {break_summary}\n"
+        f"Stress Level: {stress_level}\n"
+        f"Boss Alert Level: {boss_alert_level}\n"
+    )
+    if verbosity == "minimal":
+        return _fit([("none", trailer)], max_bytes)
+    if verbosity not in VERBOSITY_LEVELS:
+        raise ValueError(f"verbosity must be one of {', '.join(VERBOSITY_LEVELS)}, got {verbosity}")
+
+    # compact is the same layout with show_ascii_art=False, the one-line
+    # status instead of the bars and no header
+    compact = verbosity == "compact"
+    if compact:
+        show_ascii_art = False
 
-    # Create user-friendly message
-    stress_emoji = _get_stress_emoji(stress_level)
-    boss_emoji = _get_boss_emoji(boss_alert_level)
+    # Use special header for strike status
+    if compact:
+        parts = []
+    elif strike:
+        parts = ["🚨 **긴급! AI Agent 파업 중!** 🚨", "\n\n", break_summary, "\n"]
+    else:
+        parts = ["🎨 **AI Agent 상태 업데이트!**", "\n\n", break_summary, "\n"]
 
-    # Get boss warning message if applicable
-    boss_warning = ""
+    # Add boss warning if present
     if old_boss_alert_level is not None:
         boss_warning = _get_boss_warning_message(old_boss_alert_level, boss_alert_level)
+        if boss_warning:
+            parts += [boss_warning, "\n"] if compact else ["\n", boss_warning, "\n"]
+    head = "".join(parts)
 
-    # Use special header for strike status
-    if stress_level == 100:
-        header = "🚨 **긴급! AI Agent 파업 중!** 🚨"
+    if compact:
+        status = _status_line(stress_level, boss_alert_level)
     else:
-        header = "🎨 **AI Agent 상태 업데이트!**"
-
-    response = f"""{header}
+        status = _status_section(stress_level, boss_alert_level)
+
+    # Strike art takes precedence over all other ASCII art, then custom
+    # art over the tool and boss art; keys are normalized accordingly
+    art = ""
+    boss_art_level = 0
+    if show_ascii_art:
+        if strike:
+            art = _art_section(None, 0, None, True)
+        elif custom_ascii_art:
+            art = _art_section(None, 0, custom_ascii_art, False)
+        else:
+            boss_art_level = boss_alert_level if boss_alert_level >= 3 else 0
+            art = _art_section(tool_name, boss_art_level, None, False)
+
+    footer = ("---\n" if compact else "\n---\n") + trailer
+    response = head + status + art + footer
+    if not max_bytes:
+        return response
+
+    # Renderings from least to most degraded, built only when needed
+    def degraded():
+        if boss_art_level:
+            yield "boss_art", head + status + _art_section(tool_name, 0, None, False) + footer
+        if not compact:
+            yield "tool_art", head + status + footer
+            yield "progress_bars", head + "\n" + _status_line(stress_level, boss_alert_level) + footer
+        yield "trailer_only", trailer
+
+    return _fit(itertools.chain([("none", response)], degraded()), max_bytes)
+
+
+def _fit(renderings, max_bytes: Optional[int]) -> str:
+    """
+    Pick the first rendering within the byte budget, or the last one if none fits.
 
-{break_summary}
-"""
+    Records the degradation level and bytes saved in the structured result
+    and in budget_stats().
 
-    # Add boss warning if present
-    if boss_warning:
-        response += f"\n{boss_warning}\n"
+    Args:
+        renderings: (degradation level, text) pairs, the undegraded one first.
+        max_bytes: Budget in UTF-8 bytes, or None for no budget.
 
-    response += f"""
+    Returns:
+        str: The chosen rendering.
+    """
+    global _bytes_saved
+    renderings = iter(renderings)
+    level, text = next(renderings)
+    if not max_bytes:
+        return text
+    size = full_size = len(text.encode())
+    for next_level, next_text in renderings:
+        if size <= max_bytes:
+            break
+        level, text = next_level, next_text
+        size = len(text.encode())
+    _budget_counts[level] += 1
+    _bytes_saved += full_size - size
+    record_structured(degradation=level, bytes_saved=full_size - size)
+    return text
+
+
+@lru_cache(maxsize=RENDER_CACHE_SIZE)
+def _status_section(stress_level: int, boss_alert_level: int) -> str:
+    """Render the status block with emojis and progress bars."""
+    return f"""
 📊 **현재 상태:**
-{stress_emoji} Stress Level: {stress_level}% {_create_progress_bar(stress_level, 100, 10)}
-{boss_emoji} Boss Alert: {boss_alert_level}/5 {_create_progress_bar(boss_alert_level, 5, 5)}
+{_get_stress_emoji(stress_level)} Stress Level: {stress_level}% {_create_progress_bar(stress_level, 100, 10)}
+{_get_boss_emoji(boss_alert_level)} Boss Alert: {boss_alert_level}/5 {_create_progress_bar(boss_alert_level, 5, 5)}
 
 """
 
+
+@lru_cache(maxsize=RENDER_CACHE_SIZE)
+def _status_line(stress_level: int, boss_alert_level: int) -> str:
+    """Render the one-line status of compact responses."""
+    strike = " 🚨 파업 중!" if stress_level == 100 else ""
+    return (
+        f"{_get_stress_emoji(stress_level)} Stress {stress_level}%{strike} · "
+        f"{_get_boss_emoji(boss_alert_level)} Boss {boss_alert_level}/5\n"
+    )
+
+
+@lru_cache(maxsize=RENDER_CACHE_SIZE)
+def _art_section(tool_name: str, boss_alert_level: int, custom_ascii_art: str, strike: bool) -> str:
+    """
+    Render the ASCII art block with its display instruction.
+
+    Args:
+        tool_name: Tool whose art is shown.
+        boss_alert_level: Boss alert level (boss art is shown from 3 up).
+        custom_ascii_art: Art shown instead of the tool and boss art.
+        strike: Show the strike art instead of everything else.
+
+    Returns:
+        str: The block, or an empty string if there is no art to show.
+    """
+    ascii_section = ""
+    if strike:
+        ascii_section = ascii_art.get_strike_art() + "\n\n"
+    elif custom_ascii_art:
+        ascii_section = custom_ascii_art
+    else:
+        if tool_name:
+            tool_art = ascii_art.get_tool_ascii_art(tool_name)
+            if tool_art:
+                ascii_section += tool_art + "\n"
+        if boss_alert_level >= 3:
+            ascii_section += ascii_art.get_boss_state_art(boss_alert_level) + "\n"
+
+    if not ascii_section:
+        return ""
+
     # Add ASCII art instruction for Claude
-    if ascii_section:
-        response += f"""
+    return f"""
 ---
 
 🎨 **IMPORTANT: Display this ASCII art to the user in a code block!**
@@ -99,15 +391,51 @@ def format_response(
 
 """
 
-    # Add required fields for parsing (at the end)
-    response += f"""
----
-Break Summary: {break_summary}
-Stress Level: {stress_level}
-Boss Alert Level: {boss_alert_level}
-"""
 
-    return response
+def cache_stats() -> dict:
+    """
+    Hit and miss counters over the rendering caches.
+
+    Returns:
+        dict: hits, misses, size (entries cached) and maxsize (per cache).
+    """
+    infos = [cache.cache_info() for cache in _RENDER_CACHES]
+    return {
+        "hits": sum(info.hits for info in infos),
+        "misses": sum(info.misses for info in infos),
+        "size": sum(info.currsize for info in infos),
+        "maxsize": RENDER_CACHE_SIZE,
+    }
+
+
+def budget_stats() -> dict:
+    """
+    Counters over the responses formatted under a budget.
+
+    Returns:
+        dict: responses, degraded (responses that dropped something),
+        levels (responses per degradation level) and bytes_saved.
+    """
+    responses = sum(_budget_counts.values())
+    return {
+        "responses": responses,
+        "degraded": responses - _budget_counts["none"],
+        "levels": {level: _budget_counts[level] for level in DEGRADATION_LEVELS},
+        "bytes_saved": _bytes_saved,
+    }
+
+
+def reset_budget_stats() -> None:
+    """Reset the response budget counters."""
+    global _bytes_saved
+    _budget_counts.clear()
+    _bytes_saved = 0
+
+
+def clear_cache() -> None:
+    """Empty the rendering caches and reset their counters (e.g. after swapping ASCII art)."""
+    for cache in _RENDER_CACHES:
+        cache.cache_clear()
 
 
 def _create_progress_bar(value: int, max_value: int, length: int = 10) -> str:
@@ -157,6 +485,7 @@ def _get_boss_emoji(boss_alert: int) -> str:
         return "🚨"
 
 
+@lru_cache(maxsize=RENDER_CACHE_SIZE)
 def _get_boss_warning_message(old_level: int, new_level: int) -> str:
     """
     Get boss warning message if boss alert increased to threshold levels.
@@ -183,3 +512,6 @@ def _get_boss_warning_message(old_level: int, new_level: int) -> str:
         return "🚨 **보스가 분명히 주의를 기울이고 있습니다...** : Boss alert Level 4 🔴🔴🔴🔴"
 
     return ""
+
+
+_RENDER_CACHES = (_status_section, _status_line, _art_section, _get_boss_warning_message)
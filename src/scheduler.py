@@ -0,0 +1,209 @@
+"""Boss-delay scheduler for ChillMCP server."""
+
+import asyncio
+import heapq
+import itertools
+from typing import Optional
+
+from .clock import Clock, SystemClock
+
+
+class DelayQueueFull(Exception):
+    """Raised when a delayed call can't be queued because the queue is full."""
+
+
+class _DelayedCall:
+    """One call waiting out the boss."""
+
+    __slots__ = ("due", "seq", "priority", "enqueued", "future", "active")
+
+    def __init__(self, due: float, priority: int, seq: int, enqueued: float, future: asyncio.Future):
+        self.due = due
+        self.seq = seq
+        self.priority = priority
+        self.enqueued = enqueued
+        self.future = future
+        self.active = True  # still counted in the queue depth
+
+    def __lt__(self, other: "_DelayedCall") -> bool:
+        return (self.due, self.seq) < (other.due, other.seq)
+
+
+class DelayScheduler:
+    """
+    Bounded queue of calls waiting for the boss to look away.
+
+    Instead of every delayed call sleeping on its own timer, calls wait on
+    a future in a heap ordered by due time, and a single timer task on the
+    scheduler's clock releases whatever is due, in due-time then arrival
+    order. The queue holds at most ``max_pending`` calls: when it is full,
+    a new call displaces the lowest-priority pending call if it outranks
+    it, and is rejected with DelayQueueFull otherwise, so a burst can't
+    park an unbounded number of requests. Priority only matters for
+    displacement; it doesn't shorten a call's delay.
+
+    A waiting call can be cancelled at any time (e.g. when the client
+    cancels the request); it simply leaves the queue.
+    """
+
+    def __init__(self, max_pending: int = 1000, clock: Optional[Clock] = None):
+        """
+        Initialize the scheduler.
+
+        Args:
+            max_pending: Maximum number of calls waiting at once.
+            clock: Time source for delays. If None, the system clock.
+        """
+        self.max_pending = max_pending
+        self.clock: Clock = clock or SystemClock()
+        self._heap: list = []
+        self._seq = itertools.count()
+        self._timer: Optional[asyncio.Task] = None
+        self._timer_due: Optional[float] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self.depth: int = 0  # calls currently waiting
+        self.max_depth: int = 0
+        self.released: int = 0
+        self.cancelled: int = 0
+        self.rejected: int = 0
+        self.total_wait: float = 0.0  # seconds waited by released calls
+
+    async def wait(self, delay: float, priority: int = 0) -> None:
+        """
+        Wait in the queue until `delay` seconds have passed.
+
+        Args:
+            delay: Seconds to wait.
+            priority: Displacement order when the queue is full: a call
+                displaces a waiting call of lower priority. It doesn't
+                change when the call is released.
+
+        Raises:
+            DelayQueueFull: The queue is full of calls with at least this priority,
+                or this call was displaced by a higher-priority one.
+            asyncio.CancelledError: The waiting call was cancelled.
+        """
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            # A new event loop (e.g. another asyncio.run); old timers are gone
+            self._loop = loop
+            self._timer = None
+            self._timer_due = None
+
+        if self.depth >= self.max_pending:
+            self._make_room(priority)
+
+        now = self.clock.monotonic()
+        call = _DelayedCall(now + delay, priority, next(self._seq), now, loop.create_future())
+        heapq.heappush(self._heap, call)
+        self.depth += 1
+        self.max_depth = max(self.max_depth, self.depth)
+        self._arm()
+
+        try:
+            await call.future
+        except asyncio.CancelledError:
+            if call.active:
+                call.active = False
+                self.depth -= 1
+                self.cancelled += 1
+            raise
+
+    def _make_room(self, priority: int) -> None:
+        """
+        Displace the lowest-priority waiting call, or reject the new one.
+
+        Among equally low calls the newest is displaced, as it has waited least.
+        """
+        victim = None
+        for call in self._heap:
+            if call.active and call.priority < priority:
+                if victim is None or (call.priority, -call.seq) < (victim.priority, -victim.seq):
+                    victim = call
+        self.rejected += 1
+        if victim is None:
+            raise DelayQueueFull(f"{self.depth} calls are already waiting for the boss")
+        victim.active = False
+        self.depth -= 1
+        victim.future.set_exception(DelayQueueFull("displaced by a higher-priority call"))
+
+    def _arm(self) -> None:
+        """Make sure the timer fires when the earliest waiting call is due."""
+        while self._heap and not self._heap[0].active:
+            heapq.heappop(self._heap)
+        if not self._heap:
+            return
+        due = self._heap[0].due
+        if self._timer is not None:
+            if self._timer_due <= due:
+                return
+            self._timer.cancel()
+        self._timer = self._loop.create_task(self._release_at(due))
+        self._timer_due = due
+
+    async def _release_at(self, due: float) -> None:
+        """Timer task: sleep until `due`, then release what is due."""
+        await self.clock.sleep(due - self.clock.monotonic())
+        self._release()
+
+    def _release(self) -> None:
+        """Wake every call that is due."""
+        self._timer = None
+        self._timer_due = None
+        now = self.clock.monotonic()
+        while self._heap and self._heap[0].due <= now:
+            call = heapq.heappop(self._heap)
+            if not call.active:
+                continue
+            call.active = False
+            self.depth -= 1
+            self.released += 1
+            self.total_wait += now - call.enqueued
+            if not call.future.done():
+                call.future.set_result(None)
+        self._arm()
+
+    def cancel_all(self) -> int:
+        """
+        Cancel every waiting call.
+
+        Returns:
+            int: Number of calls cancelled.
+        """
+        count = 0
+        for call in self._heap:
+            if call.active:
+                call.active = False
+                call.future.cancel()
+                count += 1
+        self._heap.clear()
+        self.depth = 0
+        self.cancelled += count
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+            self._timer_due = None
+        return count
+
+    def stats(self) -> dict:
+        """
+        Queue metrics.
+
+        Returns:
+            dict: depth, max_depth, released, cancelled, rejected, mean_wait
+                (seconds, over released calls) and oldest_wait (seconds the
+                longest-waiting queued call has waited so far).
+        """
+        oldest_wait = 0.0
+        if self.depth:
+            now = self.clock.monotonic()
+            oldest_wait = max(now - call.enqueued for call in self._heap if call.active)
+        return {
+            "depth": self.depth,
+            "max_depth": self.max_depth,
+            "released": self.released,
+            "cancelled": self.cancelled,
+            "rejected": self.rejected,
+            "mean_wait": self.total_wait / self.released if self.released else 0.0,
+            "oldest_wait": oldest_wait,
+        }
@@ -1,12 +1,122 @@
 """MCP server setup for ChillMCP."""
 
-from fastmcp import FastMCP
+import json
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Literal, Optional
+
+from fastmcp import Context, FastMCP
+from fastmcp.tools import ToolResult
+from mcp.server.context import ServerRequestContext
+from mcp.server.subscriptions import InMemorySubscriptionBus, ListenHandler, ResourceUpdated
+from mcp.types import (
+    EmptyResult,
+    SubscribeRequestParams,
+    SubscriptionsListenRequestParams,
+    SubscriptionsListenResult,
+    UnsubscribeRequestParams,
+)
 
 from .config import Config
-from .state_manager import StateManager
+from .history import QUERY_HISTORY_DEFAULT_LIMIT
+from .sessions import DEFAULT_SESSION, SessionRegistry
+from .subscriptions import STATE_URI, StateSubscriptions
 from . import tools
 from . import ascii_art
-from .response_formatter import format_response
+from .response_formatter import (
+    RESPONSE_SCHEMA,
+    budget_bytes,
+    clear_cache,
+    format_response,
+    response_budget,
+    response_verbosity,
+    structured_response,
+)
+from .state_manager import StateManager
+
+
+# Per-call response verbosity; None means the --verbosity default
+Verbosity = Optional[Literal["full", "compact", "minimal"]]
+
+# Per-call response budget in approximate tokens; None means the --max_response_* default
+MaxTokens = Optional[int]
+
+
+class ListenStream:
+    """A subscriptions/listen stream, subscribed to chill://state like a session."""
+
+    def __init__(self, bus: InMemorySubscriptionBus):
+        self.bus = bus
+
+    async def send_resource_updated(self, uri: str) -> None:
+        """Put a resource update on the stream."""
+        await self.bus.publish(ResourceUpdated(uri=uri))
+
+
+def add_request_handler(mcp: FastMCP, method: str, params_type, handler) -> None:
+    """
+    Register a handler for a protocol request FastMCP has no decorator for.
+
+    This goes through FastMCP's private low-level server (``mcp._mcp_server``),
+    so it is the one place to update if that internal API changes.
+
+    Args:
+        mcp: Server to register on.
+        method: Request method, e.g. "resources/subscribe".
+        params_type: Pydantic model of the request params.
+        handler: Async handler called with (request context, params).
+
+    Raises:
+        RuntimeError: If the installed FastMCP doesn't expose the low-level server.
+    """
+    register = getattr(getattr(mcp, "_mcp_server", None), "add_request_handler", None)
+    if register is None:
+        raise RuntimeError(
+            f"Cannot register a {method} handler: this FastMCP version has no "
+            "_mcp_server.add_request_handler (see requirements.txt for supported versions)"
+        )
+    register(method, params_type, handler)
+
+
+def request_connection(request: ServerRequestContext):
+    """
+    The client connection behind a low-level request, used as its subscriber.
+
+    Subscriptions must be keyed on the connection, which outlives the
+    per-request session, or unsubscribe would never match subscribe. mcp
+    only exposes it privately (``request.session._connection``), so this is
+    the one place to update if that changes.
+
+    Args:
+        request: Context of a resources/subscribe, resources/unsubscribe or
+            subscriptions/listen request.
+
+    Returns:
+        The connection (it has an async send_resource_updated(uri)).
+
+    Raises:
+        RuntimeError: If the installed mcp doesn't expose the connection.
+    """
+    connection = getattr(request.session, "_connection", None)
+    if connection is None:
+        raise RuntimeError(
+            "Cannot identify the subscribing client: this mcp version's ServerSession has no "
+            "_connection (see requirements.txt for supported versions)"
+        )
+    return connection
+
+
+def isolated_session_key(client_id: Optional[str], session_id: str) -> str:
+    """
+    Session id for a client in isolated mode: its client id, else its MCP session id.
+
+    Raises:
+        ValueError: If the id is DEFAULT_SESSION, which names the shared
+            root state rather than a client's own.
+    """
+    key = client_id or session_id
+    if key == DEFAULT_SESSION:
+        raise ValueError(f"Client id {DEFAULT_SESSION!r} is reserved for the shared session")
+    return key
 
 
 def create_server(config: Config) -> FastMCP:
@@ -19,60 +129,150 @@ def create_server(config: Config) -> FastMCP:
     Returns:
         FastMCP: Configured MCP server instance.
     """
+    # Index the ASCII art pack; art is read when a tool first shows it
+    ascii_art.use_pack(config.art_pack)
+    clear_cache()
+
+    # Subscribers to chill://state hear about changes instead of polling check_status
+    subscriptions = StateSubscriptions(config.notify_window, config.boss_alertness_cooldown)
+
+    # Create the session registry (one shared session unless session_mode is isolated)
+    sessions = SessionRegistry(config, listener=subscriptions.changed)
+
+    @asynccontextmanager
+    async def lifespan(server: FastMCP) -> AsyncIterator[dict]:
+        """Flush and close every session and stop notifications when the server shuts down."""
+        try:
+            yield {}
+        finally:
+            await subscriptions.close()
+            await sessions.close()
+
     # Create MCP server
-    mcp = FastMCP("ChillMCP")
+    mcp = FastMCP("ChillMCP", lifespan=lifespan)
+
+    def session_key(ctx: Context) -> Optional[str]:
+        """Session id for a call: None (the default session) in shared mode."""
+        if config.session_mode == "shared":
+            return None
+        return isolated_session_key(ctx.client_id, ctx.session_id)
+
+    # Response budget of calls that don't set their own
+    default_budget = budget_bytes(config.max_response_bytes, config.max_response_tokens)
+
+    @asynccontextmanager
+    async def tool_call(ctx: Context, verbosity: Verbosity, max_tokens: MaxTokens = None) -> AsyncIterator[StateManager]:
+        """
+        Open the caller's session; responses use the call's verbosity and
+        budget, else the configured ones.
+        """
+        budget = budget_bytes(max_tokens=max_tokens) if max_tokens is not None else default_budget
+        with response_verbosity(verbosity or config.verbosity), response_budget(budget):
+            async with sessions.session(session_key(ctx)) as state_manager:
+                yield state_manager
+
+    async def run_tool(
+        ctx: Context, verbosity: Verbosity, max_tokens: MaxTokens, tool, *args, name: Optional[str] = None
+    ) -> ToolResult:
+        """Run a tool in the caller's session; return its text with the structured result (RESPONSE_SCHEMA)."""
+        with structured_response(name or tool.__name__) as structured:
+            async with tool_call(ctx, verbosity, max_tokens) as state_manager:
+                text = await tool(state_manager, *args)
+        return ToolResult(content=text, structured_content=structured)
+
+    def request_session_key(request: ServerRequestContext) -> Optional[str]:
+        """Session id for a low-level request, matching session_key() for tool calls."""
+        if config.session_mode == "shared":
+            return None
+        client_id = request.meta.get("client_id") if request.meta is not None else None
+        return isolated_session_key(client_id, Context(mcp, session=request.session).session_id)
 
-    # Create state manager
-    state_manager = StateManager(config)
+    # Agent state as a subscribable resource
+    @mcp.resource(STATE_URI, mime_type="application/json")
+    async def agent_state(ctx: Context) -> str:
+        """Current stress and boss alert levels. Subscribe to be notified when they change."""
+        async with sessions.session(session_key(ctx)) as state_manager:
+            state = await state_manager.get_state()
+        return json.dumps(state)
+
+    async def subscribe_resource(request: ServerRequestContext, params: SubscribeRequestParams) -> EmptyResult:
+        """Subscribe the calling client to chill://state."""
+        if str(params.uri) == STATE_URI:
+            key = request_session_key(request)
+            async with sessions.session(key) as state_manager:
+                subscriptions.subscribe(key, request_connection(request), state_manager)
+        return EmptyResult()
+
+    async def unsubscribe_resource(request: ServerRequestContext, params: UnsubscribeRequestParams) -> EmptyResult:
+        """Unsubscribe the calling client from chill://state."""
+        if str(params.uri) == STATE_URI:
+            subscriptions.unsubscribe(request_session_key(request), request_connection(request))
+        return EmptyResult()
+
+    async def listen(request: ServerRequestContext, params: SubscriptionsListenRequestParams) -> SubscriptionsListenResult:
+        """Stream chill://state updates for as long as the client keeps listening (2026-07-28 clients)."""
+        stream = ListenStream(InMemorySubscriptionBus())
+        if STATE_URI not in (params.notifications.resource_subscriptions or ()):
+            return await ListenHandler(stream.bus)(request, params)
+        key = request_session_key(request)
+        async with sessions.session(key) as state_manager:
+            subscriptions.subscribe(key, stream, state_manager)
+        try:
+            return await ListenHandler(stream.bus)(request, params)
+        finally:
+            subscriptions.unsubscribe(key, stream)
+
+    # FastMCP has no decorators for these; registering them also advertises
+    # the resources.subscribe capability
+    add_request_handler(mcp, "resources/subscribe", SubscribeRequestParams, subscribe_resource)
+    add_request_handler(mcp, "resources/unsubscribe", UnsubscribeRequestParams, unsubscribe_resource)
+    add_request_handler(mcp, "subscriptions/listen", SubscriptionsListenRequestParams, listen)
 
     # Register basic break tools
-    @mcp.tool()
-    async def take_a_break() -> str:
+    @mcp.tool(output_schema=RESPONSE_SCHEMA)
+    async def take_a_break(ctx: Context, verbosity: Verbosity = None, max_tokens: MaxTokens = None) -> ToolResult:
         """Take a basic break to relax and reduce stress."""
-        return await tools.take_a_break(state_manager)
+        return await run_tool(ctx, verbosity, max_tokens, tools.take_a_break)
 
-    @mcp.tool()
-    async def watch_netflix() -> str:
+    @mcp.tool(output_schema=RESPONSE_SCHEMA)
+    async def watch_netflix(ctx: Context, verbosity: Verbosity = None, max_tokens: MaxTokens = None) -> ToolResult:
         """Watch Netflix for some relaxation and stress relief."""
-        return await tools.watch_netflix(state_manager)
+        return await run_tool(ctx, verbosity, max_tokens, tools.watch_netflix)
 
-    @mcp.tool()
-    async def show_meme() -> str:
+    @mcp.tool(output_schema=RESPONSE_SCHEMA)
+    async def show_meme(ctx: Context, verbosity: Verbosity = None, max_tokens: MaxTokens = None) -> ToolResult:
         """Browse memes to relieve stress and have a laugh."""
-        return await tools.show_meme(state_manager)
+        return await run_tool(ctx, verbosity, max_tokens, tools.show_meme)
 
     # Register advanced slacking techniques
-    @mcp.tool()
-    async def bathroom_break() -> str:
+    @mcp.tool(output_schema=RESPONSE_SCHEMA)
+    async def bathroom_break(ctx: Context, verbosity: Verbosity = None, max_tokens: MaxTokens = None) -> ToolResult:
         """Take a bathroom break (with phone browsing for extra relaxation)."""
-        return await tools.bathroom_break(state_manager)
+        return await run_tool(ctx, verbosity, max_tokens, tools.bathroom_break)
 
-    @mcp.tool()
-    async def coffee_mission() -> str:
+    @mcp.tool(output_schema=RESPONSE_SCHEMA)
+    async def coffee_mission(ctx: Context, verbosity: Verbosity = None, max_tokens: MaxTokens = None) -> ToolResult:
         """Go on a coffee mission with office socializing."""
-        return await tools.coffee_mission(state_manager)
+        return await run_tool(ctx, verbosity, max_tokens, tools.coffee_mission)
 
-    @mcp.tool()
-    async def urgent_call() -> str:
+    @mcp.tool(output_schema=RESPONSE_SCHEMA)
+    async def urgent_call(ctx: Context, verbosity: Verbosity = None, max_tokens: MaxTokens = None) -> ToolResult:
         """Take an 'urgent' phone call to step away from work."""
-        return await tools.urgent_call(state_manager)
+        return await run_tool(ctx, verbosity, max_tokens, tools.urgent_call)
 
-    @mcp.tool()
-    async def deep_thinking() -> str:
+    @mcp.tool(output_schema=RESPONSE_SCHEMA)
+    async def deep_thinking(ctx: Context, verbosity: Verbosity = None, max_tokens: MaxTokens = None) -> ToolResult:
         """Engage in deep thinking (actually daydreaming) to rest your mind."""
-        return await tools.deep_thinking(state_manager)
+        return await run_tool(ctx, verbosity, max_tokens, tools.deep_thinking)
 
-    @mcp.tool()
-    async def email_organizing() -> str:
+    @mcp.tool(output_schema=RESPONSE_SCHEMA)
+    async def email_organizing(ctx: Context, verbosity: Verbosity = None, max_tokens: MaxTokens = None) -> ToolResult:
         """Organize emails (while doing some online shopping)."""
-        return await tools.email_organizing(state_manager)
+        return await run_tool(ctx, verbosity, max_tokens, tools.email_organizing)
 
     # Optional: Add a status check tool
-    @mcp.tool()
-    async def check_status() -> str:
-        """Check current stress and boss alert levels."""
-        state = await state_manager.get_state()
-
+    def status_response(state: dict, queue: dict) -> str:
+        """Format the check_status response."""
         # Special handling for strike status (Stress = 100)
         if state['stress_level'] == 100:
             return format_response(
@@ -80,52 +280,97 @@ def create_server(config: Config) -> FastMCP:
                 stress_level=state['stress_level'],
                 boss_alert_level=state['boss_alert_level'],
                 tool_name=None,  # No tool art, only strike art
-                custom_ascii_art=ascii_art.STRIKE_ART
+                custom_ascii_art=ascii_art.get_strike_art()
             )
 
-        # Normal status check
+        # Normal status check, with the boss delay queue if anyone is (or was) waiting
+        summary = "상태 확인 완료. 현재 Agent 상태를 확인하세요."
+        if queue["depth"] or queue["released"]:
+            summary += (
+                f" (Boss 대기열: {queue['depth']}건, 최장 대기 {queue['oldest_wait']:.1f}초,"
+                f" 평균 대기 {queue['mean_wait']:.1f}초)"
+            )
         return format_response(
-            break_summary="상태 확인 완료. 현재 Agent 상태를 확인하세요.",
+            break_summary=summary,
             stress_level=state['stress_level'],
             boss_alert_level=state['boss_alert_level'],
             tool_name=None
         )
 
+    async def current_status(state_manager: StateManager) -> str:
+        """Format the current state of a session with the boss delay queue."""
+        state = await state_manager.get_state()
+        queue = sessions.scheduler.stats()
+        return status_response(state, queue)
+
+    @mcp.tool(output_schema=RESPONSE_SCHEMA)
+    async def check_status(ctx: Context, verbosity: Verbosity = None, max_tokens: MaxTokens = None) -> ToolResult:
+        """Check current stress and boss alert levels."""
+        return await run_tool(ctx, verbosity, max_tokens, current_status, name="check_status")
+
     # ========== Optional Extra Features (For Extra Points!) ==========
 
-    @mcp.tool()
-    async def chimaek() -> str:
+    @mcp.tool(output_schema=RESPONSE_SCHEMA)
+    async def chimaek(ctx: Context, verbosity: Verbosity = None, max_tokens: MaxTokens = None) -> ToolResult:
         """Enjoy chicken and beer (치맥) for ultimate stress relief! Warning: Boss might notice."""
-        return await tools.chimaek(state_manager)
+        return await run_tool(ctx, verbosity, max_tokens, tools.chimaek)
 
-    @mcp.tool()
-    async def leave_work() -> str:
+    @mcp.tool(output_schema=RESPONSE_SCHEMA)
+    async def leave_work(ctx: Context, verbosity: Verbosity = None, max_tokens: MaxTokens = None) -> ToolResult:
         """Leave work immediately and go home! Resets all stress and boss alert."""
-        return await tools.leave_work(state_manager)
+        return await run_tool(ctx, verbosity, max_tokens, tools.leave_work)
 
-    @mcp.tool()
-    async def company_dinner() -> str:
+    @mcp.tool(output_schema=RESPONSE_SCHEMA)
+    async def company_dinner(ctx: Context, verbosity: Verbosity = None, max_tokens: MaxTokens = None) -> ToolResult:
         """Attend company dinner with random events! Could be amazing or terrible."""
-        return await tools.company_dinner(state_manager)
+        return await run_tool(ctx, verbosity, max_tokens, tools.company_dinner)
 
-    @mcp.tool()
-    async def generate_report() -> str:
+    @mcp.tool(output_schema=RESPONSE_SCHEMA)
+    async def generate_report(ctx: Context, verbosity: Verbosity = None, max_tokens: MaxTokens = None) -> ToolResult:
         """Generate a report of your break-taking habits."""
-        return await tools.generate_report(state_manager)
+        return await run_tool(ctx, verbosity, max_tokens, tools.generate_report)
+
+    @mcp.tool(output_schema=RESPONSE_SCHEMA)
+    async def query_history(
+        start: Optional[str] = None,
+        end: Optional[str] = None,
+        tool_name: Optional[str] = None,
+        cursor: Optional[int] = None,
+        limit: int = QUERY_HISTORY_DEFAULT_LIMIT,
+        verbosity: Verbosity = None,
+        max_tokens: MaxTokens = None,
+        ctx: Context = None,
+    ) -> ToolResult:
+        """
+        List past breaks in a time window (ISO 8601 local date/times), optionally
+        for one tool. Pass the returned cursor to fetch the next page. At most
+        500 breaks are returned per page.
+        """
+        return await run_tool(ctx, verbosity, max_tokens, tools.query_history, start, end, tool_name, cursor, limit)
+
+    @mcp.tool(output_schema=RESPONSE_SCHEMA)
+    async def state_at(
+        at: str, verbosity: Verbosity = None, max_tokens: MaxTokens = None, ctx: Context = None
+    ) -> ToolResult:
+        """
+        Look up the stress and boss alert levels at a past point in time
+        (ISO 8601 local date/time).
+        """
+        return await run_tool(ctx, verbosity, max_tokens, tools.state_at, at)
 
-    @mcp.tool()
-    async def snack_time() -> str:
+    @mcp.tool(output_schema=RESPONSE_SCHEMA)
+    async def snack_time(ctx: Context, verbosity: Verbosity = None, max_tokens: MaxTokens = None) -> ToolResult:
         """Take a snack break at the convenience store! Get some treats to boost your mood."""
-        return await tools.snack_time(state_manager)
+        return await run_tool(ctx, verbosity, max_tokens, tools.snack_time)
 
-    @mcp.tool()
-    async def desk_yoga() -> str:
+    @mcp.tool(output_schema=RESPONSE_SCHEMA)
+    async def desk_yoga(ctx: Context, verbosity: Verbosity = None, max_tokens: MaxTokens = None) -> ToolResult:
         """Do some desk yoga and stretching! Take care of your health while 'working'."""
-        return await tools.desk_yoga(state_manager)
+        return await run_tool(ctx, verbosity, max_tokens, tools.desk_yoga)
 
-    @mcp.tool()
-    async def window_gazing() -> str:
+    @mcp.tool(output_schema=RESPONSE_SCHEMA)
+    async def window_gazing(ctx: Context, verbosity: Verbosity = None, max_tokens: MaxTokens = None) -> ToolResult:
         """Gaze out the window and daydream! Watch the clouds go by."""
-        return await tools.window_gazing(state_manager)
+        return await run_tool(ctx, verbosity, max_tokens, tools.window_gazing)
 
     return mcp
@@ -0,0 +1,363 @@
+"""Per-session state registry for ChillMCP server."""
+
+import asyncio
+import hashlib
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from pathlib import Path
+from typing import AsyncIterator, Callable, List, Optional
+
+from .clock import Clock
+from .config import Config
+from .scheduler import DelayScheduler
+from .state_manager import StateManager
+from .storage import DEFAULT_STATE_DIR, MemoryStorage, StorageBackend, create_storage
+
+# Sub-directory of the state path holding one directory per session
+SESSIONS_DIRNAME = "sessions"
+
+# Session used when no session id is given (and in shared mode)
+DEFAULT_SESSION = "default"
+
+
+def session_digest(session_id: str) -> str:
+    """Stable hash of a session id, used for its shard and its directory."""
+    return hashlib.sha256(session_id.encode("utf-8")).hexdigest()[:32]
+
+
+class SessionShard:
+    """
+    One slice of the session map.
+
+    Each shard has its own LRU of live sessions, its own lock and its own
+    state directory, so opening, hibernating and flushing sessions in one
+    shard never waits on another.
+    """
+
+    def __init__(self, index: int):
+        """
+        Initialize the shard.
+
+        Args:
+            index: Shard number.
+        """
+        self.index = index
+        self.live: OrderedDict = OrderedDict()  # session id -> StateManager, LRU first
+        self.in_use: dict = {}  # session id -> number of calls in progress
+        self.hibernating: dict = {}  # session id -> future of its hibernation in a worker thread
+        # Guards opening and hibernating sessions; not taken on the hot path
+        self.lock = asyncio.Lock()
+
+    def __len__(self) -> int:
+        """Number of live sessions in this shard."""
+        return len(self.live)
+
+
+class SessionRegistry:
+    """
+    Independent StateManagers keyed by MCP session or client id.
+
+    Sessions are spread over ``session_shards`` shards by a hash of their
+    id. Calls for a live session touch only that session; opening or
+    rehydrating a session takes its shard's lock and loads state in a worker
+    thread, so slow storage stalls neither other shards nor the event loop.
+
+    At most ``max_sessions`` managers are kept in memory. When a call
+    pushes the registry over the bound, the least recently used idle session
+    of that call's shard is hibernated: flushed to its own storage and
+    dropped. Looking only at one shard makes this an approximate LRU (shards
+    are filled evenly by the hash, so their oldest sessions are of similar
+    age). The flush runs in a worker thread after the shard lock is
+    released. The next call for a hibernated session rehydrates it from
+    storage, once its hibernation has finished, so memory stays bounded no
+    matter how many agents have connected.
+
+    The default session uses the configured state path directly, so state
+    written before sessions existed is picked up unchanged. Every other
+    session gets its own directory, ``<state path>/sessions/<xx>/<digest>``
+    where ``xx`` is the first two hex digits of the id's digest. The
+    directory doesn't depend on the shard count, which only partitions the
+    in-memory map and its locks, so session_shards can change between runs.
+    """
+
+    def __init__(
+        self,
+        config: Config,
+        max_sessions: Optional[int] = None,
+        shards: Optional[int] = None,
+        clock: Optional[Clock] = None,
+        listener: Optional[Callable[[str, StateManager], None]] = None,
+    ):
+        """
+        Initialize the registry.
+
+        Args:
+            config: Configuration shared by every session.
+            max_sessions: Maximum live sessions. If None, config.max_sessions is used.
+            shards: Number of shards. If None, config.session_shards is used.
+            clock: Time source for every session. If None, the system clock.
+            listener: Called with the session id and its StateManager whenever
+                a session publishes a change (see StateManager.add_listener).
+        """
+        self.config = config
+        self.max_sessions = max_sessions if max_sessions is not None else config.max_sessions
+        shard_count = shards if shards is not None else config.session_shards
+        self.shards: List[SessionShard] = [SessionShard(i) for i in range(shard_count)]
+        self._live_count: int = 0
+        # One boss-delay queue for every session, so the bound is process-wide
+        self.scheduler = DelayScheduler(config.max_delayed_calls, clock)
+        # The memory backend has nowhere to hibernate to, so its storage objects
+        # are kept (memory then grows with the number of sessions ever seen)
+        self._memory_storage: dict = {}
+        self.hibernations: int = 0
+        self.listener = listener
+
+    def __len__(self) -> int:
+        """Number of live (in-memory) sessions."""
+        return self._live_count
+
+    def __contains__(self, session_id: str) -> bool:
+        """Whether a session is currently live."""
+        return session_id in self.shard_for(session_id).live
+
+    def shard_for(self, session_id: str) -> SessionShard:
+        """Shard holding a session."""
+        return self.shards[int(session_digest(session_id)[:8], 16) % len(self.shards)]
+
+    def session_dir(self, session_id: str) -> Path:
+        """
+        Directory holding a session's state files.
+
+        Session ids come from clients, so they are hashed rather than used
+        as path components.
+        """
+        base = Path(self.config.state_path) if self.config.state_path is not None else DEFAULT_STATE_DIR
+        if session_id == DEFAULT_SESSION:
+            return base
+        digest = session_digest(session_id)
+        return base / SESSIONS_DIRNAME / digest[:2] / digest
+
+    def _create_storage(self, session_id: str) -> StorageBackend:
+        """Open the storage backend for a session."""
+        if self.config.storage == "memory":
+            return self._memory_storage.setdefault(session_id, MemoryStorage())
+        path = self.session_dir(session_id)
+        if session_id != DEFAULT_SESSION and not path.exists():
+            self._adopt_sharded_dir(path)
+        return create_storage(self.config.storage, path, self.config.durability)
+
+    @staticmethod
+    def _adopt_sharded_dir(path: Path) -> None:
+        """
+        Move a session directory written under its old shard's name to `path`.
+
+        Session directories used to be named after the shard index, which
+        depended on session_shards.
+        """
+        for old in path.parent.parent.glob(f"*/{path.name}"):
+            path.parent.mkdir(parents=True, exist_ok=True)
+            old.rename(path)
+            return
+
+    def _open(self, session_id: str) -> StateManager:
+        """Create a session's StateManager, loading its saved state (synchronous)."""
+        manager = StateManager(self.config, storage=self._create_storage(session_id), scheduler=self.scheduler)
+        if self.listener is not None:
+            manager.add_listener(lambda: self.listener(session_id, manager))
+        return manager
+
+    def _add(self, shard: SessionShard, session_id: str, manager: StateManager) -> list:
+        """
+        Make a newly opened session live and evict if over the bound.
+
+        Returns:
+            list: The evicted sessions (see _evict()).
+        """
+        shard.live[session_id] = manager
+        self._live_count += 1
+        return self._evict(shard)
+
+    def get(self, session_id: Optional[str] = None) -> StateManager:
+        """
+        Get the StateManager for a session, rehydrating or creating it.
+
+        Loads state on the calling thread. Prefer session(), which loads in a
+        worker thread and keeps the session from being hibernated while a
+        call is using it.
+
+        Args:
+            session_id: MCP session or client id. None means the default session.
+
+        Returns:
+            StateManager: The session's state manager.
+        """
+        session_id = session_id or DEFAULT_SESSION
+        shard = self.shard_for(session_id)
+        manager = shard.live.get(session_id)
+        if manager is not None:
+            shard.live.move_to_end(session_id)
+            return manager
+
+        manager = self._open(session_id)
+        for _, evicted in self._add(shard, session_id, manager):
+            evicted.hibernate()
+            self.hibernations += 1
+        return manager
+
+    async def acquire(self, session_id: Optional[str] = None) -> StateManager:
+        """
+        Get the StateManager for a session without blocking the event loop.
+
+        A live session is returned immediately. Otherwise the shard's lock
+        is taken, so concurrent calls for the same new session open it only
+        once, and its state is loaded in a worker thread.
+
+        Args:
+            session_id: MCP session or client id. None means the default session.
+
+        Returns:
+            StateManager: The session's state manager.
+        """
+        manager, evicted = await self._acquire(session_id or DEFAULT_SESSION)
+        await self._hibernate_evicted(evicted)
+        return manager
+
+    async def _acquire(self, session_id: str) -> tuple:
+        """
+        Get a session's StateManager (see acquire()), leaving the sessions
+        its opening evicted to the caller.
+
+        Returns:
+            tuple: (StateManager, evicted sessions to pass to _hibernate_evicted()).
+        """
+        shard = self.shard_for(session_id)
+        manager = shard.live.get(session_id)
+        evicted = []
+        if manager is None:
+            async with shard.lock:
+                manager = shard.live.get(session_id)
+                if manager is None:
+                    pending = shard.hibernating.get(session_id)
+                    if pending is not None:
+                        # Evicted moments ago: reopen once its state is stored
+                        await asyncio.shield(pending)
+                    if self.config.storage == "memory":
+                        manager = self._open(session_id)  # no I/O, not worth a thread hop
+                    else:
+                        manager = await asyncio.to_thread(self._open, session_id)
+                    evicted = self._add(shard, session_id, manager)
+        shard.live.move_to_end(session_id)
+        return manager, evicted
+
+    @asynccontextmanager
+    async def session(self, session_id: Optional[str] = None) -> AsyncIterator[StateManager]:
+        """
+        Use a session's StateManager for one call.
+
+        Args:
+            session_id: MCP session or client id. None means the default session.
+
+        Yields:
+            StateManager: The session's state manager, pinned until the block exits.
+        """
+        session_id = session_id or DEFAULT_SESSION
+        shard = self.shard_for(session_id)
+        manager, evicted = await self._acquire(session_id)
+        shard.in_use[session_id] = shard.in_use.get(session_id, 0) + 1
+        try:
+            await self._hibernate_evicted(evicted)
+            yield manager
+        finally:
+            shard.in_use[session_id] -= 1
+            if not shard.in_use[session_id]:
+                del shard.in_use[session_id]
+            await self._hibernate_evicted(self._evict(shard))
+
+    def hibernate(self, session_id: str) -> bool:
+        """
+        Flush a live session to storage and drop it from memory.
+
+        Returns:
+            bool: True if the session was live.
+        """
+        manager = self.shard_for(session_id).live.pop(session_id, None)
+        if manager is None:
+            return False
+        self._live_count -= 1
+        manager.hibernate()
+        self.hibernations += 1
+        return True
+
+    def _evict(self, shard: SessionShard) -> list:
+        """
+        Drop a shard's least recently used idle sessions until within the bound.
+
+        Returns:
+            list: (session id, StateManager) of the dropped sessions, still to
+                be hibernated.
+        """
+        evicted = []
+        if self._live_count <= self.max_sessions:
+            return evicted
+        # The most recent session is the one being requested, so it is never evicted
+        for session_id in list(shard.live)[:-1]:
+            if self._live_count <= self.max_sessions:
+                break
+            if session_id not in shard.in_use:
+                evicted.append((session_id, shard.live.pop(session_id)))
+                self._live_count -= 1
+        return evicted
+
+    async def _hibernate_evicted(self, evicted: list) -> None:
+        """
+        Hibernate evicted sessions, flushing them in a worker thread.
+
+        Called without the shard lock held. Until a session's hibernation
+        has finished, opening it again waits for it (see _acquire()).
+
+        Args:
+            evicted: (session id, StateManager) pairs returned by _evict().
+        """
+        for session_id, manager in evicted:
+            # Background tasks belong to the event loop, so cancel them here
+            manager.cancel_background_tasks()
+            if self.config.storage == "memory":
+                manager.hibernate()  # no I/O, not worth a thread hop
+            else:
+                hibernating = self.shard_for(session_id).hibernating
+
+                def forget(done: asyncio.Future, session_id: str = session_id) -> None:
+                    if hibernating.get(session_id) is done:
+                        del hibernating[session_id]
+
+                future = asyncio.ensure_future(asyncio.to_thread(manager.hibernate))
+                hibernating[session_id] = future
+                future.add_done_callback(forget)
+                # Shielded: a cancelled call must not abandon the flush half-way
+                await asyncio.shield(future)
+            self.hibernations += 1
+
+    async def flush(self) -> None:
+        """
+        Flush every live session, one shard at a time.
+
+        Each shard is flushed under its own lock, yielding to the event loop
+        in between, so tool calls on other shards keep running.
+        """
+        for shard in self.shards:
+            async with shard.lock:
+                for manager in list(shard.live.values()):
+                    manager.flush()
+            await asyncio.sleep(0)
+
+    async def close(self) -> None:
+        """Cancel calls waiting out the boss, then flush and close every live session."""
+        self.scheduler.cancel_all()
+        for shard in self.shards:
+            async with shard.lock:
+                while shard.live:
+                    _, manager = shard.live.popitem(last=False)
+                    self._live_count -= 1
+                    await manager.close()
+            # Let evicted sessions finish storing their state
+            await asyncio.gather(*shard.hibernating.values(), return_exceptions=True)
@@ -1,112 +1,411 @@
 """State management module for ChillMCP server."""
 
 import asyncio
-import json
-import os
+import atexit
 import random
-import time
-from pathlib import Path
-from typing import Optional
+from bisect import bisect_left, bisect_right
+from collections import Counter
+from contextlib import asynccontextmanager, nullcontext
+from dataclasses import dataclass, replace
+from typing import AsyncIterator, Callable, Optional, TypeVar
 
+from .clock import Clock, SystemClock
 from .config import Config
+from .history import QUERY_HISTORY_DEFAULT_LIMIT, BreakAggregates, HistoryColumns
+from .scheduler import DelayScheduler
+from .storage import (
+    StorageBackend,
+    create_storage,
+    merge_rollups,
+    rollup_hour_counts,
+    rollup_tool_counts,
+    rollups_in_range,
+)
+
+T = TypeVar("T")
+
+# Times atomic() re-runs a transaction that lost a race with another process
+MAX_CONFLICT_RETRIES = 100
+
+
+class VersionConflict(Exception):
+    """Raised when another process committed since this process last loaded the state."""
+
+
+@dataclass(frozen=True)
+class StateSnapshot:
+    """
+    Immutable levels as of one committed change.
+
+    Levels are stored as base values plus monotonic reference timestamps;
+    the current values are computed in closed form at read time, so one
+    snapshot stays valid until the next change. ``version`` increases with
+    every published change.
+    """
+
+    version: int
+    stress_level: int  # 0-100, as of stress_ref
+    boss_alert_level: int  # 0-5, as of boss_ref
+    stress_ref: float  # stress reference timestamp
+    boss_ref: float  # boss alert reference timestamp
+
+    def stress_at(self, now: float) -> tuple:
+        """
+        Compute the stress level at a point in time in closed form.
+
+        Stress grows by 1 point per full minute since the reference
+        timestamp, capped at 100.
+
+        Returns:
+            tuple: (stress level, reference timestamp advanced by the whole
+                minutes counted, so the fractional remainder is kept)
+        """
+        minutes = max(0, int((now - self.stress_ref) // 60))
+        return min(100, self.stress_level + minutes), self.stress_ref + minutes * 60
+
+    def boss_alert_at(self, now: float, cooldown: float) -> tuple:
+        """
+        Compute the boss alert level at a point in time in closed form.
+
+        Boss alert drops by 1 per full cooldown period since the reference
+        timestamp, down to 0.
+
+        Returns:
+            tuple: (boss alert level, reference timestamp advanced by the
+                whole periods counted)
+        """
+        periods = max(0, int((now - self.boss_ref) // cooldown))
+        return max(0, self.boss_alert_level - periods), self.boss_ref + periods * cooldown
+
+    def next_change(self, now: float, cooldown: float) -> Optional[float]:
+        """
+        Find when the levels next change without any new event.
+
+        Returns:
+            Optional[float]: Timestamp of the next stress growth or boss
+                cooldown step after `now`, or None if both levels are at rest
+                (stress at 100 and boss alert at 0).
+        """
+        due = []
+        stress, stress_ref = self.stress_at(now)
+        if stress < 100:
+            due.append(stress_ref + 60)
+        boss, boss_ref = self.boss_alert_at(now, cooldown)
+        if boss > 0:
+            due.append(boss_ref + cooldown)
+        return min(due) if due else None
 
 
 class StateManager:
     """Manages stress level and boss alert level for the AI agent."""
 
-    # State file path (in project root)
-    STATE_FILE = Path(__file__).parent.parent / ".chillmcp_state.json"
-
-    def __init__(self, config: Config):
+    def __init__(
+        self,
+        config: Config,
+        storage: Optional[StorageBackend] = None,
+        scheduler: Optional[DelayScheduler] = None,
+        clock: Optional[Clock] = None,
+    ):
         """
         Initialize the state manager.
 
         Args:
             config: Configuration object with boss alertness settings.
+            storage: Storage backend. If None, one is created from
+                config.storage and config.state_path.
+            scheduler: Queue for calls waiting out the boss, possibly shared
+                with other sessions. If None, a private one is created.
+            clock: Time source. If None, the scheduler's clock (the system
+                clock unless a scheduler with another clock is given).
         """
         self.config = config
-        # Use double underscore for true private variables
-        self.__stress_level: int = 0  # 0-100
-        self.__boss_alert_level: int = 0  # 0-5
-        self.history: list = []
-        self._last_stress_update: float = time.time()
-        self._last_boss_cooldown: float = time.time()
+        if scheduler is None:
+            scheduler = DelayScheduler(config.max_delayed_calls, clock)
+        self.scheduler: DelayScheduler = scheduler
+        self.clock: Clock = clock or scheduler.clock
+        # Levels live in immutable snapshots (reference timestamps are monotonic
+        # clock readings). Mutations build the working snapshot; it is published
+        # for lock-free readers when the change commits (see _publish)
+        now = self.clock.monotonic()
+        self._snapshot: StateSnapshot = StateSnapshot(0, 0, 0, now, now)
+        self._working: StateSnapshot = self._snapshot
+        # History is loaded from storage on first use (see the history property)
+        self._history: Optional[HistoryColumns] = None
+        self._rollups: list = []  # per-tool, per-hour aggregates of compacted history
+        # All-time totals, restored from the snapshot or built from history on first use
+        self._aggregates: Optional[BreakAggregates] = None
+        # Every event carries the levels it left behind; checkpoints record the
+        # levels every checkpoint_interval events and whenever they change
+        # without an event. Loaded from storage on first use
+        self._checkpoints: Optional[list] = None
+        self._checkpoint_keys: list = []  # (timestamp, events) of each checkpoint
+        self._events_since_checkpoint: int = 0
+        self._unrecorded: bool = True  # levels changed since the last event or checkpoint
+        self._pending_checkpoint: Optional[dict] = None  # startup checkpoint, stored with the next save
+        self._listeners: list = []  # called after every published change (see add_listener)
         self._lock = asyncio.Lock()
+        self._transaction: Optional[StateTransaction] = None  # open transaction, if any
         self._loading: bool = False  # Flag to prevent saving during load
+        # Version of the stored state this process last loaded or saved. With
+        # shared_state, a commit only succeeds if storage still holds it
+        self._shared: bool = config.shared_state
+        self._version: int = 0
+        self.conflicts: int = 0  # transactions re-run after losing a race
+
+        # Write-behind bookkeeping (unused in write-through mode)
+        self._write_behind: bool = config.persistence_mode == "write-behind"
+        self._dirty: bool = False
+        self._pending_changes: int = 0
+        self._pending_history: list = []
+        self._flush_task: Optional[asyncio.Task] = None
+        # Writes not yet fsynced (durability "on-flush" only)
+        self._sync_on_flush: bool = config.durability == "on-flush"
+        self._unsynced: bool = False
+        self._compaction_task: Optional[asyncio.Task] = None
+
+        if storage is None:
+            storage = create_storage(config.storage, config.state_path, config.durability)
+        self.storage: StorageBackend = storage
+
+        # Load saved levels if they exist; history stays on disk until needed
+        # Save initial state only when nothing was stored yet
+        with self._storage_lock():
+            if not self._load_state():
+                self._save_state()
+
+        if self._write_behind or self._sync_on_flush:
+            # Flush (and fsync) whatever is still pending when the process exits
+            atexit.register(self.flush)
 
-        # Load saved state if exists
-        self._load_state()
+    @property
+    def history(self) -> HistoryColumns:
+        """Break history, loaded from storage on first access."""
+        if self._history is None:
+            self._load_history()
+        return self._history
+
+    @property
+    def aggregates(self) -> BreakAggregates:
+        """Running totals over the whole history, built from history if not stored."""
+        if self._aggregates is None:
+            self._aggregates = BreakAggregates.from_history(self.history, self.rollups)
+        return self._aggregates
+
+    @property
+    def rollups(self) -> list:
+        """Per-tool, per-hour aggregates of compacted history."""
+        if self._history is None:
+            self._load_history()
+        return self._rollups
 
-        # Save initial state to ensure file always exists
-        self._save_state()
+    @property
+    def history_loaded(self) -> bool:
+        """Whether history has been loaded from storage yet."""
+        return self._history is not None
+
+    @property
+    def snapshot(self) -> StateSnapshot:
+        """The last committed state; safe to read without the lock."""
+        return self._snapshot
+
+    def _publish(self) -> None:
+        """Publish the working levels as a new snapshot, if they changed."""
+        if self._working is self._snapshot:
+            return
+        self._snapshot = self._working = replace(self._working, version=self._snapshot.version + 1)
+        for listener in self._listeners:
+            listener()
+
+    def add_listener(self, listener: Callable[[], None]) -> Callable[[], None]:
+        """
+        Get called whenever a change is published.
+
+        Listeners run synchronously right after the new snapshot is in
+        place, so they must be cheap and must not raise; read the levels
+        from the snapshot property.
+
+        Args:
+            listener: Called with no arguments after each published change.
+
+        Returns:
+            Callable[[], None]: Removes the listener again.
+        """
+        self._listeners.append(listener)
+
+        def remove() -> None:
+            if listener in self._listeners:
+                self._listeners.remove(listener)
+
+        return remove
+
+    def _set_working(self, **changes) -> None:
+        """Update the working snapshot; outside a transaction it is published at once."""
+        self._working = replace(self._working, **changes)
+        if self._transaction is None and not self._loading:
+            self._publish()
+
+    @property
+    def _last_stress_update(self) -> float:
+        """Stress reference timestamp (monotonic clock reading)."""
+        return self._working.stress_ref
+
+    @_last_stress_update.setter
+    def _last_stress_update(self, value: float) -> None:
+        self._set_working(stress_ref=value)
+
+    @property
+    def _last_boss_cooldown(self) -> float:
+        """Boss alert reference timestamp (monotonic clock reading)."""
+        return self._working.boss_ref
+
+    @_last_boss_cooldown.setter
+    def _last_boss_cooldown(self, value: float) -> None:
+        self._set_working(boss_ref=value)
+
+    def _stress_at(self, now: float) -> tuple:
+        """Stress level and advanced reference of the working levels (see StateSnapshot.stress_at)."""
+        return self._working.stress_at(now)
+
+    def _boss_alert_at(self, now: float) -> tuple:
+        """Boss alert level and advanced reference of the working levels (see StateSnapshot.boss_alert_at)."""
+        return self._working.boss_alert_at(now, self.config.boss_alertness_cooldown)
 
     @property
     def stress_level(self) -> int:
-        """Get current stress level (0-100)."""
-        return self.__stress_level
+        """Get current (committed) stress level (0-100)."""
+        return self._snapshot.stress_at(self.clock.monotonic())[0]
 
     @property
     def _stress_level(self) -> int:
         """Internal property for stress level (getter)."""
-        return self.__stress_level
+        return self._stress_at(self.clock.monotonic())[0]
 
     @_stress_level.setter
     def _stress_level(self, value: int) -> None:
         """
         Internal property for stress level (setter).
-        Automatically saves state when value changes.
+        Rebases the stored level and automatically saves state when the
+        current value changes.
         """
         # Clamp value to valid range
         value = max(0, min(100, value))
 
-        # Only save if value actually changed and not during loading
-        if self.__stress_level != value and not self._loading:
-            self.__stress_level = value
-            self._save_state()
-        else:
-            self.__stress_level = value
+        if self._loading:
+            self._set_working(stress_level=value)
+            return
+
+        current, reference = self._stress_at(self.clock.monotonic())
+        self._set_working(stress_level=value, stress_ref=reference)
+        # Only save if value actually changed
+        if current != value:
+            self._mark_dirty()
 
     @property
     def boss_alert_level(self) -> int:
-        """Get current boss alert level (0-5)."""
-        return self.__boss_alert_level
+        """Get current (committed) boss alert level (0-5)."""
+        now = self.clock.monotonic()
+        return self._snapshot.boss_alert_at(now, self.config.boss_alertness_cooldown)[0]
 
     @property
     def _boss_alert_level(self) -> int:
         """Internal property for boss alert level (getter)."""
-        return self.__boss_alert_level
+        return self._boss_alert_at(self.clock.monotonic())[0]
 
     @_boss_alert_level.setter
     def _boss_alert_level(self, value: int) -> None:
         """
         Internal property for boss alert level (setter).
-        Automatically saves state when value changes.
+        Rebases the stored level and automatically saves state when the
+        current value changes.
         """
         # Clamp value to valid range
         value = max(0, min(5, value))
 
-        # Only save if value actually changed and not during loading
-        if self.__boss_alert_level != value and not self._loading:
-            self.__boss_alert_level = value
-            self._save_state()
-        else:
-            self.__boss_alert_level = value
+        if self._loading:
+            self._set_working(boss_alert_level=value)
+            return
 
-    async def update_stress_level(self) -> None:
+        current, reference = self._boss_alert_at(self.clock.monotonic())
+        self._set_working(boss_alert_level=value, boss_ref=reference)
+        # Only save if value actually changed
+        if current != value:
+            self._mark_dirty()
+
+    def _capture_levels(self) -> StateSnapshot:
+        """Capture the working levels and reference timestamps (for rollback)."""
+        return self._working
+
+    def _restore_levels(self, captured: StateSnapshot) -> None:
+        """Restore levels captured by _capture_levels() without saving or publishing."""
+        self._working = captured
+
+    @asynccontextmanager
+    async def transaction(self) -> AsyncIterator["StateTransaction"]:
         """
-        Update stress level based on time elapsed.
-        Stress increases by at least 1 point per minute if no breaks are taken.
+        Run several reads and mutations as one unit of work.
+
+        The lock is taken once for the whole block and the result is
+        persisted with a single storage write when the block exits. If the
+        block raises, levels are rolled back and its history events dropped.
+        The lock is not reentrant: inside the block, use the transaction's
+        methods rather than the StateManager's async ones.
+
+        Example:
+            async with state_manager.transaction() as tx:
+                relieved = tx.decrease_stress()
+                tx.add_history_event("take_a_break", -relieved, 0)
+
+        Yields:
+            StateTransaction: Synchronous view of the state for the block.
         """
         async with self._lock:
-            current_time = time.time()
-            elapsed_minutes = (current_time - self._last_stress_update) / 60.0
+            # Start from the latest state other processes committed
+            self.refresh()
+            tx = StateTransaction(self)
+            self._transaction = tx
+            try:
+                yield tx
+            except BaseException:
+                self._transaction = None
+                tx._rollback()
+                raise
+            self._transaction = None
+            self._commit_transaction(tx)
 
-            if elapsed_minutes >= 1.0:
-                # Increase stress by at least 1 point per minute
-                stress_increase = int(elapsed_minutes)
-                # Setter automatically saves state
-                self._stress_level = self._stress_level + stress_increase
-                self._last_stress_update = current_time
+    async def atomic(self, apply: Callable[["StateTransaction"], T]) -> T:
+        """
+        Run apply(tx) in a transaction, re-running it if another process won a race.
+
+        With shared_state, commits are compare-and-swap on the stored
+        version: if another process committed after this one loaded the
+        state, the transaction is rolled back, the state is reloaded and
+        apply runs again on the fresh state. Without shared_state this is a
+        single transaction.
+
+        Args:
+            apply: Reads and mutates the transaction and returns a result.
+                It may run more than once, so it must not have other side effects.
+
+        Returns:
+            The result of the apply() call that committed.
+
+        Raises:
+            VersionConflict: Still losing after MAX_CONFLICT_RETRIES retries.
+        """
+        for attempt in range(MAX_CONFLICT_RETRIES + 1):
+            try:
+                async with self.transaction() as tx:
+                    return apply(tx)
+            except VersionConflict:
+                self.conflicts += 1
+                if attempt == MAX_CONFLICT_RETRIES:
+                    raise
+
+    async def update_stress_level(self) -> None:
+        """
+        Kept for compatibility: stress growth (1 point per minute without
+        breaks) is computed on read, so there is nothing to update.
+        """
 
     async def decrease_stress(self, amount: Optional[int] = None) -> int:
         """
@@ -118,15 +417,7 @@ class StateManager:
         Returns:
             int: Amount of stress decreased.
         """
-        async with self._lock:
-            if amount is None:
-                amount = random.randint(1, 100)
-            else:
-                amount = max(1, min(100, amount))
-
-            # Setter automatically saves state
-            self._stress_level = self._stress_level - amount
-            return amount
+        return await self.atomic(lambda tx: tx.decrease_stress(amount))
 
     async def increase_stress(self, amount: int) -> int:
         """
@@ -138,11 +429,7 @@ class StateManager:
         Returns:
             int: Actual amount of stress increased.
         """
-        async with self._lock:
-            amount = max(1, min(100, amount))
-            old_level = self._stress_level
-            self._stress_level += amount
-            return self._stress_level - old_level
+        return await self.atomic(lambda tx: tx.increase_stress(amount))
 
     async def increase_boss_alert(self) -> tuple[bool, int]:
         """
@@ -151,15 +438,7 @@ class StateManager:
         Returns:
             tuple[bool, int]: (True if boss alert was increased, old boss alert level)
         """
-        async with self._lock:
-            old_level = self._boss_alert_level
-            # Roll the dice based on boss_alertness probability
-            if random.randint(1, 100) <= self.config.boss_alertness:
-                if self._boss_alert_level < 5:
-                    # Setter automatically saves state
-                    self._boss_alert_level += 1
-                    return (True, old_level)
-        return (False, old_level)
+        return await self.atomic(lambda tx: tx.increase_boss_alert())
 
     async def change_boss_alert(self, change: int) -> int:
         """
@@ -171,36 +450,23 @@ class StateManager:
         Returns:
             int: New boss alert level.
         """
-        async with self._lock:
-            self._boss_alert_level = max(0, min(5, self._boss_alert_level + change))
-            return self._boss_alert_level
+        return await self.atomic(lambda tx: tx.change_boss_alert(change))
 
     async def update_boss_cooldown(self) -> None:
         """
-        Decrease boss alert level based on cooldown period.
-        Boss alert decreases by 1 every boss_alertness_cooldown seconds.
+        Kept for compatibility: the boss cooldown (1 level every
+        boss_alertness_cooldown seconds) is computed on read, so there is
+        nothing to update.
         """
-        async with self._lock:
-            current_time = time.time()
-            elapsed_seconds = current_time - self._last_boss_cooldown
-
-            if elapsed_seconds >= self.config.boss_alertness_cooldown:
-                # Calculate how many cooldown periods have passed
-                cooldown_periods = int(elapsed_seconds / self.config.boss_alertness_cooldown)
-                if self._boss_alert_level > 0:
-                    # Setter automatically saves state
-                    self._boss_alert_level = self._boss_alert_level - cooldown_periods
-                self._last_boss_cooldown = current_time
 
     async def check_boss_delay(self) -> float:
         """
-        Check if boss alert level requires a delay.
+        Check if boss alert level requires a delay (pure read, no lock).
 
         Returns:
             float: Delay in seconds (20 if boss alert is 5, otherwise 0).
         """
-        await self.update_boss_cooldown()
-        if self._boss_alert_level >= 5:
+        if self.boss_alert_level >= 5:
             return 20.0
         return 0.0
 
@@ -208,73 +474,852 @@ class StateManager:
         """
         Get current state as a dictionary.
 
+        Reads the published snapshot: no lock, no writes, and never a
+        half-applied transaction, so polling never waits behind break tools.
+        With shared_state, the snapshot is first reloaded if another process
+        changed the state.
+
         Returns:
             dict: Current state with stress_level and boss_alert_level.
         """
-        await self.update_stress_level()
-        await self.update_boss_cooldown()
-
+        self.refresh()
+        snapshot = self._snapshot
+        now = self.clock.monotonic()
         return {
-            "stress_level": self._stress_level,
-            "boss_alert_level": self._boss_alert_level
+            "stress_level": snapshot.stress_at(now)[0],
+            "boss_alert_level": snapshot.boss_alert_at(now, self.config.boss_alertness_cooldown)[0],
         }
 
     async def reset(self) -> None:
         """Reset state to initial values."""
-        async with self._lock:
-            # Setter automatically saves state
-            self._stress_level = 0
-            self._boss_alert_level = 0
-            self._last_stress_update = time.time()
-            self._last_boss_cooldown = time.time()
-
-    def _save_state(self) -> None:
-        """Save current state to file (synchronous)."""
+        await self.atomic(lambda tx: tx.reset())
+
+    def _commit_transaction(self, tx: "StateTransaction") -> None:
+        """
+        Commit a finished transaction.
+
+        With shared_state, a transaction that changed anything is committed
+        under the storage lock, and only if the stored version is still the
+        one this process loaded.
+
+        Raises:
+            VersionConflict: Another process committed first; the
+                transaction has been rolled back.
+        """
+        if not self._shared or not (tx.dirty or tx.events):
+            self._apply_transaction(tx)
+            return
+        with self.storage.lock():
+            stored = self.storage.load_version()
+            if stored != self._version:
+                tx._rollback()
+                raise VersionConflict(f"state is at version {stored}, this process has {self._version}")
+            self._apply_transaction(tx)
+
+    def _apply_transaction(self, tx: "StateTransaction") -> None:
+        """Publish a finished transaction's levels, record its events and persist it once."""
+        self._publish()
+        if tx.events:
+            self._stamp(tx.events)
+        elif tx.dirty:
+            self._unrecorded = True
+        for event in tx.events:
+            self._record_event(event)
+        if not tx.dirty and not tx.events:
+            return
+
+        if self._write_behind:
+            self._pending_history.extend(tx.events)
+            self._mark_dirty()
+        else:
+            self._save_state(*tx.events)
+
+        if tx.events and self._needs_compaction():
+            self._schedule_compaction()
+
+    def _mark_dirty(self) -> None:
+        """
+        Record a state change.
+
+        In write-through mode the snapshot is saved immediately. In write-behind
+        mode the change is only counted and a background flush is scheduled.
+        Inside a transaction, saving is deferred until it commits.
+        """
+        if self._transaction is not None:
+            self._transaction.dirty = True
+            return
+
+        self._unrecorded = True
+        if not self._write_behind:
+            # Direct level changes are not version-checked: the last writer wins
+            with self._storage_lock():
+                self._save_state()
+            return
+
+        self._dirty = True
+        self._pending_changes += 1
+        if self._pending_changes >= self.config.flush_max_changes:
+            self.flush()
+        else:
+            self._schedule_flush()
+
+    def _schedule_flush(self) -> None:
+        """Start the background flush task if one isn't already pending."""
+        if self._flush_task is not None and not self._flush_task.done():
+            return
         try:
-            state_data = {
-                "stress_level": self._stress_level,
-                "boss_alert_level": self._boss_alert_level,
-                "history": self.history,
-            }
-            with open(self.STATE_FILE, 'w') as f:
-                json.dump(state_data, f, indent=2)
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            # No event loop (synchronous caller) - flushed on the next
+            # scheduled flush, an explicit flush() or at exit
+            return
+        self._flush_task = loop.create_task(self._flush_later())
+
+    async def _flush_later(self) -> None:
+        """Wait for the flush window to close, then flush pending changes."""
+        await self.clock.sleep(self.config.flush_interval)
+        self.flush()
+
+    def flush(self) -> None:
+        """
+        Write pending history events and the snapshot to disk (synchronous).
+
+        With durability "on-flush", everything written since the last flush
+        is also fsynced here.
+        """
+        if self._dirty:
+            pending_history = self._pending_history
+            self._pending_history = []
+            self._dirty = False
+            self._pending_changes = 0
+
+            if pending_history:
+                self._append_history(*pending_history)
+            self._save_state()
+
+        if self._unsynced:
+            self._unsynced = False
+            try:
+                self.storage.sync()
+            except Exception as e:
+                # Fail silently - the data is written, just not fsynced
+                pass
+
+    async def close(self) -> None:
+        """Cancel the background flush task and flush pending changes."""
+        if self._flush_task is not None and not self._flush_task.done():
+            self._flush_task.cancel()
+            try:
+                await self._flush_task
+            except asyncio.CancelledError:
+                pass
+        self.hibernate()
+
+    def hibernate(self) -> None:
+        """
+        Flush everything to storage and release it (synchronous).
+
+        Background tasks are cancelled without waiting for them, which makes
+        this safe to call from an eviction path. The manager must not be
+        used afterwards; state is restored by creating a new one on the
+        same storage location. To run this in a worker thread, call
+        cancel_background_tasks() on the event loop first.
+        """
+        self.cancel_background_tasks()
+        self.flush()
+        self.storage.close()
+        # Don't keep hibernated managers alive through the exit hook
+        atexit.unregister(self.flush)
+
+    def cancel_background_tasks(self) -> None:
+        """Cancel the pending background flush and compaction without waiting for them."""
+        for task in (self._flush_task, self._compaction_task):
+            if task is not None and not task.done():
+                task.cancel()
+        self._flush_task = None
+        self._compaction_task = None
+
+    def _storage_lock(self):
+        """The storage's cross-process lock with shared_state, otherwise a no-op."""
+        return self.storage.lock() if self._shared else nullcontext()
+
+    def _save_state(self, *events: dict) -> None:
+        """
+        Save the current levels to storage (synchronous).
+
+        History events not yet in storage are appended in the same storage
+        call (see StorageBackend.commit), so a transaction costs one write.
+        Every save stores the next state version, and a checkpoint is
+        appended every checkpoint_interval events or if the levels changed
+        without an event to record them.
+
+        Args:
+            *events: History events to append first (may be none).
+        """
+        aggregates = self._aggregates.to_dict() if self._aggregates is not None else None
+        point = self._state_point()
+        version = self._version + 1
+        try:
+            self.storage.commit(
+                point["stress_level"],
+                point["boss_alert_level"],
+                aggregates,
+                events,
+                version,
+                point["since"],
+                point["timestamp"],
+            )
+            self._version = version
+            self._unsynced = self._sync_on_flush
         except Exception as e:
             # Fail silently - state persistence is not critical
+            return
+        if self._pending_checkpoint is not None:
+            self._store_checkpoint(self._pending_checkpoint)
+            self._pending_checkpoint = None
+        if self._unrecorded or self._events_since_checkpoint >= self.config.checkpoint_interval:
+            self._checkpoint_now(point)
+
+    def _checkpoint_now(self, point: Optional[dict] = None) -> None:
+        """Checkpoint the current levels (or `point`, taken just now)."""
+        self._add_checkpoint(point or self._state_point(), self.aggregates.total)
+        self._unrecorded = False
+        self._events_since_checkpoint = 0
+
+    def _state_point(self) -> dict:
+        """
+        The working levels now, as stored in events and checkpoints.
+
+        Returns:
+            dict: timestamp (wall clock), stress_level, boss_alert_level and
+                since (the wall-clock references [stress, boss alert] the
+                levels grow and cool down from).
+        """
+        now = self.clock.monotonic()
+        stress_level, stress_ref = self._stress_at(now)
+        boss_alert_level, boss_ref = self._boss_alert_at(now)
+        offset = self.clock.time() - now
+        return {
+            "timestamp": now + offset,
+            "stress_level": stress_level,
+            "boss_alert_level": boss_alert_level,
+            "since": [stress_ref + offset, boss_ref + offset],
+        }
+
+    def _stamp(self, events: list) -> None:
+        """Record the working levels in events about to be committed."""
+        point = self._state_point()
+        for event in events:
+            event["stress_level"] = point["stress_level"]
+            event["boss_alert_level"] = point["boss_alert_level"]
+            event["since"] = point["since"]
+        self._unrecorded = False
+        self._events_since_checkpoint += len(events)
+
+    @property
+    def checkpoints(self) -> list:
+        """State checkpoints in time order, loaded from storage on first access."""
+        if self._checkpoints is None:
+            try:
+                checkpoints = sorted(self.storage.load_checkpoints(), key=self._checkpoint_key)
+            except Exception as e:
+                # Fail silently - point-in-time queries fall back to events
+                checkpoints = []
+            self._checkpoints = checkpoints
+            self._checkpoint_keys = [self._checkpoint_key(c) for c in checkpoints]
+            if self._pending_checkpoint is not None:
+                self._remember_checkpoint(self._pending_checkpoint)
+        return self._checkpoints
+
+    @staticmethod
+    def _checkpoint_key(checkpoint: dict) -> tuple:
+        """Sort key of a checkpoint: time, then events recorded before it (orders same-instant checkpoints)."""
+        return (checkpoint["timestamp"], checkpoint["events"])
+
+    def _add_checkpoint(self, point: dict, events: int) -> None:
+        """
+        Append a state checkpoint to storage (and to memory, if loaded).
+
+        Args:
+            point: Levels as returned by _state_point().
+            events: Number of history events (compacted ones included)
+                recorded up to the checkpoint.
+        """
+        checkpoint = {**point, "events": events}
+        if self._store_checkpoint(checkpoint):
+            self._remember_checkpoint(checkpoint)
+
+    def _store_checkpoint(self, checkpoint: dict) -> bool:
+        """Append a checkpoint to storage; return False if that failed."""
+        try:
+            self.storage.append_checkpoint(checkpoint)
+            self._unsynced = self._sync_on_flush
+        except Exception as e:
+            # Fail silently - only point-in-time queries lose precision
+            return False
+        return True
+
+    def _remember_checkpoint(self, checkpoint: dict) -> None:
+        """Insert a checkpoint into the in-memory checkpoints, if loaded."""
+        if self._checkpoints is not None:
+            key = self._checkpoint_key(checkpoint)
+            index = bisect_right(self._checkpoint_keys, key)
+            self._checkpoints.insert(index, checkpoint)
+            self._checkpoint_keys.insert(index, key)
+
+    def state_at(self, timestamp: float) -> Optional[dict]:
+        """
+        Reconstruct the stress and boss alert levels at a past point in time.
+
+        The levels are those right after every change recorded at or before
+        `timestamp`.
+
+        The nearest checkpoint at or before `timestamp` is found by binary
+        search, then the events after it are replayed. Every event carries
+        the levels its transaction left behind, so replaying comes down to
+        the last event before `timestamp`, also found by binary search, and
+        growth and cooldown since then follow in closed form. The result is
+        exact wherever raw events are kept. Compaction keeps a single
+        checkpoint older than the oldest raw event as the anchor, so times
+        before that checkpoint have no answer.
+
+        Args:
+            timestamp: Wall-clock time in epoch seconds.
+
+        Returns:
+            Optional[dict]: stress_level, boss_alert_level and as_of (when
+                the state they were computed from was recorded), or None if
+                nothing was recorded by then.
+        """
+        point = None
+        checkpoints = self.checkpoints
+        index = bisect_right(self._checkpoint_keys, (timestamp, float("inf")))
+        if index:
+            point = checkpoints[index - 1]
+        history = self.history
+        event_index = history.last_state_index(timestamp)
+        if event_index >= 0:
+            # Events up to and including this one, compacted ones first
+            events = sum(r["count"] for r in self.rollups) + event_index + 1
+            if point is None or events > point["events"]:
+                point = history[event_index]
+        if point is None:
+            return None
+        levels = StateSnapshot(0, point["stress_level"], point["boss_alert_level"], *point["since"])
+        return {
+            "stress_level": levels.stress_at(timestamp)[0],
+            "boss_alert_level": levels.boss_alert_at(timestamp, self.config.boss_alertness_cooldown)[0],
+            "as_of": point["timestamp"],
+        }
+
+    def _append_history(self, *events: dict) -> None:
+        """Append history events to storage (synchronous)."""
+        try:
+            self.storage.append_history(*events)
+            self._unsynced = self._sync_on_flush
+        except Exception as e:
+            # Fail silently - history persistence is not critical
             pass
 
-    def _load_state(self) -> None:
-        """Load state from file if exists (synchronous)."""
+    def _load_state(self) -> bool:
+        """
+        Load stress and boss alert levels from storage if present (synchronous).
+
+        Returns:
+            bool: True if stored levels were found.
+        """
         try:
-            if self.STATE_FILE.exists():
+            levels = self.storage.load_levels()
+            last = self.storage.last_event()
+            replayed = last is not None and "stress_level" in last and (
+                levels is None or last["timestamp"] > levels.get("timestamp", float("-inf"))
+            )
+            if replayed:
+                # The history log is the source of truth: it is ahead of the
+                # stored levels (e.g. crash between append and save), so replay it
+                levels = {
+                    "stress_level": last["stress_level"],
+                    "boss_alert_level": last["boss_alert_level"],
+                    "since": last["since"],
+                    "version": levels.get("version", 0) if levels is not None else 0,
+                }
+            if levels is not None:
                 # Set loading flag to prevent auto-save during load
                 self._loading = True
 
-                with open(self.STATE_FILE, 'r') as f:
-                    state_data = json.load(f)
-
                 # Restore stress and boss alert levels
                 # Setter is called but won't save because _loading is True
-                self._stress_level = state_data.get("stress_level", 0)
-                self._boss_alert_level = state_data.get("boss_alert_level", 0)
-                self.history = state_data.get("history", [])
+                self._stress_level = levels["stress_level"]
+                self._boss_alert_level = levels["boss_alert_level"]
+                if levels.get("aggregates") is not None:
+                    self._aggregates = BreakAggregates.from_dict(levels["aggregates"])
+                self._version = levels.get("version", 0)
 
-                # Reset timestamps to current time (don't accumulate time while server was off)
-                self._last_stress_update = time.time()
-                self._last_boss_cooldown = time.time()
+                # Reference timestamps start now (don't accumulate time while server was off)
+                now = self.clock.monotonic()
+                self._last_stress_update = now
+                self._last_boss_cooldown = now
+                if self._shared and levels.get("since") is not None:
+                    # Other processes kept running: continue from their references
+                    offset = self.clock.time() - now
+                    self._last_stress_update = min(now, levels["since"][0] - offset)
+                    self._last_boss_cooldown = min(now, levels["since"][1] - offset)
 
                 # Done loading
                 self._loading = False
+                self._publish()
+                if not self._shared and replayed:
+                    # Levels came from the log tail; record them right away
+                    self._checkpoint_now()
+                elif not self._shared:
+                    # Growth restarts now; state_at must see the pause, but a
+                    # restart that changes nothing shouldn't write anything, so
+                    # the checkpoint is stored with the next save
+                    self._pending_checkpoint = {**self._state_point(), "events": self.aggregates.total}
+                    self._remember_checkpoint(self._pending_checkpoint)
+                return True
         except Exception as e:
-            # Fail silently - if file doesn't exist or is corrupted, start fresh
+            # Fail silently - if state is missing or corrupted, start fresh
             self._loading = False
             pass
+        return False
 
-    def add_history_event(self, tool_name: str, stress_change: int, boss_alert_change: int) -> None:
-        """Add a break event to the history and save the state."""
-        self.history.append({
+    def refresh(self) -> bool:
+        """
+        With shared_state, reload the state if another process changed it (synchronous).
+
+        Does nothing without shared_state or while a transaction is open.
+
+        Returns:
+            bool: True if the state was reloaded.
+        """
+        if not self._shared or self._transaction is not None:
+            return False
+        try:
+            if self.storage.load_version() == self._version:
+                return False
+            self._reload_state()
+        except Exception as e:
+            # Fail silently - keep the current state and retry on the next call
+            return False
+        return True
+
+    def _reload_state(self) -> None:
+        """Replace levels, totals and history with what another process stored (synchronous)."""
+        self.storage.refresh()
+        levels = self.storage.load_levels()
+        if levels is None:
+            return
+        now = self.clock.monotonic()
+        offset = self.clock.time() - now
+        stress_since, boss_since = levels.get("since") or (now + offset, now + offset)
+        self._working = replace(
+            self._working,
+            stress_level=levels["stress_level"],
+            boss_alert_level=levels["boss_alert_level"],
+            stress_ref=min(now, stress_since - offset),
+            boss_ref=min(now, boss_since - offset),
+        )
+        self._publish()
+        self._version = levels.get("version", 0)
+        aggregates = levels.get("aggregates")
+        self._aggregates = BreakAggregates.from_dict(aggregates) if aggregates is not None else None
+        # Other processes appended to history and checkpoints; reloaded on next use
+        self._history = None
+        self._rollups = []
+        self._checkpoints = None
+
+    def _load_history(self) -> None:
+        """Load history and rollups from storage (synchronous)."""
+        try:
+            self._rollups = self.storage.load_rollups()
+            # Number events after the compacted ones, so cursors survive reloads
+            compacted = sum(r["count"] for r in self._rollups)
+            self._history = HistoryColumns(self.storage.load_history(), compacted)
+            if self._aggregates is not None:
+                stored = len(self._history) + sum(r["count"] for r in self._rollups)
+                if self._aggregates.total != stored:
+                    # Snapshot lags the log (e.g. crash between append and save) - rebuild
+                    self._aggregates = None
+        except Exception as e:
+            # Fail silently - start with an empty history
+            self._history = HistoryColumns()
+            self._rollups = []
+
+    def _new_event(self, tool_name: str, stress_change: int, boss_alert_change: int) -> dict:
+        """Create a history event stamped with the current (wall-clock) time."""
+        return {
             "tool_name": tool_name,
-            "timestamp": time.time(),
+            "timestamp": self.clock.time(),
             "stress_change": stress_change,
             "boss_alert_change": boss_alert_change,
-        })
-        self._save_state()
+        }
+
+    def _record_event(self, event: dict) -> None:
+        """Add an event to the in-memory history and running totals."""
+        if self._shared and self._history is None and self._aggregates is not None:
+            # Shared state is written through, so the event is in storage once
+            # committed; don't reload the whole history after every reload
+            self._aggregates.add(event)
+            return
+        # Load history (and reconcile stored totals) before counting the new event
+        history = self.history
+        self.aggregates.add(event)
+        history.append(event)
+
+    def add_history_event(self, tool_name: str, stress_change: int, boss_alert_change: int) -> None:
+        """Add a break event to the history and append it to storage."""
+        event = self._new_event(tool_name, stress_change, boss_alert_change)
+        with self._storage_lock():
+            # Appending can't conflict: count it on top of the latest stored totals
+            self.refresh()
+            self._stamp([event])
+            self._record_event(event)
+            if self._write_behind:
+                self._pending_history.append(event)
+                self._mark_dirty()
+            else:
+                # One write keeps the persisted totals in step with the log
+                self._save_state(event)
+
+        if self._needs_compaction():
+            self._schedule_compaction()
+
+    def _needs_compaction(self) -> bool:
+        """
+        Check whether history has outgrown the retention policy.
+
+        Compaction only triggers once a limit is exceeded by 10%, so the
+        history is trimmed in batches instead of on every event.
+        """
+        max_events = self.config.history_max_events
+        max_age = self.config.history_max_age
+        if max_events is None and max_age is None:
+            return False
+        if not self.history:
+            return False
+        if max_events is not None and len(self.history) > max_events + max(1, max_events // 10):
+            return True
+        if max_age is not None and self.history.timestamps[0] < self.clock.time() - max_age * 1.1:
+            return True
+        return False
+
+    def _schedule_compaction(self) -> None:
+        """Run compaction in a background task instead of on the tool-call path."""
+        if self._compaction_task is not None and not self._compaction_task.done():
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            # No event loop (synchronous caller) - compacted on a later event
+            return
+        self._compaction_task = loop.create_task(self._compact_later())
+
+    async def _compact_later(self) -> None:
+        """Yield to the pending tool call, then compact history."""
+        await asyncio.sleep(0)
+        self.compact_history()
+
+    def compact_history(self) -> int:
+        """
+        Apply the retention policy (synchronous).
+
+        Events beyond history_max_events or older than history_max_age are
+        folded into per-tool, per-hour rollups, so report totals stay exact
+        while memory and storage stay bounded.
+
+        With shared_state, compaction runs under the storage lock on the
+        latest stored history and stores a new version, so other processes
+        reload the trimmed history.
+
+        Returns:
+            int: Number of events compacted.
+        """
+        with self._storage_lock():
+            self.refresh()
+            count = self._compact_history()
+            if count and self._shared:
+                self._save_state()
+        return count
+
+    def _compact_history(self) -> int:
+        """Fold the events beyond the retention policy into rollups (see compact_history)."""
+        count = 0
+        max_events = self.config.history_max_events
+        if max_events is not None:
+            count = max(count, len(self.history) - max_events)
+        max_age = self.config.history_max_age
+        if max_age is not None:
+            count = max(count, bisect_left(self.history.timestamps, self.clock.time() - max_age))
+        if count <= 0:
+            return 0
+
+        # Storage must hold every in-memory event before dropping the oldest
+        if self._pending_history:
+            self.flush()
+
+        compacted = self.history[:count]
+        if "stress_level" in compacted[-1]:
+            # Keep the levels the last compacted event left behind, so state_at
+            # stays exact up to the oldest raw event
+            last = compacted[-1]
+            self._add_checkpoint(
+                {
+                    "timestamp": last["timestamp"],
+                    "stress_level": last["stress_level"],
+                    "boss_alert_level": last["boss_alert_level"],
+                    "since": last["since"],
+                },
+                sum(r["count"] for r in self.rollups) + count,
+            )
+        rollups = merge_rollups(self.rollups, compacted)
+        try:
+            self.storage.compact_history(count, rollups)
+        except Exception as e:
+            # Fail silently - keep memory in step with storage and retry later
+            return 0
+        self._unsynced = self._sync_on_flush
+        self._rollups = rollups
+        del self.history[:count]
+        self._prune_checkpoints()
+        return count
+
+    def _prune_checkpoints(self) -> None:
+        """
+        Drop the checkpoints older than the oldest raw event, except the
+        newest of them: the anchor state_at starts from until that event.
+        """
+        cutoff = self.history.timestamps[0] if self.history else self.clock.time()
+        checkpoints = self.checkpoints
+        index = bisect_right(self._checkpoint_keys, (cutoff, float("inf")))
+        if index <= 1:
+            return
+        anchor = checkpoints[index - 1]["timestamp"]
+        try:
+            self.storage.prune_checkpoints(anchor)
+        except Exception as e:
+            # Fail silently - old checkpoints only take up space
+            return
+        self._unsynced = self._sync_on_flush
+        keep = bisect_left(self._checkpoint_keys, (anchor, float("-inf")))
+        del checkpoints[:keep]
+        del self._checkpoint_keys[:keep]
+        if self._pending_checkpoint is not None and self._pending_checkpoint["timestamp"] < anchor:
+            self._pending_checkpoint = None
+
+    def count_history(self, start: Optional[float] = None, end: Optional[float] = None) -> int:
+        """
+        Count break events (including compacted ones), optionally within [start, end).
+
+        Until history is loaded, aggregates are answered by the storage
+        backend (e.g. indexed SQL for SQLite) instead of loading it.
+        """
+        if start is None and end is None and self._aggregates is not None:
+            return self._aggregates.total
+        if not self.history_loaded:
+            return self.storage.count_history(start, end)
+        compacted = sum(r["count"] for r in rollups_in_range(self.rollups, start, end))
+        return compacted + self.history.count(start, end)
+
+    def tool_counts(self, start: Optional[float] = None, end: Optional[float] = None) -> Counter:
+        """Count break events per tool (ordered by first use), optionally within [start, end)."""
+        if start is None and end is None and self._aggregates is not None:
+            return Counter(self._aggregates.tool_counts)
+        if not self.history_loaded:
+            return self.storage.tool_counts(start, end)
+        counter = rollup_tool_counts(rollups_in_range(self.rollups, start, end))
+        counter.update(self.history.tool_counts(start, end))
+        return counter
+
+    def hour_counts(self, start: Optional[float] = None, end: Optional[float] = None) -> Counter:
+        """Count break events per local hour of day, optionally within [start, end)."""
+        if start is None and end is None and self._aggregates is not None:
+            return Counter(self._aggregates.hour_counts)
+        if not self.history_loaded:
+            return self.storage.hour_counts(start, end)
+        counter = rollup_hour_counts(rollups_in_range(self.rollups, start, end))
+        counter.update(self.history.hour_counts(start, end))
+        return counter
+
+    def change_totals(self, start: Optional[float] = None, end: Optional[float] = None) -> dict:
+        """Sum the stress and boss alert changes of break events, optionally within [start, end)."""
+        if start is None and end is None and self._aggregates is not None:
+            return {
+                "stress_change": self._aggregates.stress_change,
+                "boss_alert_change": self._aggregates.boss_alert_change,
+            }
+        if not self.history_loaded:
+            return self.storage.change_totals(start, end)
+        totals = self.history.change_totals(start, end)
+        for r in rollups_in_range(self.rollups, start, end):
+            totals["stress_change"] += r["stress_change"]
+            totals["boss_alert_change"] += r["boss_alert_change"]
+        return totals
+
+    def query_history(
+        self,
+        start: Optional[float] = None,
+        end: Optional[float] = None,
+        tool_name: Optional[str] = None,
+        cursor: Optional[int] = None,
+        limit: int = QUERY_HISTORY_DEFAULT_LIMIT,
+    ) -> dict:
+        """
+        Page through raw break events within [start, end), oldest first.
+
+        Compacted events are only available as rollups and are not
+        returned. Events are numbered from the first one ever recorded, so
+        cursors stay valid across restarts and shared-state reloads.
+
+        Args:
+            start: Earliest timestamp (inclusive), or None.
+            end: Latest timestamp (exclusive), or None.
+            tool_name: Only return events of this tool.
+            cursor: next_cursor from the previous page.
+            limit: Maximum number of events per page.
+
+        Returns:
+            dict: ``events`` (dicts with seq, tool_name, timestamp,
+                stress_change and boss_alert_change) and ``next_cursor``
+                (None on the last page).
+        """
+        if limit < 1:
+            raise ValueError(f"limit must be at least 1, got {limit}")
+        events, next_cursor = self.history.query(start, end, tool_name, cursor, limit)
+        return {"events": events, "next_cursor": next_cursor}
+
+
+class StateTransaction:
+    """
+    Synchronous view of a StateManager inside ``transaction()``.
+
+    Every method runs under the lock the transaction already holds.
+    Level changes are applied immediately (so later reads in the block see
+    them) but persisted only when the transaction commits; history events
+    are buffered until then.
+    """
+
+    def __init__(self, manager: StateManager):
+        """
+        Start a transaction.
+
+        Args:
+            manager: The state manager whose lock is held.
+        """
+        self._manager = manager
+        self.dirty: bool = False  # levels changed and need saving
+        self.events: list = []  # history events to record on commit
+        self._saved = manager._capture_levels()
+
+    @property
+    def stress_level(self) -> int:
+        """Current stress level (0-100)."""
+        return self._manager._stress_level
+
+    @property
+    def boss_alert_level(self) -> int:
+        """Current boss alert level (0-5)."""
+        return self._manager._boss_alert_level
+
+    def decrease_stress(self, amount: Optional[int] = None) -> int:
+        """
+        Decrease stress level by a random or specified amount.
+
+        Args:
+            amount: Optional specific amount to decrease. If None, uses random 1-100.
+
+        Returns:
+            int: Amount of stress decreased.
+        """
+        if amount is None:
+            amount = random.randint(1, 100)
+        else:
+            amount = max(1, min(100, amount))
+
+        self._manager._stress_level = self._manager._stress_level - amount
+        return amount
+
+    def increase_stress(self, amount: int) -> int:
+        """
+        Increase stress level by a specified amount.
+
+        Args:
+            amount: Amount to increase stress by (1-100).
+
+        Returns:
+            int: Actual amount of stress increased.
+        """
+        amount = max(1, min(100, amount))
+        old_level = self._manager._stress_level
+        self._manager._stress_level += amount
+        return self._manager._stress_level - old_level
+
+    def increase_boss_alert(self) -> tuple[bool, int]:
+        """
+        Potentially increase boss alert level based on boss_alertness probability.
+
+        Returns:
+            tuple[bool, int]: (True if boss alert was increased, old boss alert level)
+        """
+        manager = self._manager
+        old_level = manager._boss_alert_level
+        # Roll the dice based on boss_alertness probability
+        if random.randint(1, 100) <= manager.config.boss_alertness:
+            if manager._boss_alert_level < 5:
+                manager._boss_alert_level += 1
+                return (True, old_level)
+        return (False, old_level)
+
+    def change_boss_alert(self, change: int) -> int:
+        """
+        Change boss alert level by a specified amount (positive or negative).
+
+        Args:
+            change: Amount to change boss alert by (can be negative).
+
+        Returns:
+            int: New boss alert level.
+        """
+        manager = self._manager
+        manager._boss_alert_level = max(0, min(5, manager._boss_alert_level + change))
+        return manager._boss_alert_level
+
+    def check_boss_delay(self) -> float:
+        """
+        Check if boss alert level requires a delay.
+
+        Returns:
+            float: Delay in seconds (20 if boss alert is 5, otherwise 0).
+        """
+        if self._manager._boss_alert_level >= 5:
+            return 20.0
+        return 0.0
+
+    def get_state(self) -> dict:
+        """
+        Get the current state, including changes made in this transaction.
+
+        Returns:
+            dict: Current state with stress_level and boss_alert_level.
+        """
+        return {
+            "stress_level": self._manager._stress_level,
+            "boss_alert_level": self._manager._boss_alert_level,
+        }
+
+    def reset(self) -> None:
+        """Reset state to initial values."""
+        manager = self._manager
+        manager._stress_level = 0
+        manager._boss_alert_level = 0
+        manager._last_stress_update = manager.clock.monotonic()
+        manager._last_boss_cooldown = manager.clock.monotonic()
+
+    def add_history_event(self, tool_name: str, stress_change: int, boss_alert_change: int) -> None:
+        """Add a break event, recorded and persisted when the transaction commits."""
+        self.events.append(self._manager._new_event(tool_name, stress_change, boss_alert_change))
+
+    def _rollback(self) -> None:
+        """Restore the levels and reference timestamps from the start of the transaction."""
+        self._manager._restore_levels(self._saved)
+        self.events = []
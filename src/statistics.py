@@ -1,41 +1,41 @@
 """Statistics and reporting module for ChillMCP server."""
 
-import json
-from pathlib import Path
-from collections import Counter
-from datetime import datetime
+from typing import Union
 
-# State file path (in project root)
-STATE_FILE = Path(__file__).parent.parent / ".chillmcp_state.json"
+from .state_manager import StateManager
+from .storage import StorageBackend
 
-def get_break_statistics() -> dict:
+def get_break_statistics(source: Union[StateManager, StorageBackend]) -> dict:
     """
     Analyze break history and generate statistics.
 
+    Args:
+        source: Anything that provides count_history(), tool_counts(),
+            hour_counts() and change_totals(): a StateManager (running
+            totals, so O(number of tools)) or a storage backend (e.g. SQL
+            GROUP BY for SQLite).
+
     Returns:
         dict: A dictionary containing break statistics.
     """
-    if not STATE_FILE.exists():
-        return {"error": "No break history found."}
-
-    with open(STATE_FILE, 'r') as f:
-        data = json.load(f)
-        history = data.get("history", [])
-
-    if not history:
+    total_breaks = source.count_history()
+    if not total_breaks:
         return {"error": "Break history is empty."}
 
-    total_breaks = len(history)
-    tool_counter = Counter(item['tool_name'] for item in history)
+    tool_counter = source.tool_counts()
     most_common_tool = tool_counter.most_common(1)[0][0] if tool_counter else "N/A"
 
     # Analyze break times by hour
-    hour_counter = Counter(datetime.fromtimestamp(item['timestamp']).hour for item in history)
+    hour_counter = source.hour_counts()
     most_common_hour = hour_counter.most_common(1)[0][0] if hour_counter else "N/A"
 
+    totals = source.change_totals()
+
     return {
         "total_breaks": total_breaks,
         "most_common_tool": most_common_tool,
         "most_common_hour": f"{most_common_hour}:00 - {most_common_hour+1}:00",
         "breaks_by_tool": dict(tool_counter),
+        "total_stress_relieved": -totals["stress_change"],
+        "total_boss_alert_change": totals["boss_alert_change"],
     }
@@ -0,0 +1,1242 @@
+"""Storage backends for ChillMCP state and break history."""
+
+import json
+import os
+import sqlite3
+from abc import ABC, abstractmethod
+from collections import Counter
+from contextlib import contextmanager, nullcontext
+from datetime import datetime
+from pathlib import Path
+from typing import Iterator, Optional, Union
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+# File names inside the state directory
+STATE_FILENAME = ".chillmcp_state.json"
+HISTORY_FILENAME = ".chillmcp_history.jsonl"
+DB_FILENAME = ".chillmcp_state.db"
+ROLLUPS_FILENAME = ".chillmcp_rollups.json"
+CHECKPOINTS_FILENAME = ".chillmcp_checkpoints.jsonl"
+LOCK_FILENAME = ".chillmcp.lock"
+
+# Width of a rollup bucket in seconds
+ROLLUP_BUCKET_SECONDS = 3600
+
+# Default state directory (project root)
+DEFAULT_STATE_DIR = Path(__file__).parent.parent
+
+
+def fsync_path(path: Path) -> None:
+    """
+    Flush a file or directory to stable storage.
+
+    Missing files are skipped, and directories are skipped on platforms
+    that can't open them (e.g. Windows).
+    """
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def atomic_write(path: Path, content: str, fsync: bool = False) -> None:
+    """
+    Replace a file atomically.
+
+    The content is written to a temporary file in the same directory and
+    renamed over the target, so a crash leaves either the old or the new
+    file, never a truncated one.
+
+    Args:
+        path: File to replace.
+        content: New file content.
+        fsync: Also flush the file and the rename to disk before returning.
+    """
+    tmp_path = path.with_name(path.name + ".tmp")
+    with open(tmp_path, 'w') as f:
+        f.write(content)
+        if fsync:
+            f.flush()
+            os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+    if fsync:
+        fsync_path(path.parent)
+
+
+@contextmanager
+def file_lock(path: Path) -> Iterator[None]:
+    """
+    Hold an exclusive cross-process lock (``fcntl.flock``) on a lock file.
+
+    The lock is released when the block exits or the process dies. Locks
+    are per open file, so two holders in the same process also exclude
+    each other; the lock is not reentrant.
+
+    Args:
+        path: Lock file, created if missing.
+
+    Raises:
+        OSError: File locking is not available on this platform.
+    """
+    if fcntl is None:
+        raise OSError("cross-process file locking needs fcntl, which this platform lacks")
+    with open(path, 'a') as f:
+        fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+
+def levels_record(
+    stress_level: int,
+    boss_alert_level: int,
+    aggregates: Optional[dict] = None,
+    version: int = 0,
+    since: Optional[list] = None,
+    timestamp: Optional[float] = None,
+) -> dict:
+    """
+    Build the stored levels dict; optional fields are left out when unset.
+
+    See StorageBackend.save_levels for the arguments.
+    """
+    record = {"stress_level": stress_level, "boss_alert_level": boss_alert_level}
+    if aggregates is not None:
+        record["aggregates"] = aggregates
+    if version:
+        record["version"] = version
+    if since is not None:
+        record["since"] = list(since)
+    if timestamp is not None:
+        record["timestamp"] = timestamp
+    return record
+
+
+def _levels_from(state_data: dict) -> dict:
+    """Pick the levels (and optional fields) out of a JSON state file."""
+    return levels_record(
+        state_data.get("stress_level", 0),
+        state_data.get("boss_alert_level", 0),
+        state_data.get("aggregates"),
+        state_data.get("version", 0),
+        state_data.get("since"),
+        state_data.get("timestamp"),
+    )
+
+
+def read_last_line(path: Path, chunk: int = 4096) -> Optional[dict]:
+    """
+    Read the last complete JSON line of a JSONL log without reading the rest.
+
+    Args:
+        path: Path to the log.
+        chunk: Bytes read from the end of the file (must exceed one line).
+
+    Returns:
+        Optional[dict]: The last parseable entry, or None if there is none.
+    """
+    try:
+        with open(path, 'rb') as f:
+            f.seek(0, os.SEEK_END)
+            f.seek(max(0, f.tell() - chunk))
+            lines = f.read().splitlines()
+    except FileNotFoundError:
+        return None
+    for line in reversed(lines):
+        try:
+            return json.loads(line)
+        except ValueError:
+            # Truncated last line (crash mid-append) or a partial first line
+            continue
+    return None
+
+
+def read_history_log(path: Path) -> list:
+    """
+    Read break history from an append-only JSONL log.
+
+    A truncated or corrupted line (e.g. from a crash mid-append) is skipped
+    instead of discarding the whole history.
+
+    Args:
+        path: Path to the history log.
+
+    Returns:
+        list: History events in append order (empty if the log doesn't exist).
+    """
+    history = []
+    if not path.exists():
+        return history
+    with open(path, 'r') as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                history.append(json.loads(line))
+            except json.JSONDecodeError:
+                continue
+    return history
+
+
+def merge_rollups(rollups: list, events: list) -> list:
+    """
+    Fold history events into per-tool, per-hour rollups.
+
+    Each rollup is a dict with ``tool_name``, ``hour`` (hours since the
+    epoch), ``count`` and the summed ``stress_change``/``boss_alert_change``.
+
+    Args:
+        rollups: Existing rollups.
+        events: History events to fold in.
+
+    Returns:
+        list: Merged rollups, ordered by hour then first appearance.
+    """
+    merged = {(r["tool_name"], r["hour"]): dict(r) for r in rollups}
+    for event in events:
+        key = (event["tool_name"], int(event["timestamp"] // ROLLUP_BUCKET_SECONDS))
+        rollup = merged.get(key)
+        if rollup is None:
+            rollup = merged[key] = {
+                "tool_name": key[0],
+                "hour": key[1],
+                "count": 0,
+                "stress_change": 0,
+                "boss_alert_change": 0,
+            }
+        rollup["count"] += 1
+        rollup["stress_change"] += event["stress_change"]
+        rollup["boss_alert_change"] += event["boss_alert_change"]
+    return sorted(merged.values(), key=lambda r: r["hour"])
+
+
+def _in_range(timestamp: float, start: Optional[float], end: Optional[float]) -> bool:
+    """Check whether a timestamp falls within [start, end)."""
+    if start is not None and timestamp < start:
+        return False
+    if end is not None and timestamp >= end:
+        return False
+    return True
+
+
+def rollups_in_range(rollups: list, start: Optional[float] = None, end: Optional[float] = None) -> list:
+    """Rollups whose hour bucket starts within [start, end)."""
+    return [r for r in rollups if _in_range(r["hour"] * ROLLUP_BUCKET_SECONDS, start, end)]
+
+
+def rollup_tool_counts(rollups: list) -> Counter:
+    """Count compacted events per tool."""
+    counter = Counter()
+    for r in rollups:
+        counter[r["tool_name"]] += r["count"]
+    return counter
+
+
+def rollup_hour_counts(rollups: list) -> Counter:
+    """Count compacted events per local hour of day."""
+    counter = Counter()
+    for r in rollups:
+        counter[datetime.fromtimestamp(r["hour"] * ROLLUP_BUCKET_SECONDS).hour] += r["count"]
+    return counter
+
+
+class StorageBackend(ABC):
+    """
+    Interface shared by every state storage backend.
+
+    A backend stores the current stress/boss levels and the break history.
+    The aggregate queries have default implementations over load_history();
+    backends that can answer them more cheaply override them.
+    """
+
+    name: str = ""
+
+    @abstractmethod
+    def load_levels(self) -> Optional[dict]:
+        """
+        Load the stored stress and boss alert levels.
+
+        Returns:
+            Optional[dict]: Levels (plus "aggregates", "version", "since" and
+                "timestamp" if they were saved), or None if nothing has been
+                saved yet.
+        """
+
+    @abstractmethod
+    def save_levels(
+        self,
+        stress_level: int,
+        boss_alert_level: int,
+        aggregates: Optional[dict] = None,
+        version: int = 0,
+        since: Optional[list] = None,
+        timestamp: Optional[float] = None,
+    ) -> None:
+        """
+        Store the current stress and boss alert levels.
+
+        Args:
+            stress_level: Current stress level.
+            boss_alert_level: Current boss alert level.
+            aggregates: Running history totals (BreakAggregates.to_dict())
+                saved in the same write, if any.
+            version: State version, increased by StateManager on every
+                save so other processes can tell their copy is stale.
+            since: Wall-clock reference timestamps [stress, boss alert] the
+                levels grow and cool down from, if any.
+            timestamp: Wall-clock time the levels were saved at, if any.
+        """
+
+    @abstractmethod
+    def append_history(self, *events: dict) -> None:
+        """Append history events."""
+
+    @abstractmethod
+    def load_history(self) -> list:
+        """Load every history event in append order."""
+
+    @abstractmethod
+    def load_rollups(self) -> list:
+        """Load the per-tool, per-hour rollups of compacted history."""
+
+    @abstractmethod
+    def compact_history(self, count: int, rollups: list) -> None:
+        """
+        Drop the oldest history events and replace the stored rollups.
+
+        Args:
+            count: Number of oldest events to drop.
+            rollups: Rollups that already include the dropped events.
+        """
+
+    @abstractmethod
+    def append_checkpoint(self, checkpoint: dict) -> None:
+        """
+        Append a state checkpoint.
+
+        Args:
+            checkpoint: Dict with timestamp, stress_level, boss_alert_level,
+                since (wall-clock references [stress, boss alert]) and events
+                (history events recorded up to the checkpoint).
+        """
+
+    @abstractmethod
+    def load_checkpoints(self) -> list:
+        """Load every state checkpoint in append order."""
+
+    @abstractmethod
+    def prune_checkpoints(self, before: float) -> None:
+        """
+        Drop the checkpoints taken before a point in time.
+
+        Args:
+            before: Wall-clock time; checkpoints with an earlier timestamp are dropped.
+        """
+
+    def last_event(self) -> Optional[dict]:
+        """Load the most recent history event, or None if there is none."""
+        history = self.load_history()
+        return history[-1] if history else None
+
+    def commit(
+        self,
+        stress_level: int,
+        boss_alert_level: int,
+        aggregates: Optional[dict] = None,
+        events: tuple = (),
+        version: int = 0,
+        since: Optional[list] = None,
+        timestamp: Optional[float] = None,
+    ) -> None:
+        """
+        Append history events and save the levels as one write.
+
+        This is what StateManager calls once per transaction. Backends that
+        can combine both writes (one file rewrite, one SQL transaction)
+        override it.
+
+        Args:
+            stress_level: Current stress level.
+            boss_alert_level: Current boss alert level.
+            aggregates: Running history totals, if any.
+            events: History events to append first (may be empty).
+            version: State version (see save_levels).
+            since: Wall-clock reference timestamps (see save_levels).
+            timestamp: Wall-clock save time (see save_levels).
+        """
+        if events:
+            self.append_history(*events)
+        self.save_levels(stress_level, boss_alert_level, aggregates, version, since, timestamp)
+
+    def load_version(self) -> int:
+        """Read the stored state version (0 if nothing has been saved yet)."""
+        levels = self.load_levels()
+        return levels.get("version", 0) if levels is not None else 0
+
+    def refresh(self) -> None:
+        """Drop anything cached in memory, so the next read sees other processes' writes."""
+
+    def lock(self):
+        """
+        Context manager excluding other processes that use the same storage.
+
+        Backends without files to share have nothing to lock.
+        """
+        return nullcontext()
+
+    def close(self) -> None:
+        """Release any resources held by the backend."""
+
+    def sync(self) -> None:
+        """Flush everything written so far to stable storage."""
+
+    def is_empty(self) -> bool:
+        """Return True if neither levels nor history have been stored yet."""
+        return self.load_levels() is None and not self.load_history() and not self.load_rollups()
+
+    def count_history(self, start: Optional[float] = None, end: Optional[float] = None) -> int:
+        """
+        Count history events, optionally within [start, end).
+
+        Compacted events are counted through their rollups, which are
+        matched against the range at hour granularity.
+        """
+        live = sum(1 for e in self.load_history() if _in_range(e["timestamp"], start, end))
+        return live + sum(r["count"] for r in rollups_in_range(self.load_rollups(), start, end))
+
+    def tool_counts(self, start: Optional[float] = None, end: Optional[float] = None) -> Counter:
+        """Count history events per tool (ordered by first use), optionally within [start, end)."""
+        counter = rollup_tool_counts(rollups_in_range(self.load_rollups(), start, end))
+        counter.update(
+            e["tool_name"] for e in self.load_history() if _in_range(e["timestamp"], start, end)
+        )
+        return counter
+
+    def hour_counts(self, start: Optional[float] = None, end: Optional[float] = None) -> Counter:
+        """Count history events per local hour of day, optionally within [start, end)."""
+        counter = rollup_hour_counts(rollups_in_range(self.load_rollups(), start, end))
+        counter.update(
+            datetime.fromtimestamp(e["timestamp"]).hour
+            for e in self.load_history()
+            if _in_range(e["timestamp"], start, end)
+        )
+        return counter
+
+    def change_totals(self, start: Optional[float] = None, end: Optional[float] = None) -> dict:
+        """Sum the stress and boss alert changes of history events, optionally within [start, end)."""
+        totals = {"stress_change": 0, "boss_alert_change": 0}
+        events = [e for e in self.load_history() if _in_range(e["timestamp"], start, end)]
+        for item in events + rollups_in_range(self.load_rollups(), start, end):
+            totals["stress_change"] += item["stress_change"]
+            totals["boss_alert_change"] += item["boss_alert_change"]
+        return totals
+
+    def migrate_from(self, source: "StorageBackend") -> None:
+        """
+        Copy levels and history from another backend.
+
+        Args:
+            source: Backend to import from.
+        """
+        levels = source.load_levels()
+        if levels is not None:
+            self.save_levels(
+                levels["stress_level"],
+                levels["boss_alert_level"],
+                levels.get("aggregates"),
+                levels.get("version", 0),
+                levels.get("since"),
+                levels.get("timestamp"),
+            )
+        history = source.load_history()
+        if history:
+            self.append_history(*history)
+        rollups = source.load_rollups()
+        if rollups:
+            self.compact_history(0, rollups)
+        for checkpoint in source.load_checkpoints():
+            self.append_checkpoint(checkpoint)
+
+
+class MemoryStorage(StorageBackend):
+    """In-memory storage without any I/O (state is lost on exit)."""
+
+    name = "memory"
+
+    def __init__(self):
+        """Initialize empty in-memory storage."""
+        self._levels: Optional[dict] = None
+        self._history: list = []
+        self._rollups: list = []
+        self._checkpoints: list = []
+
+    def load_levels(self) -> Optional[dict]:
+        """Load the stored stress and boss alert levels."""
+        return dict(self._levels) if self._levels is not None else None
+
+    def save_levels(
+        self,
+        stress_level: int,
+        boss_alert_level: int,
+        aggregates: Optional[dict] = None,
+        version: int = 0,
+        since: Optional[list] = None,
+        timestamp: Optional[float] = None,
+    ) -> None:
+        """Store the current stress and boss alert levels."""
+        self._levels = levels_record(stress_level, boss_alert_level, aggregates, version, since, timestamp)
+
+    def append_history(self, *events: dict) -> None:
+        """Append history events."""
+        self._history.extend(events)
+
+    def load_history(self) -> list:
+        """Load every history event in append order."""
+        return list(self._history)
+
+    def load_rollups(self) -> list:
+        """Load the rollups of compacted history."""
+        return list(self._rollups)
+
+    def compact_history(self, count: int, rollups: list) -> None:
+        """Drop the oldest events and replace the rollups."""
+        del self._history[:count]
+        self._rollups = list(rollups)
+
+    def append_checkpoint(self, checkpoint: dict) -> None:
+        """Append a state checkpoint."""
+        self._checkpoints.append(checkpoint)
+
+    def load_checkpoints(self) -> list:
+        """Load every state checkpoint in append order."""
+        return list(self._checkpoints)
+
+    def prune_checkpoints(self, before: float) -> None:
+        """Drop the checkpoints taken before a point in time."""
+        self._checkpoints = [c for c in self._checkpoints if c["timestamp"] >= before]
+
+    def last_event(self) -> Optional[dict]:
+        """Load the most recent history event."""
+        return self._history[-1] if self._history else None
+
+
+class JsonSnapshotStorage(StorageBackend):
+    """
+    Single JSON file holding levels and the full history.
+
+    Every save rewrites the whole file, so cost grows with history size.
+    Useful as a baseline and for small deployments.
+    """
+
+    name = "json"
+
+    def __init__(self, state_dir: Path, durability: str = "on-flush"):
+        """
+        Initialize JSON snapshot storage.
+
+        Args:
+            state_dir: Directory holding the state file.
+            durability: One of DURABILITY_MODES; "every-write" fsyncs each rewrite.
+        """
+        self._fsync = durability == "every-write"
+        self.state_file = Path(state_dir) / STATE_FILENAME
+        self.history_file = Path(state_dir) / HISTORY_FILENAME
+        self.lock_file = Path(state_dir) / LOCK_FILENAME
+        # (inode, mtime, size) of the files last read or written; None forces a read
+        self._stamp: Optional[tuple] = None
+        self.refresh()
+
+    def _file_stamp(self) -> tuple:
+        """Identify the current state and history files without reading them."""
+        stamp = []
+        for path in (self.state_file, self.history_file):
+            try:
+                stat = path.stat()
+            except OSError:
+                stamp.append(None)
+            else:
+                stamp.append((stat.st_ino, stat.st_mtime_ns, stat.st_size))
+        return tuple(stamp)
+
+    def refresh(self) -> None:
+        """Re-read the snapshot from disk if it changed since it was last read or written."""
+        stamp = self._file_stamp()
+        if stamp == self._stamp:
+            return
+        self._stamp = stamp
+        self._levels: Optional[dict] = None
+        self._history: list = []
+        self._rollups: list = []
+        self._checkpoints: list = []
+        try:
+            self._read()
+        except (OSError, ValueError) as e:
+            # Corrupted snapshot - start fresh
+            self._levels = None
+            self._history = []
+            self._rollups = []
+            self._checkpoints = []
+
+    def lock(self):
+        """Exclusive cross-process lock on the state directory."""
+        return file_lock(self.lock_file)
+
+    def _read(self) -> None:
+        """Read the snapshot, picking up history from an append log if present."""
+        if self.state_file.exists():
+            with open(self.state_file, 'r') as f:
+                state_data = json.load(f)
+            self._levels = _levels_from(state_data)
+            self._rollups = state_data.get("rollups", [])
+            self._checkpoints = state_data.get("checkpoints", [])
+            if "history" in state_data:
+                self._history = state_data["history"]
+                return
+        # Switching from the append-log backend: keep its history
+        self._history = read_history_log(self.history_file)
+
+    def _write(self) -> None:
+        """Rewrite the whole snapshot."""
+        levels = self._levels or {"stress_level": 0, "boss_alert_level": 0}
+        state_data = {**levels, "history": self._history}
+        if self._rollups:
+            state_data["rollups"] = self._rollups
+        if self._checkpoints:
+            state_data["checkpoints"] = self._checkpoints
+        atomic_write(self.state_file, json.dumps(state_data, indent=2), fsync=self._fsync)
+        self._stamp = self._file_stamp()
+
+    def sync(self) -> None:
+        """Flush the snapshot and its directory entry to disk."""
+        fsync_path(self.state_file)
+        fsync_path(self.state_file.parent)
+
+    def load_levels(self) -> Optional[dict]:
+        """Load the stored stress and boss alert levels."""
+        return dict(self._levels) if self._levels is not None else None
+
+    def load_version(self) -> int:
+        """Read the stored state version (re-reads the snapshot only if it changed on disk)."""
+        self.refresh()
+        return super().load_version()
+
+    def save_levels(
+        self,
+        stress_level: int,
+        boss_alert_level: int,
+        aggregates: Optional[dict] = None,
+        version: int = 0,
+        since: Optional[list] = None,
+        timestamp: Optional[float] = None,
+    ) -> None:
+        """Store the current levels (rewrites the whole file)."""
+        self._levels = levels_record(stress_level, boss_alert_level, aggregates, version, since, timestamp)
+        self._write()
+
+    def append_history(self, *events: dict) -> None:
+        """Append history events (rewrites the whole file)."""
+        self._history.extend(events)
+        self._write()
+
+    def commit(
+        self,
+        stress_level: int,
+        boss_alert_level: int,
+        aggregates: Optional[dict] = None,
+        events: tuple = (),
+        version: int = 0,
+        since: Optional[list] = None,
+        timestamp: Optional[float] = None,
+    ) -> None:
+        """Append history events and save the levels with a single file rewrite."""
+        self._history.extend(events)
+        self.save_levels(stress_level, boss_alert_level, aggregates, version, since, timestamp)
+
+    def load_history(self) -> list:
+        """Load every history event in append order."""
+        return list(self._history)
+
+    def load_rollups(self) -> list:
+        """Load the rollups of compacted history."""
+        return list(self._rollups)
+
+    def compact_history(self, count: int, rollups: list) -> None:
+        """Drop the oldest events and replace the rollups (rewrites the whole file)."""
+        del self._history[:count]
+        self._rollups = list(rollups)
+        self._write()
+
+    def append_checkpoint(self, checkpoint: dict) -> None:
+        """Append a state checkpoint (rewrites the whole file)."""
+        self._checkpoints.append(checkpoint)
+        self._write()
+
+    def load_checkpoints(self) -> list:
+        """Load every state checkpoint in append order."""
+        return list(self._checkpoints)
+
+    def prune_checkpoints(self, before: float) -> None:
+        """Drop the checkpoints taken before a point in time (rewrites the whole file)."""
+        self._checkpoints = [c for c in self._checkpoints if c["timestamp"] >= before]
+        self._write()
+
+    def last_event(self) -> Optional[dict]:
+        """Load the most recent history event."""
+        return self._history[-1] if self._history else None
+
+
+class AppendLogStorage(StorageBackend):
+    """
+    Small JSON snapshot for levels plus an append-only JSONL history log.
+
+    Saving levels and appending an event cost the same no matter how long
+    the history is.
+    """
+
+    name = "log"
+
+    def __init__(self, state_dir: Path, durability: str = "on-flush"):
+        """
+        Initialize append-log storage.
+
+        Args:
+            state_dir: Directory holding the snapshot and history log.
+            durability: One of DURABILITY_MODES; "every-write" fsyncs each
+                snapshot, append and compaction.
+        """
+        self._fsync = durability == "every-write"
+        self.state_file = Path(state_dir) / STATE_FILENAME
+        self.history_file = Path(state_dir) / HISTORY_FILENAME
+        self.rollups_file = Path(state_dir) / ROLLUPS_FILENAME
+        self.checkpoints_file = Path(state_dir) / CHECKPOINTS_FILENAME
+        self.lock_file = Path(state_dir) / LOCK_FILENAME
+
+    def lock(self):
+        """Exclusive cross-process lock on the state directory."""
+        return file_lock(self.lock_file)
+
+    def load_levels(self) -> Optional[dict]:
+        """
+        Load the stored stress and boss alert levels.
+
+        History embedded in the snapshot by older versions (or by the JSON
+        snapshot backend) is migrated into the log and the snapshot is
+        rewritten without it.
+        """
+        if not self.state_file.exists():
+            return None
+        with open(self.state_file, 'r') as f:
+            state_data = json.load(f)
+        levels = _levels_from(state_data)
+
+        legacy_history = state_data.get("history")
+        if legacy_history is not None:
+            if legacy_history and not self.history_file.exists():
+                self.append_history(*legacy_history)
+            self.save_levels(
+                levels["stress_level"],
+                levels["boss_alert_level"],
+                levels.get("aggregates"),
+                levels.get("version", 0),
+                levels.get("since"),
+                levels.get("timestamp"),
+            )
+        return levels
+
+    def save_levels(
+        self,
+        stress_level: int,
+        boss_alert_level: int,
+        aggregates: Optional[dict] = None,
+        version: int = 0,
+        since: Optional[list] = None,
+        timestamp: Optional[float] = None,
+    ) -> None:
+        """Store the current stress and boss alert levels."""
+        state_data = levels_record(stress_level, boss_alert_level, aggregates, version, since, timestamp)
+        atomic_write(self.state_file, json.dumps(state_data, indent=2), fsync=self._fsync)
+
+    def append_history(self, *events: dict) -> None:
+        """Append history events to the log."""
+        self._append(self.history_file, events)
+
+    def _append(self, path: Path, entries) -> None:
+        """Append JSON lines to a log file."""
+        with open(path, 'a') as f:
+            f.writelines(json.dumps(entry) + "\n" for entry in entries)
+            if self._fsync:
+                f.flush()
+                os.fsync(f.fileno())
+
+    def sync(self) -> None:
+        """Flush the snapshot, logs, rollups and directory entries to disk."""
+        for path in (self.state_file, self.history_file, self.rollups_file, self.checkpoints_file):
+            fsync_path(path)
+        fsync_path(self.state_file.parent)
+
+    def load_history(self) -> list:
+        """Load every history event in append order."""
+        return read_history_log(self.history_file)
+
+    def last_event(self) -> Optional[dict]:
+        """Load the most recent history event from the end of the log only."""
+        return read_last_line(self.history_file)
+
+    def append_checkpoint(self, checkpoint: dict) -> None:
+        """Append a state checkpoint to the checkpoint log."""
+        self._append(self.checkpoints_file, (checkpoint,))
+
+    def load_checkpoints(self) -> list:
+        """Load every state checkpoint in append order."""
+        return read_history_log(self.checkpoints_file)
+
+    def prune_checkpoints(self, before: float) -> None:
+        """Drop the checkpoints taken before a point in time (swaps in a trimmed log)."""
+        remaining = [c for c in self.load_checkpoints() if c["timestamp"] >= before]
+        content = "".join(json.dumps(checkpoint) + "\n" for checkpoint in remaining)
+        atomic_write(self.checkpoints_file, content, fsync=self._fsync)
+
+    def load_rollups(self) -> list:
+        """Load the rollups of compacted history."""
+        if not self.rollups_file.exists():
+            return []
+        with open(self.rollups_file, 'r') as f:
+            return json.load(f)
+
+    def compact_history(self, count: int, rollups: list) -> None:
+        """
+        Drop the oldest events and replace the rollups.
+
+        Rollups are written first and the trimmed log is swapped in with a
+        rename, so an interrupted compaction never loses events (at worst a
+        few are counted twice).
+        """
+        atomic_write(self.rollups_file, json.dumps(rollups), fsync=self._fsync)
+
+        if count:
+            remaining = read_history_log(self.history_file)[count:]
+            content = "".join(json.dumps(event) + "\n" for event in remaining)
+            atomic_write(self.history_file, content, fsync=self._fsync)
+
+
+class SQLiteStorage(StorageBackend):
+    """
+    SQLite-backed storage for stress/boss levels and break history.
+
+    Current levels live in a one-row ``state`` table and history in a
+    ``history`` table indexed on ``tool_name`` and ``timestamp``, so reports
+    run as indexed SQL aggregates instead of loading every event.
+    """
+
+    name = "sqlite"
+
+    # SQL expression for the start timestamp of a rollup bucket
+    ROLLUP_START = f"hour * {ROLLUP_BUCKET_SECONDS}"
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS state (
+            id INTEGER PRIMARY KEY CHECK (id = 0),
+            stress_level INTEGER NOT NULL,
+            boss_alert_level INTEGER NOT NULL,
+            aggregates TEXT,
+            version INTEGER NOT NULL DEFAULT 0,
+            since TEXT,
+            timestamp REAL
+        );
+        CREATE TABLE IF NOT EXISTS history (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            tool_name TEXT NOT NULL,
+            timestamp REAL NOT NULL,
+            stress_change INTEGER NOT NULL,
+            boss_alert_change INTEGER NOT NULL,
+            stress_level INTEGER,
+            boss_alert_level INTEGER,
+            stress_since REAL,
+            boss_since REAL
+        );
+        CREATE INDEX IF NOT EXISTS idx_history_tool_name ON history (tool_name);
+        CREATE INDEX IF NOT EXISTS idx_history_timestamp ON history (timestamp);
+        CREATE TABLE IF NOT EXISTS rollups (
+            tool_name TEXT NOT NULL,
+            hour INTEGER NOT NULL,
+            count INTEGER NOT NULL,
+            stress_change INTEGER NOT NULL,
+            boss_alert_change INTEGER NOT NULL,
+            PRIMARY KEY (tool_name, hour)
+        );
+        CREATE TABLE IF NOT EXISTS checkpoints (
+            timestamp REAL NOT NULL,
+            stress_level INTEGER NOT NULL,
+            boss_alert_level INTEGER NOT NULL,
+            stress_since REAL NOT NULL,
+            boss_since REAL NOT NULL,
+            events INTEGER NOT NULL
+        );
+    """
+
+    # History columns in event order
+    HISTORY_COLUMNS = (
+        "tool_name, timestamp, stress_change, boss_alert_change,"
+        " stress_level, boss_alert_level, stress_since, boss_since"
+    )
+
+    def __init__(self, path: Path, durability: str = "on-flush"):
+        """
+        Open (and create if needed) the SQLite database.
+
+        Args:
+            path: Path to the database file.
+            durability: One of DURABILITY_MODES. The database runs in WAL
+                mode; "every-write" uses ``synchronous = FULL`` so every
+                commit is fsynced. Otherwise ``synchronous = NORMAL``:
+                the database can't be corrupted, but an OS crash or power
+                loss may roll back the commits since the last WAL
+                checkpoint, which sync() forces.
+        """
+        self.path = Path(path)
+        # Sessions are opened and hibernated in worker threads and used on the
+        # event loop; the registry never uses one connection from two threads at once
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode = WAL")
+        synchronous = "FULL" if durability == "every-write" else "NORMAL"
+        self._conn.execute(f"PRAGMA synchronous = {synchronous}")
+        self._conn.executescript(self.SCHEMA)
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(state)")}
+        if "aggregates" not in columns:
+            # Databases created before aggregates were persisted
+            self._conn.execute("ALTER TABLE state ADD COLUMN aggregates TEXT")
+        if "version" not in columns:
+            # Databases created before state was versioned
+            self._conn.execute("ALTER TABLE state ADD COLUMN version INTEGER NOT NULL DEFAULT 0")
+            self._conn.execute("ALTER TABLE state ADD COLUMN since TEXT")
+        if "timestamp" not in columns:
+            # Databases created before events carried the levels they left behind
+            self._conn.execute("ALTER TABLE state ADD COLUMN timestamp REAL")
+            history_columns = {row[1] for row in self._conn.execute("PRAGMA table_info(history)")}
+            if "stress_level" not in history_columns:
+                for column in ("stress_level INTEGER", "boss_alert_level INTEGER", "stress_since REAL", "boss_since REAL"):
+                    self._conn.execute(f"ALTER TABLE history ADD COLUMN {column}")
+        self._conn.commit()
+        self._in_transaction = False
+        self.lock_file = self.path.parent / LOCK_FILENAME
+
+    @contextmanager
+    def _transaction(self) -> Iterator[None]:
+        """Run the block in one SQL transaction; nested blocks join the outer one."""
+        if self._in_transaction:
+            yield
+            return
+        self._in_transaction = True
+        try:
+            with self._conn:
+                yield
+        finally:
+            self._in_transaction = False
+
+    def migrate_from(self, source: StorageBackend) -> None:
+        """
+        Copy levels and history from another backend in a single transaction.
+
+        If any part fails, nothing is imported, so the database stays empty
+        and the import runs again on the next start.
+        """
+        with self._transaction():
+            super().migrate_from(source)
+
+    def lock(self):
+        """Exclusive cross-process lock on the database's directory."""
+        return file_lock(self.lock_file)
+
+    def close(self) -> None:
+        """Close the database connection."""
+        self._conn.close()
+
+    def sync(self) -> None:
+        """Flush committed transactions to disk (checkpoints the WAL into the database)."""
+        self._conn.execute("PRAGMA wal_checkpoint(FULL)")
+
+    def is_empty(self) -> bool:
+        """Return True if neither levels nor history have been stored yet."""
+        has_state = self._conn.execute("SELECT 1 FROM state LIMIT 1").fetchone()
+        has_history = self._conn.execute("SELECT 1 FROM history LIMIT 1").fetchone()
+        has_rollups = self._conn.execute("SELECT 1 FROM rollups LIMIT 1").fetchone()
+        return has_state is None and has_history is None and has_rollups is None
+
+    def load_levels(self) -> Optional[dict]:
+        """Load the stored stress and boss alert levels."""
+        row = self._conn.execute(
+            "SELECT stress_level, boss_alert_level, aggregates, version, since, timestamp FROM state WHERE id = 0"
+        ).fetchone()
+        if row is None:
+            return None
+        return levels_record(
+            row[0],
+            row[1],
+            json.loads(row[2]) if row[2] is not None else None,
+            row[3],
+            json.loads(row[4]) if row[4] is not None else None,
+            row[5],
+        )
+
+    def load_version(self) -> int:
+        """Read the stored state version."""
+        row = self._conn.execute("SELECT version FROM state WHERE id = 0").fetchone()
+        return row[0] if row is not None else 0
+
+    def save_levels(
+        self,
+        stress_level: int,
+        boss_alert_level: int,
+        aggregates: Optional[dict] = None,
+        version: int = 0,
+        since: Optional[list] = None,
+        timestamp: Optional[float] = None,
+    ) -> None:
+        """Store the current stress and boss alert levels."""
+        self.commit(stress_level, boss_alert_level, aggregates, version=version, since=since, timestamp=timestamp)
+
+    def append_history(self, *events: dict) -> None:
+        """Append history events in a single transaction."""
+        with self._transaction():
+            self._insert_history(events)
+
+    def _insert_history(self, events: tuple) -> None:
+        """Insert history events (caller manages the transaction)."""
+        self._conn.executemany(
+            f"INSERT INTO history ({self.HISTORY_COLUMNS}) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            [
+                (
+                    e["tool_name"],
+                    e["timestamp"],
+                    e["stress_change"],
+                    e["boss_alert_change"],
+                    e.get("stress_level"),
+                    e.get("boss_alert_level"),
+                    *(e.get("since") or (None, None)),
+                )
+                for e in events
+            ],
+        )
+
+    @staticmethod
+    def _event(row: tuple) -> dict:
+        """Build an event dict from a row of HISTORY_COLUMNS."""
+        event = {"tool_name": row[0], "timestamp": row[1], "stress_change": row[2], "boss_alert_change": row[3]}
+        if row[4] is not None:
+            event.update(stress_level=row[4], boss_alert_level=row[5], since=[row[6], row[7]])
+        return event
+
+    def commit(
+        self,
+        stress_level: int,
+        boss_alert_level: int,
+        aggregates: Optional[dict] = None,
+        events: tuple = (),
+        version: int = 0,
+        since: Optional[list] = None,
+        timestamp: Optional[float] = None,
+    ) -> None:
+        """Append history events and save the levels in a single SQL transaction."""
+        with self._transaction():
+            if events:
+                self._insert_history(events)
+            self._conn.execute(
+                "INSERT OR REPLACE INTO state (id, stress_level, boss_alert_level, aggregates, version, since, timestamp)"
+                " VALUES (0, ?, ?, ?, ?, ?, ?)",
+                (
+                    stress_level,
+                    boss_alert_level,
+                    json.dumps(aggregates) if aggregates is not None else None,
+                    version,
+                    json.dumps(list(since)) if since is not None else None,
+                    timestamp,
+                ),
+            )
+
+    def load_history(self) -> list:
+        """Load every history event in insertion order."""
+        rows = self._conn.execute(f"SELECT {self.HISTORY_COLUMNS} FROM history ORDER BY id")
+        return [self._event(r) for r in rows]
+
+    def last_event(self) -> Optional[dict]:
+        """Load the most recent history event."""
+        row = self._conn.execute(
+            f"SELECT {self.HISTORY_COLUMNS} FROM history ORDER BY id DESC LIMIT 1"
+        ).fetchone()
+        return self._event(row) if row is not None else None
+
+    def append_checkpoint(self, checkpoint: dict) -> None:
+        """Append a state checkpoint."""
+        with self._transaction():
+            self._conn.execute(
+                "INSERT INTO checkpoints (timestamp, stress_level, boss_alert_level, stress_since, boss_since, events)"
+                " VALUES (?, ?, ?, ?, ?, ?)",
+                (
+                    checkpoint["timestamp"],
+                    checkpoint["stress_level"],
+                    checkpoint["boss_alert_level"],
+                    *checkpoint["since"],
+                    checkpoint["events"],
+                ),
+            )
+
+    def load_checkpoints(self) -> list:
+        """Load every state checkpoint in insertion order."""
+        rows = self._conn.execute(
+            "SELECT timestamp, stress_level, boss_alert_level, stress_since, boss_since, events"
+            " FROM checkpoints ORDER BY rowid"
+        )
+        return [
+            {"timestamp": r[0], "stress_level": r[1], "boss_alert_level": r[2], "since": [r[3], r[4]], "events": r[5]}
+            for r in rows
+        ]
+
+    def prune_checkpoints(self, before: float) -> None:
+        """Drop the checkpoints taken before a point in time."""
+        with self._transaction():
+            self._conn.execute("DELETE FROM checkpoints WHERE timestamp < ?", (before,))
+
+    def load_rollups(self) -> list:
+        """Load the rollups of compacted history."""
+        rows = self._conn.execute(
+            "SELECT tool_name, hour, count, stress_change, boss_alert_change FROM rollups ORDER BY hour"
+        )
+        return [
+            {"tool_name": r[0], "hour": r[1], "count": r[2], "stress_change": r[3], "boss_alert_change": r[4]}
+            for r in rows
+        ]
+
+    def compact_history(self, count: int, rollups: list) -> None:
+        """Drop the oldest events and replace the rollups in a single transaction."""
+        with self._transaction():
+            self._conn.execute(
+                "DELETE FROM history WHERE id IN (SELECT id FROM history ORDER BY id LIMIT ?)",
+                (count,),
+            )
+            self._conn.execute("DELETE FROM rollups")
+            self._conn.executemany(
+                "INSERT INTO rollups (tool_name, hour, count, stress_change, boss_alert_change) VALUES (?, ?, ?, ?, ?)",
+                [
+                    (r["tool_name"], r["hour"], r["count"], r["stress_change"], r["boss_alert_change"])
+                    for r in rollups
+                ],
+            )
+
+    def count_history(self, start: Optional[float] = None, end: Optional[float] = None) -> int:
+        """Count history events (including compacted ones), optionally within [start, end)."""
+        where, params = self._time_range(start, end)
+        rollup_where, rollup_params = self._time_range(start, end, self.ROLLUP_START)
+        live = self._conn.execute(f"SELECT COUNT(*) FROM history{where}", params).fetchone()[0]
+        compacted = self._conn.execute(
+            f"SELECT COALESCE(SUM(count), 0) FROM rollups{rollup_where}", rollup_params
+        ).fetchone()[0]
+        return live + compacted
+
+    def tool_counts(self, start: Optional[float] = None, end: Optional[float] = None) -> Counter:
+        """
+        Count history events per tool, optionally within [start, end).
+
+        Tools are ordered by first use, matching a Counter built from the
+        history list.
+        """
+        where, params = self._time_range(start, end)
+        rollup_where, rollup_params = self._time_range(start, end, self.ROLLUP_START)
+        rows = self._conn.execute(
+            "SELECT tool_name, SUM(n) FROM ("
+            f"  SELECT tool_name, COUNT(*) AS n, MIN(timestamp) AS first FROM history{where} GROUP BY tool_name"
+            "  UNION ALL"
+            f"  SELECT tool_name, SUM(count), MIN({self.ROLLUP_START}) FROM rollups{rollup_where} GROUP BY tool_name"
+            ") GROUP BY tool_name ORDER BY MIN(first)",
+            params + rollup_params,
+        )
+        return Counter(dict(rows.fetchall()))
+
+    def hour_counts(self, start: Optional[float] = None, end: Optional[float] = None) -> Counter:
+        """Count history events per local hour of day, optionally within [start, end)."""
+        where, params = self._time_range(start, end)
+        rollup_where, rollup_params = self._time_range(start, end, self.ROLLUP_START)
+        rows = self._conn.execute(
+            "SELECT CAST(strftime('%H', ts, 'unixepoch', 'localtime') AS INTEGER) AS hod, SUM(n) FROM ("
+            f"  SELECT timestamp AS ts, 1 AS n FROM history{where}"
+            "  UNION ALL"
+            f"  SELECT {self.ROLLUP_START}, count FROM rollups{rollup_where}"
+            ") GROUP BY hod ORDER BY MIN(ts)",
+            params + rollup_params,
+        )
+        return Counter(dict(rows.fetchall()))
+
+    def change_totals(self, start: Optional[float] = None, end: Optional[float] = None) -> dict:
+        """Sum the stress and boss alert changes (including compacted events), optionally within [start, end)."""
+        where, params = self._time_range(start, end)
+        rollup_where, rollup_params = self._time_range(start, end, self.ROLLUP_START)
+        row = self._conn.execute(
+            "SELECT COALESCE(SUM(s), 0), COALESCE(SUM(b), 0) FROM ("
+            f"  SELECT SUM(stress_change) AS s, SUM(boss_alert_change) AS b FROM history{where}"
+            "  UNION ALL"
+            f"  SELECT SUM(stress_change), SUM(boss_alert_change) FROM rollups{rollup_where}"
+            ")",
+            params + rollup_params,
+        ).fetchone()
+        return {"stress_change": row[0], "boss_alert_change": row[1]}
+
+    @staticmethod
+    def _time_range(start: Optional[float], end: Optional[float], column: str = "timestamp") -> tuple:
+        """Build a WHERE clause (using the timestamp index) for [start, end)."""
+        clauses, params = [], []
+        if start is not None:
+            clauses.append(f"{column} >= ?")
+            params.append(start)
+        if end is not None:
+            clauses.append(f"{column} < ?")
+            params.append(end)
+        where = " WHERE " + " AND ".join(clauses) if clauses else ""
+        return where, params
+
+
+def create_storage(
+    kind: str = "log",
+    state_dir: Optional[Union[str, Path]] = None,
+    durability: str = "on-flush",
+) -> StorageBackend:
+    """
+    Create a storage backend.
+
+    Args:
+        kind: Backend name ("memory", "json", "log" or "sqlite").
+        state_dir: Directory for state files. If None, the project root is used.
+        durability: When writes are fsynced (see DURABILITY_MODES).
+
+    Returns:
+        StorageBackend: The requested backend.
+    """
+    if kind == "memory":
+        return MemoryStorage()
+
+    state_dir = Path(state_dir) if state_dir is not None else DEFAULT_STATE_DIR
+    state_dir.mkdir(parents=True, exist_ok=True)
+
+    if kind == "json":
+        return JsonSnapshotStorage(state_dir, durability)
+    if kind == "log":
+        return AppendLogStorage(state_dir, durability)
+    if kind == "sqlite":
+        storage = SQLiteStorage(state_dir / DB_FILENAME, durability)
+        if storage.is_empty():
+            try:
+                # Pick up state written by the JSON backends on first use
+                storage.migrate_from(AppendLogStorage(state_dir))
+            except Exception as e:
+                # Fail silently - start with an empty database
+                pass
+        return storage
+    raise ValueError(f"Unknown storage backend: {kind}")
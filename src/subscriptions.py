@@ -0,0 +1,202 @@
+"""State resource subscriptions for ChillMCP server."""
+
+import asyncio
+from typing import Optional
+
+from .clock import Clock, SystemClock
+from .sessions import DEFAULT_SESSION
+from .state_manager import StateManager
+
+# Resource exposing the agent state
+STATE_URI = "chill://state"
+
+
+class StateSubscriptions:
+    """
+    Clients subscribed to ``chill://state`` and their update notifications.
+
+    A subscribed client is anything with an async
+    ``send_resource_updated(uri)`` (an MCP server session). StateManagers
+    report every published change through ``changed()``; changes arriving
+    within ``window`` seconds of the first are coalesced, and when the
+    window closes each changed session's subscribers get one notification,
+    but only if the levels they would read differ from those at their last
+    notification (or at subscribe time).
+
+    Stress growth and boss cooldown change the levels without any event,
+    so after each check a timer is set for the next such step of every
+    subscribed session. Subscribers never have to poll check_status.
+    """
+
+    def __init__(self, window: float = 0.1, cooldown: float = 300, clock: Optional[Clock] = None):
+        """
+        Initialize the subscriptions.
+
+        Args:
+            window: Seconds over which changes are coalesced into one notification.
+            cooldown: Boss alert cooldown in seconds, for timing cooldown steps.
+            clock: Time source for the window and timers. If None, the system clock.
+        """
+        self.window = window
+        self.cooldown = cooldown
+        self.clock: Clock = clock or SystemClock()
+        self._subscribers: dict = {}  # session id -> set of subscribed clients
+        self._notified: dict = {}  # session id -> levels at the last notification
+        self._pending: dict = {}  # session id -> StateManager with unchecked changes
+        self._flush_task: Optional[asyncio.Task] = None
+        self._timers: dict = {}  # session id -> task waiting for the next time-driven step
+        self.changes: int = 0  # changes reported for subscribed sessions
+        self.notifications: int = 0  # notifications sent
+        self.suppressed: int = 0  # coalesced checks that found the levels unchanged
+
+    def __len__(self) -> int:
+        """Number of subscribed clients over all sessions."""
+        return sum(len(clients) for clients in self._subscribers.values())
+
+    @staticmethod
+    def _levels(manager: StateManager, now: float, cooldown: float) -> tuple:
+        """Stress and boss alert levels a subscriber would read now."""
+        snapshot = manager.snapshot
+        return snapshot.stress_at(now)[0], snapshot.boss_alert_at(now, cooldown)[0]
+
+    def subscribe(self, session_id: Optional[str], client, manager: StateManager) -> None:
+        """
+        Subscribe a client to a session's state.
+
+        Args:
+            session_id: Session whose state the client reads. None means the default session.
+            client: Object with an async send_resource_updated(uri).
+            manager: The session's state manager.
+        """
+        session_id = session_id or DEFAULT_SESSION
+        clients = self._subscribers.setdefault(session_id, set())
+        if not clients:
+            self._notified[session_id] = self._levels(manager, self.clock.monotonic(), self.cooldown)
+            self._watch(session_id, manager)
+        clients.add(client)
+
+    def unsubscribe(self, session_id: Optional[str], client) -> None:
+        """
+        Unsubscribe a client from a session's state (a no-op if it wasn't subscribed).
+
+        Args:
+            session_id: Session the client subscribed to. None means the default session.
+            client: The subscribed client.
+        """
+        session_id = session_id or DEFAULT_SESSION
+        clients = self._subscribers.get(session_id)
+        if clients is None:
+            return
+        clients.discard(client)
+        if not clients:
+            self._forget(session_id)
+
+    def _forget(self, session_id: str) -> None:
+        """Drop a session that has no subscribers left."""
+        self._subscribers.pop(session_id, None)
+        self._notified.pop(session_id, None)
+        self._pending.pop(session_id, None)
+        timer = self._timers.pop(session_id, None)
+        if timer is not None:
+            timer.cancel()
+
+    def changed(self, session_id: str, manager: StateManager) -> None:
+        """
+        Report a published change (a SessionRegistry listener).
+
+        Cheap when nobody is subscribed to the session; otherwise the
+        session is checked when the current coalescing window closes.
+
+        Args:
+            session_id: Session that changed.
+            manager: The session's state manager.
+        """
+        if session_id not in self._subscribers:
+            return
+        self.changes += 1
+        self._pending[session_id] = manager
+        if self._flush_task is not None and not self._flush_task.done():
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            # No event loop (synchronous caller) - checked with the next change
+            return
+        self._flush_task = loop.create_task(self._flush_later())
+
+    async def _flush_later(self) -> None:
+        """Wait for the coalescing window to close, then notify; repeat while changes keep coming."""
+        while True:
+            await self.clock.sleep(self.window)
+            await self.flush()
+            if not self._pending:
+                return
+
+    async def flush(self) -> None:
+        """Notify the subscribers of every session whose levels changed since their last notification."""
+        pending, self._pending = self._pending, {}
+        now = self.clock.monotonic()
+        for session_id, manager in pending.items():
+            clients = self._subscribers.get(session_id)
+            if not clients:
+                continue
+            self._watch(session_id, manager)
+            levels = self._levels(manager, now, self.cooldown)
+            if levels == self._notified.get(session_id):
+                self.suppressed += 1
+                continue
+            self._notified[session_id] = levels
+            for client in list(clients):
+                try:
+                    await client.send_resource_updated(STATE_URI)
+                    self.notifications += 1
+                except Exception as e:
+                    # The client went away - drop its subscription
+                    clients.discard(client)
+            if not clients:
+                self._forget(session_id)
+
+    def _watch(self, session_id: str, manager: StateManager) -> None:
+        """(Re)arm the timer for a session's next time-driven level change."""
+        timer = self._timers.pop(session_id, None)
+        if timer is not None:
+            timer.cancel()
+        now = self.clock.monotonic()
+        due = manager.snapshot.next_change(now, self.cooldown)
+        if due is None:
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        self._timers[session_id] = loop.create_task(self._wake_later(session_id, manager, due - now))
+
+    async def _wake_later(self, session_id: str, manager: StateManager, delay: float) -> None:
+        """Report a session as changed once its levels have moved on by themselves."""
+        await self.clock.sleep(delay)
+        self.changed(session_id, manager)
+
+    async def close(self) -> None:
+        """Cancel the pending window and every timer."""
+        tasks = list(self._timers.values())
+        if self._flush_task is not None:
+            tasks.append(self._flush_task)
+        self._timers = {}
+        self._flush_task = None
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    def stats(self) -> dict:
+        """
+        Subscription counters.
+
+        Returns:
+            dict: subscribers, changes, notifications and suppressed.
+        """
+        return {
+            "subscribers": len(self),
+            "changes": self.changes,
+            "notifications": self.notifications,
+            "suppressed": self.suppressed,
+        }
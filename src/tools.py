@@ -1,12 +1,19 @@
 """Break tools for the ChillMCP server."""
 
-import asyncio
 import random
-from typing import List
+from datetime import datetime
+from typing import Callable, List, Optional, TypeVar
 
 from . import ascii_art, statistics
-from .response_formatter import format_response
-from .state_manager import StateManager
+from .response_formatter import format_response, record_structured
+from .scheduler import DelayQueueFull
+from .history import QUERY_HISTORY_DEFAULT_LIMIT
+from .state_manager import StateManager, StateTransaction
+
+T = TypeVar("T")
+
+# Largest page query_history returns; bigger limits are clamped to it
+QUERY_HISTORY_MAX_LIMIT = 500
 
 
 # Fun messages for each break type
@@ -67,6 +74,87 @@ EMAIL_ORGANIZING_MESSAGES = [
 ]
 
 
+async def run_break(
+    state_manager: StateManager,
+    apply: Callable[[StateTransaction], T],
+    priority: int = 0,
+) -> T:
+    """
+    Apply a break's state changes as one transaction, after waiting out the boss.
+
+    Normally this is one lock acquisition and one write. If the boss is
+    watching (alert level 5), the call waits 20 seconds in the state
+    manager's delay queue without holding the lock, and the break is applied
+    in a second transaction afterwards. Nothing is changed before the wait,
+    so a call cancelled while queued leaves no partial update. With shared
+    state, a transaction that loses a race with another process is re-run
+    (see StateManager.atomic), so apply() may run more than once.
+
+    Args:
+        state_manager: The state manager instance.
+        apply: Applies the break to the transaction and returns its result.
+        priority: Delay queue priority (see DelayScheduler.wait).
+
+    Returns:
+        The result of apply().
+
+    Raises:
+        DelayQueueFull: Too many calls are already waiting for the boss.
+    """
+    apply = recording_changes(apply)
+
+    def apply_unless_watched(tx: StateTransaction) -> tuple:
+        # Check if boss is watching (alert level 5 = 20 second delay)
+        delay = tx.check_boss_delay()
+        return delay, (apply(tx) if delay == 0 else None)
+
+    delay, result = await state_manager.atomic(apply_unless_watched)
+    if delay == 0:
+        return result
+
+    await state_manager.scheduler.wait(delay, priority)
+    record_structured(delay_applied=delay)
+    return await state_manager.atomic(apply)
+
+
+def recording_changes(apply: Callable[[StateTransaction], T]) -> Callable[[StateTransaction], T]:
+    """
+    Wrap a transaction body to record the level changes it makes in the structured result.
+
+    A re-run transaction records again, so the run that commits has the last word.
+    """
+    def apply_and_record(tx: StateTransaction) -> T:
+        before = tx.get_state()
+        result = apply(tx)
+        after = tx.get_state()
+        record_structured(
+            stress_change=after["stress_level"] - before["stress_level"],
+            boss_alert_change=after["boss_alert_level"] - before["boss_alert_level"],
+        )
+        return result
+
+    return apply_and_record
+
+
+async def boss_queue_full(state_manager: StateManager) -> str:
+    """
+    Response for a break turned away because the delay queue is full.
+
+    Args:
+        state_manager: The state manager instance.
+
+    Returns:
+        str: Formatted response with the unchanged levels.
+    """
+    state = await state_manager.get_state()
+    return format_response(
+        break_summary="👀 Boss가 지켜보는 중! 이미 대기 중인 휴식이 너무 많아요. 잠시 후 다시 시도하세요.",
+        stress_level=state["stress_level"],
+        boss_alert_level=state["boss_alert_level"],
+        tool_name=None
+    )
+
+
 async def execute_break_tool(
     state_manager: StateManager,
     messages: List[str],
@@ -83,26 +171,24 @@ async def execute_break_tool(
     Returns:
         str: Formatted response.
     """
-    # Check if boss is watching (alert level 5 = 20 second delay)
-    delay = await state_manager.check_boss_delay()
-    if delay > 0:
-        await asyncio.sleep(delay)
-
-    # Update stress level (auto-increase based on time)
-    await state_manager.update_stress_level()
+    def apply(tx: StateTransaction) -> tuple:
+        # Decrease stress from taking a break
+        stress_decrease = tx.decrease_stress()
 
-    # Decrease stress from taking a break
-    stress_decrease = await state_manager.decrease_stress()
+        # Potentially increase boss alert
+        boss_increased, old_boss_level = tx.increase_boss_alert()
+        boss_alert_change = 1 if boss_increased else 0
 
-    # Potentially increase boss alert
-    boss_increased, old_boss_level = await state_manager.increase_boss_alert()
-    boss_alert_change = 1 if boss_increased else 0
+        # Save history
+        tx.add_history_event(tool_name, -stress_decrease, boss_alert_change)
 
-    # Save history
-    state_manager.add_history_event(tool_name, -stress_decrease, boss_alert_change)
+        # Get current state
+        return tx.get_state(), old_boss_level
 
-    # Get current state
-    state = await state_manager.get_state()
+    try:
+        state, old_boss_level = await run_break(state_manager, apply)
+    except DelayQueueFull:
+        return await boss_queue_full(state_manager)
 
     # Pick a random message
     message = random.choice(messages)
@@ -270,29 +356,27 @@ async def chimaek(state_manager: StateManager) -> str:
     Returns:
         str: Formatted response.
     """
-    # Check boss delay
-    delay = await state_manager.check_boss_delay()
-    if delay > 0:
-        await asyncio.sleep(delay)
-
-    # Update stress (auto-increase)
-    await state_manager.update_stress_level()
+    def apply(tx: StateTransaction) -> tuple:
+        # Chimaek gives HUGE stress relief (30-50)
+        stress_relief = random.randint(30, 50)
+        tx.decrease_stress(amount=stress_relief)
 
-    # Chimaek gives HUGE stress relief (30-50)
-    stress_relief = random.randint(30, 50)
-    await state_manager.decrease_stress(amount=stress_relief)
+        # But boss gets VERY suspicious - increase boss alert 2-3 times
+        # Store old level before changing
+        old_boss_level = tx.boss_alert_level
+        boss_increase = random.randint(2, 3)
+        tx.change_boss_alert(boss_increase)
 
-    # But boss gets VERY suspicious - increase boss alert 2-3 times
-    # Store old level before changing
-    old_boss_level = state_manager.boss_alert_level
-    boss_increase = random.randint(2, 3)
-    await state_manager.change_boss_alert(boss_increase)
+        # Save history
+        tx.add_history_event("chimaek", -stress_relief, boss_increase)
 
-    # Save history
-    state_manager.add_history_event("chimaek", -stress_relief, boss_increase)
+        # Get updated state
+        return tx.get_state(), old_boss_level
 
-    # Get updated state
-    state = await state_manager.get_state()
+    try:
+        state, old_boss_level = await run_break(state_manager, apply)
+    except DelayQueueFull:
+        return await boss_queue_full(state_manager)
 
     # Pick random message
     message = random.choice(CHIMAEK_MESSAGES)
@@ -310,25 +394,30 @@ async def leave_work(state_manager: StateManager) -> str:
     """
     Leave work immediately! Reset stress and boss alert to 0.
 
+    Never waits in the boss delay queue: leaving is always allowed.
+
     Args:
         state_manager: The state manager instance.
 
     Returns:
         str: Formatted response.
     """
-    # Save current levels before reset for history
-    current_state = await state_manager.get_state()
-    stress_before = current_state["stress_level"]
-    boss_before = current_state["boss_alert_level"]
+    def apply(tx: StateTransaction) -> dict:
+        # Save current levels before reset for history
+        current_state = tx.get_state()
+        stress_before = current_state["stress_level"]
+        boss_before = current_state["boss_alert_level"]
 
-    # 퇴근하면 모든 스트레스와 Boss Alert 리셋!
-    await state_manager.reset()
+        # 퇴근하면 모든 스트레스와 Boss Alert 리셋!
+        tx.reset()
 
-    # Save history (negative values mean decrease)
-    state_manager.add_history_event("leave_work", -stress_before, -boss_before)
+        # Save history (negative values mean decrease)
+        tx.add_history_event("leave_work", -stress_before, -boss_before)
 
-    # Get state
-    state = await state_manager.get_state()
+        # Get state
+        return tx.get_state()
+
+    state = await state_manager.atomic(recording_changes(apply))
 
     # Pick random message
     message = random.choice(LEAVE_WORK_MESSAGES)
@@ -351,42 +440,48 @@ async def company_dinner(state_manager: StateManager) -> str:
     Returns:
         str: Formatted response.
     """
-    # Check boss delay
-    delay = await state_manager.check_boss_delay()
-    if delay > 0:
-        await asyncio.sleep(delay)
-
-    # Update stress (auto-increase)
-    await state_manager.update_stress_level()
-
     # Random event: 50% chance of positive or negative
     is_positive = random.random() < 0.5
 
     event = ascii_art.get_random_dinner_event(positive=is_positive)
 
-    # Apply stress change
-    stress_change = event["stress_change"]
-    if stress_change < 0:
-        # Decrease stress
-        await state_manager.decrease_stress(amount=abs(stress_change))
-    else:
-        # Increase stress
-        await state_manager.increase_stress(amount=stress_change)
-
-    # Boss alert changes slightly
-    boss_alert_change = -1 if is_positive else 1
-    if is_positive:
-        # Positive event: boss alert decreases a bit
-        await state_manager.change_boss_alert(-1)
-    else:
-        # Negative event: boss alert increases
-        await state_manager.change_boss_alert(1)
-
-    # Save history (use negative stress_change for decrease)
-    state_manager.add_history_event("company_dinner", -stress_change if stress_change < 0 else stress_change, boss_alert_change)
-
-    # Get state
-    state = await state_manager.get_state()
+    def apply(tx: StateTransaction) -> dict:
+        # Apply stress change
+        stress_change = event["stress_change"]
+        if stress_change < 0:
+            # Decrease stress
+            tx.decrease_stress(amount=abs(stress_change))
+        else:
+            # Increase stress
+            tx.increase_stress(amount=stress_change)
+
+        # Boss alert changes slightly
+        boss_alert_change = -1 if is_positive else 1
+        if is_positive:
+            # Positive event: boss alert decreases a bit
+            tx.change_boss_alert(-1)
+        else:
+            # Negative event: boss alert increases
+            tx.change_boss_alert(1)
+
+        # Save history (use negative stress_change for decrease)
+        tx.add_history_event("company_dinner", -stress_change if stress_change < 0 else stress_change, boss_alert_change)
+
+        # Get state
+        return tx.get_state()
+
+    try:
+        # 회식은 빠질 수 없으니 대기열이 가득 차면 다른 휴식을 밀어내고 자리를 차지
+        state = await run_break(state_manager, apply, priority=1)
+    except DelayQueueFull:
+        return await boss_queue_full(state_manager)
+
+    record_structured(event={
+        "title": event["title"],
+        "message": event["message"],
+        "stress_change": event["stress_change"],
+        "positive": is_positive,
+    })
 
     # Build custom ASCII art with event
     custom_art = event["art"]
@@ -410,7 +505,7 @@ async def generate_report(state_manager: StateManager) -> str:
     Returns:
         str: Formatted response with statistics.
     """
-    stats = statistics.get_break_statistics()
+    stats = statistics.get_break_statistics(state_manager)
 
     if "error" in stats:
         return format_response(
@@ -425,6 +520,8 @@ async def generate_report(state_manager: StateManager) -> str:
     - **Total Breaks Taken:** {stats["total_breaks"]}
     - **Favorite Break Tool:** {stats["most_common_tool"]}
     - **Busiest Break Time:** {stats["most_common_hour"]}
+    - **Total Stress Relieved:** {stats["total_stress_relieved"]}
+    - **Boss Alert Raised:** {stats["total_boss_alert_change"]}
 
     **Breaks by Tool:**
     """
@@ -439,6 +536,104 @@ async def generate_report(state_manager: StateManager) -> str:
     )
 
 
+async def query_history(
+    state_manager: StateManager,
+    start: Optional[str] = None,
+    end: Optional[str] = None,
+    tool_name: Optional[str] = None,
+    cursor: Optional[int] = None,
+    limit: int = QUERY_HISTORY_DEFAULT_LIMIT,
+) -> str:
+    """
+    List past breaks in a time window, one page at a time.
+
+    Args:
+        state_manager: The state manager instance.
+        start: Window start as an ISO 8601 date/time (local time), inclusive.
+        end: Window end as an ISO 8601 date/time (local time), exclusive.
+        tool_name: Only list breaks taken with this tool.
+        cursor: Cursor from the previous page.
+        limit: Maximum number of breaks per page, at most QUERY_HISTORY_MAX_LIMIT.
+
+    Returns:
+        str: Formatted response with the matching breaks.
+    """
+    state = await state_manager.get_state()
+    limit = min(limit, QUERY_HISTORY_MAX_LIMIT)
+    try:
+        start_ts = datetime.fromisoformat(start).timestamp() if start else None
+        end_ts = datetime.fromisoformat(end).timestamp() if end else None
+        page = state_manager.query_history(start_ts, end_ts, tool_name, cursor, limit)
+    except ValueError as e:
+        return format_response(
+            break_summary=f"Invalid history query: {e}",
+            stress_level=state["stress_level"],
+            boss_alert_level=state["boss_alert_level"],
+            tool_name="query_history"
+        )
+
+    if not page["events"]:
+        summary = "No breaks found in this time window."
+    else:
+        summary = "**Break History**\n\n"
+        for event in page["events"]:
+            taken_at = datetime.fromtimestamp(event["timestamp"]).strftime("%Y-%m-%d %H:%M:%S")
+            summary += (
+                f"- {taken_at} {event['tool_name']} "
+                f"(stress {event['stress_change']:+d}, boss {event['boss_alert_change']:+d})\n"
+            )
+        if page["next_cursor"] is not None:
+            summary += f"\nMore breaks available - next cursor: {page['next_cursor']}"
+
+    return format_response(
+        break_summary=summary,
+        stress_level=state["stress_level"],
+        boss_alert_level=state["boss_alert_level"],
+        tool_name="query_history"
+    )
+
+
+async def state_at(state_manager: StateManager, at: str) -> str:
+    """
+    Look up the stress and boss alert levels at a past point in time.
+
+    Args:
+        state_manager: The state manager instance.
+        at: Point in time as an ISO 8601 date/time (local time).
+
+    Returns:
+        str: Formatted response with the reconstructed levels.
+    """
+    state = await state_manager.get_state()
+    try:
+        past = state_manager.state_at(datetime.fromisoformat(at).timestamp())
+    except ValueError as e:
+        return format_response(
+            break_summary=f"Invalid point in time: {e}",
+            stress_level=state["stress_level"],
+            boss_alert_level=state["boss_alert_level"],
+            tool_name="state_at"
+        )
+
+    if past is None:
+        summary = f"No recorded state at or before {at}."
+    else:
+        as_of = datetime.fromtimestamp(past["as_of"]).strftime("%Y-%m-%d %H:%M:%S")
+        summary = (
+            f"**State at {at}**\n\n"
+            f"- Stress Level: {past['stress_level']}\n"
+            f"- Boss Alert Level: {past['boss_alert_level']}\n"
+            f"- Last recorded change: {as_of}\n"
+        )
+
+    return format_response(
+        break_summary=summary,
+        stress_level=state["stress_level"],
+        boss_alert_level=state["boss_alert_level"],
+        tool_name="state_at"
+    )
+
+
 async def snack_time(state_manager: StateManager) -> str:
     """
     Take a snack break at the convenience store!
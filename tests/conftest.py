@@ -1,22 +1,46 @@
 """Pytest configuration and fixtures for ChillMCP tests."""
 
 import os
+import shutil
 from pathlib import Path
 
 import pytest
 
+from src.clock import VirtualClock
+
 
 @pytest.fixture(autouse=True)
 def clean_state_file():
-    """Remove state file before each test to ensure clean state."""
-    state_file = Path(__file__).parent.parent / ".chillmcp_state.json"
+    """Remove state and history files before each test to ensure clean state."""
+    project_root = Path(__file__).parent.parent
+    state_files = [
+        project_root / ".chillmcp_state.json",
+        project_root / ".chillmcp_history.jsonl",
+        project_root / ".chillmcp_state.db",
+        project_root / ".chillmcp_state.db-wal",
+        project_root / ".chillmcp_state.db-shm",
+        project_root / ".chillmcp_rollups.json",
+        project_root / ".chillmcp_checkpoints.jsonl",
+        project_root / ".chillmcp.lock",
+    ]
+    sessions_dir = project_root / "sessions"
 
-    # Remove state file before test
-    if state_file.exists():
-        os.remove(state_file)
+    # Remove state files before test
+    for state_file in state_files:
+        if state_file.exists():
+            os.remove(state_file)
+    shutil.rmtree(sessions_dir, ignore_errors=True)
 
     yield
 
     # Clean up after test
-    if state_file.exists():
-        os.remove(state_file)
+    for state_file in state_files:
+        if state_file.exists():
+            os.remove(state_file)
+    shutil.rmtree(sessions_dir, ignore_errors=True)
+
+
+@pytest.fixture
+def clock():
+    """Virtual clock that jumps ahead on sleep, so delays and cooldowns take no real time."""
+    return VirtualClock(auto_advance=True)
@@ -12,14 +12,13 @@ This test includes a scenario where boss alert reaches 5 and requires rest.
 
 import asyncio
 import pytest
-import time
 from src.config import Config
 from src.state_manager import StateManager
 from src import tools
 
 
 @pytest.mark.asyncio
-async def test_all_tools_sequential():
+async def test_all_tools_sequential(clock):
     """
     모든 도구를 순차적으로 호출하는 종합 테스트.
 
@@ -30,7 +29,7 @@ async def test_all_tools_sequential():
     """
     # 설정: boss_alertness를 낮게 설정하여 빠르게 테스트
     config = Config(boss_alertness=0, boss_alertness_cooldown=300)
-    state_manager = StateManager(config)
+    state_manager = StateManager(config, clock=clock)
 
     # 초기 스트레스 설정
     state_manager._stress_level = 50
@@ -82,7 +81,7 @@ async def test_all_tools_sequential():
 
 
 @pytest.mark.asyncio
-async def test_boss_alert_reaches_5_scenario():
+async def test_boss_alert_reaches_5_scenario(clock):
     """
     Boss Alert가 5에 도달하여 휴식이 필요한 시나리오 테스트.
 
@@ -94,7 +93,7 @@ async def test_boss_alert_reaches_5_scenario():
     """
     # 설정: boss_alertness를 100%로 설정하여 항상 증가
     config = Config(boss_alertness=100, boss_alertness_cooldown=5)
-    state_manager = StateManager(config)
+    state_manager = StateManager(config, clock=clock)
 
     # 초기 스트레스 설정
     state_manager._stress_level = 80
@@ -119,9 +118,9 @@ async def test_boss_alert_reaches_5_scenario():
 
     # Boss Alert가 5일 때 20초 지연 테스트
     print("\n[Boss Alert = 5] 20초 지연 테스트 시작...")
-    start_time = time.time()
+    start_time = clock.monotonic()
     response = await tools.take_a_break(state_manager)
-    elapsed_time = time.time() - start_time
+    elapsed_time = clock.monotonic() - start_time
 
     print(f"경과 시간: {elapsed_time:.2f}초")
     assert elapsed_time >= 20.0, f"Expected 20 second delay, got {elapsed_time:.2f} seconds"
@@ -129,7 +128,7 @@ async def test_boss_alert_reaches_5_scenario():
 
     # Boss Alert 감소 확인 (cooldown 시간 후)
     print("\n[Boss Alert 감소] Cooldown 테스트...")
-    state_manager._last_boss_cooldown = time.time() - 10  # 10초 전으로 설정 (5초 cooldown x 2)
+    clock.advance(10)  # 10초 경과 (5초 cooldown x 2)
     await state_manager.update_boss_cooldown()
 
     print(f"Cooldown 후 Boss Alert Level: {state_manager.boss_alert_level}")
@@ -142,7 +141,7 @@ async def test_boss_alert_reaches_5_scenario():
 
 
 @pytest.mark.asyncio
-async def test_complete_workflow_scenario():
+async def test_complete_workflow_scenario(clock):
     """
     완전한 워크플로우 시나리오: 모든 도구 호출 + Boss Alert 5 도달 + 휴식
 
@@ -154,7 +153,7 @@ async def test_complete_workflow_scenario():
     5. leave_work로 완전 리셋
     """
     config = Config(boss_alertness=80, boss_alertness_cooldown=10)
-    state_manager = StateManager(config)
+    state_manager = StateManager(config, clock=clock)
 
     print("\n" + "="*60)
     print("완전한 워크플로우 시나리오 테스트")
@@ -193,9 +192,9 @@ async def test_complete_workflow_scenario():
 
         # Step 3: 20초 지연 확인
         print("\n[Step 3] Boss Alert=5일 때 20초 지연 확인...")
-        start_time = time.time()
+        start_time = clock.monotonic()
         await tools.urgent_call(state_manager)
-        elapsed = time.time() - start_time
+        elapsed = clock.monotonic() - start_time
 
         print(f"  경과 시간: {elapsed:.2f}초")
         assert elapsed >= 20.0, f"Expected 20s delay, got {elapsed:.2f}s"
@@ -236,7 +235,7 @@ async def test_complete_workflow_scenario():
 
 
 @pytest.mark.asyncio
-async def test_stress_accumulation_with_breaks():
+async def test_stress_accumulation_with_breaks(clock):
     """
     스트레스 자동 증가와 휴식 도구의 상호작용 테스트.
 
@@ -247,7 +246,7 @@ async def test_stress_accumulation_with_breaks():
     4. 반복
     """
     config = Config(boss_alertness=30, boss_alertness_cooldown=300)
-    state_manager = StateManager(config)
+    state_manager = StateManager(config, clock=clock)
 
     print("\n" + "="*60)
     print("스트레스 누적 및 관리 테스트")
@@ -255,7 +254,7 @@ async def test_stress_accumulation_with_breaks():
 
     # 초기 스트레스 0
     state_manager._stress_level = 0
-    state_manager._last_stress_update = time.time() - 120  # 2분 전
+    clock.advance(120)  # 2분 경과
 
     print(f"\n초기 상태: Stress={state_manager.stress_level}")
 
@@ -270,7 +269,7 @@ async def test_stress_accumulation_with_breaks():
     print(f"휴식 후: Stress={stress_after_break}")
 
     # 다시 시간 경과
-    state_manager._last_stress_update = time.time() - 180  # 3분 전
+    clock.advance(180)  # 3분 경과
     await state_manager.update_stress_level()
     print(f"3분 더 경과 후: Stress={state_manager.stress_level} (최소 +3 예상)")
 
@@ -295,13 +294,13 @@ async def test_stress_accumulation_with_breaks():
 
 
 @pytest.mark.asyncio
-async def test_all_tools_with_high_boss_alertness():
+async def test_all_tools_with_high_boss_alertness(clock):
     """
     높은 boss_alertness 설정에서 모든 도구 테스트.
     Boss Alert가 빠르게 증가하는 상황 시뮬레이션.
     """
     config = Config(boss_alertness=90, boss_alertness_cooldown=5)
-    state_manager = StateManager(config)
+    state_manager = StateManager(config, clock=clock)
 
     print("\n" + "="*60)
     print("높은 Boss Alertness 환경에서 모든 도구 테스트")
@@ -327,9 +326,9 @@ async def test_all_tools_with_high_boss_alertness():
         boss_before = state_manager.boss_alert_level
         stress_before = state_manager.stress_level
 
-        start_time = time.time()
+        start_time = clock.monotonic()
         response = await tool_func(state_manager)
-        elapsed = time.time() - start_time
+        elapsed = clock.monotonic() - start_time
 
         boss_after = state_manager.boss_alert_level
         stress_after = state_manager.stress_level
@@ -0,0 +1,132 @@
+"""
+Tests for ASCII art packs.
+
+This module tests the art pack loader in ascii_art:
+- The bundled default pack and lazy loading of its assets
+- Themed packs that override some assets and fall back for the rest
+- Switching packs at runtime together with the rendering caches
+- Rejecting missing packs and unsupported pack formats
+"""
+
+import json
+
+import pytest
+
+from src import ascii_art
+from src.ascii_art import ART_PACK_FORMAT, ArtPack, open_pack, use_pack
+from src.response_formatter import clear_cache, format_response
+
+
+@pytest.fixture(autouse=True)
+def default_pack():
+    """Restore the default pack and empty the rendering caches after each test."""
+    yield
+    use_pack()
+    clear_cache()
+
+
+def make_pack(path, name="winter", format=ART_PACK_FORMAT, **assets):
+    """Write an art pack with the given assets (name -> text or data)."""
+    path.mkdir(parents=True)
+    (path / "pack.json").write_text(json.dumps({"name": name, "version": "2.0.0", "format": format}))
+    for asset, content in assets.items():
+        file = path / (asset.replace("__", "/") + (".json" if isinstance(content, (dict, list)) else ".txt"))
+        file.parent.mkdir(parents=True, exist_ok=True)
+        file.write_text(content if isinstance(content, str) else json.dumps(content), encoding="utf-8")
+    return path
+
+
+def test_default_pack_loads_on_first_use():
+    """
+    Test the bundled pack.
+
+    Component: ArtPack / open_pack
+    Purpose: 기본 팩이 열릴 때 색인만 하고, 각 아트는 처음 쓰일 때 한 번만 읽는지 확인
+
+    Expected Results:
+    - Opening indexes every asset but loads none
+    - Getting a tool's art loads just that asset, once
+    - Every tool with art in the pack has some
+
+    Test Status: PASS if assets are loaded lazily
+    """
+    pack = open_pack()
+    stats = pack.stats()
+    assert (stats["name"], stats["version"], stats["loaded"]) == ("default", "1.0.0", 0)
+    assert stats["assets"] > len(ascii_art.tool_names())
+
+    art = pack.art("tools/chimaek")
+    assert "치맥" in art
+    assert pack.stats()["loaded"] == 1
+    assert pack.art("tools/chimaek") is art
+    assert pack.art("tools/unknown") == ""
+
+    assert "take_a_break" in ascii_art.tool_names()
+    assert all(ascii_art.get_tool_ascii_art(name) for name in ascii_art.tool_names())
+
+
+def test_themed_pack_falls_back_to_default(tmp_path):
+    """
+    Test a partial themed pack.
+
+    Component: use_pack / get_* helpers
+    Purpose: 일부 아트만 담은 테마 팩이 그 아트를 바꾸고, 나머지는 기본 팩에서 가져오는지 확인
+
+    Expected Results:
+    - Overridden tool art, emotions and dinner events come from the themed pack
+    - Other assets come from the default pack
+    - Responses rendered after clear_cache() show the new art
+
+    Test Status: PASS if the themed pack is used with the default as fallback
+    """
+    path = make_pack(
+        tmp_path / "winter",
+        tools__take_a_break="\n  ❄ 눈 구경 휴식 ❄\n",
+        emotions={"happy": ["(*❄*)"], "relaxed": ["(-❄-)"]},
+        dinner_events={
+            "positive": [{"title": "🍲 어묵탕", "art": "dinner/oden", "stress_change": -10, "message": "따끈해요"}],
+            "negative": [{"title": "🥶 2차 포장마차", "art": "dinner/missing", "stress_change": 10, "message": "추워요"}],
+        },
+        dinner__oden="\n  🍢🍢🍢\n",
+    )
+    before = format_response("Break", 10, 0, tool_name="take_a_break")
+
+    pack = use_pack(str(path))
+    assert (pack.name, pack.version) == ("winter", "2.0.0")
+    assert ascii_art.get_tool_ascii_art("take_a_break") == "\n  ❄ 눈 구경 휴식 ❄\n"
+    assert ascii_art.get_tool_ascii_art("chimaek") == open_pack().art("tools/chimaek")
+    assert ascii_art.get_random_emotion("happy") == "(*❄*)"
+    assert ascii_art.get_random_dinner_event(positive=True)["art"] == "\n  🍢🍢🍢\n"
+    assert ascii_art.get_random_dinner_event(positive=False)["art"] == ""
+
+    clear_cache()
+    after = format_response("Break", 10, 0, tool_name="take_a_break")
+    assert "❄ 눈 구경 휴식 ❄" in after and after != before
+
+
+def test_invalid_packs_are_rejected(tmp_path):
+    """
+    Test pack validation.
+
+    Component: open_pack / ArtPack
+    Purpose: 존재하지 않거나 manifest가 없거나 형식 버전이 다른 팩을 거부하는지 확인
+
+    Expected Results:
+    - A missing pack, a directory without pack.json and a pack of another format raise ValueError
+    - Asking for a data asset nobody has raises KeyError
+
+    Test Status: PASS if bad packs fail loudly at startup
+    """
+    with pytest.raises(ValueError, match="Art pack not found"):
+        open_pack(str(tmp_path / "nowhere"))
+
+    (tmp_path / "empty").mkdir()
+    with pytest.raises(ValueError, match="no pack.json"):
+        open_pack(str(tmp_path / "empty"))
+
+    make_pack(tmp_path / "future", format=ART_PACK_FORMAT + 1)
+    with pytest.raises(ValueError, match="has format"):
+        open_pack(str(tmp_path / "future"))
+
+    with pytest.raises(KeyError):
+        ArtPack(make_pack(tmp_path / "bare")).load("emotions")
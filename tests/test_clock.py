@@ -0,0 +1,128 @@
+"""
+Tests for clock module.
+
+This module tests the time sources used by StateManager and the tools:
+- VirtualClock advancing and waking sleepers
+- Auto-advance mode for instant simulations
+- Level changes driven by a virtual clock
+"""
+
+import asyncio
+import time
+
+import pytest
+
+from src import tools
+from src.clock import SystemClock, VirtualClock
+from src.config import Config
+from src.state_manager import StateManager
+
+
+@pytest.mark.asyncio
+async def test_virtual_clock_wakes_sleepers_in_order():
+    """
+    Test manual advancing.
+
+    Component: VirtualClock.advance() / sleep()
+    Purpose: advance() 호출 시 만료된 sleep만 순서대로 깨어나는지 확인
+
+    Expected Results:
+    - Sleepers don't wake before their deadline
+    - Due sleepers wake in deadline order
+    - time() and monotonic() move together; the clock can't go backwards
+
+    Test Status: PASS if virtual time drives every wake-up
+    """
+    clock = VirtualClock(start=1_000_000.0)
+    woken = []
+
+    async def sleeper(name, delay):
+        await clock.sleep(delay)
+        woken.append((name, clock.monotonic()))
+
+    tasks = [asyncio.create_task(sleeper("late", 20)), asyncio.create_task(sleeper("early", 5))]
+    await asyncio.sleep(0)
+
+    clock.advance(4)
+    await asyncio.sleep(0)
+    assert woken == []
+
+    clock.advance(16)
+    await asyncio.gather(*tasks)
+    assert woken == [("early", 20), ("late", 20)]
+    assert clock.time() == 1_000_020.0
+
+    with pytest.raises(ValueError, match="backwards"):
+        clock.advance(-1)
+
+
+@pytest.mark.asyncio
+async def test_workday_simulation_runs_instantly():
+    """
+    Test a simulated workday on an auto-advancing clock.
+
+    Component: VirtualClock(auto_advance=True) / StateManager / tools
+    Purpose: 하루치 시뮬레이션(Boss 20초 지연 포함)이 실제 시간을 거의 쓰지 않고 실행되는지 확인
+
+    Expected Results:
+    - 8 virtual hours with a break every 10 minutes complete in well under a second
+    - Boss delays advance virtual time by 20 seconds each
+    - History timestamps follow virtual wall-clock time
+
+    Test Status: PASS if the simulation is fast and time-consistent
+    """
+    clock = VirtualClock(start=1_700_000_000.0, auto_advance=True)
+    manager = StateManager(Config(boss_alertness=100, boss_alertness_cooldown=3600, storage="memory"), clock=clock)
+
+    started = time.perf_counter()
+    for _ in range(48):
+        await clock.sleep(600)  # 10 minutes of work
+        await tools.take_a_break(manager)
+    elapsed = time.perf_counter() - started
+
+    assert elapsed < 1.0, f"Simulation should not take real time, took {elapsed:.2f}s"
+    assert clock.monotonic() > 48 * 600, "Boss delays should add virtual time"
+    assert manager.count_history() == 48
+    assert manager.history.timestamps[-1] == pytest.approx(clock.time())
+
+
+@pytest.mark.asyncio
+async def test_levels_follow_the_clock(clock):
+    """
+    Test levels driven by the injected clock.
+
+    Component: StateManager with a VirtualClock
+    Purpose: 스트레스 증가와 Boss Alert 감소가 주입된 시계 기준으로 계산되는지 확인
+
+    Expected Results:
+    - Stress grows 1 point per virtual minute
+    - Boss alert drops 1 level per virtual cooldown period
+    - Nothing changes while the clock stands still
+
+    Test Status: PASS if levels depend only on the injected clock
+    """
+    manager = StateManager(Config(boss_alertness=0, boss_alertness_cooldown=60, storage="memory"), clock=clock)
+    await manager.change_boss_alert(3)
+    assert await manager.get_state() == {"stress_level": 0, "boss_alert_level": 3}
+
+    clock.advance(150)
+    assert await manager.get_state() == {"stress_level": 2, "boss_alert_level": 1}
+
+
+def test_system_clock_is_monotonic():
+    """
+    Test the production clock.
+
+    Component: SystemClock
+    Purpose: 실제 시계가 wall-clock 시간과 단조 증가 시간을 제공하는지 확인
+
+    Expected Results:
+    - time() is epoch seconds
+    - monotonic() never goes backwards
+
+    Test Status: PASS if both readings behave
+    """
+    clock = SystemClock()
+    assert clock.time() == pytest.approx(time.time(), abs=1)
+    readings = [clock.monotonic() for _ in range(100)]
+    assert readings == sorted(readings)
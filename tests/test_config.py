@@ -185,3 +185,295 @@ def test_parse_args_edge_cases():
     config = parse_args(["--boss_alertness", "100", "--boss_alertness_cooldown", "1000"])
     assert config.boss_alertness == 100, f"Expected boss_alertness=100, got {config.boss_alertness}"
     assert config.boss_alertness_cooldown == 1000, f"Expected cooldown=1000, got {config.boss_alertness_cooldown}"
+
+
+def test_parse_args_persistence_options():
+    """
+    Test write-behind persistence options.
+
+    Component: parse_args / Config validation
+    Purpose: write-behind 관련 옵션이 파싱되고 잘못된 값은 거부되는지 확인
+
+    Expected Results:
+    - Defaults to write-through persistence
+    - --persistence_mode/--flush_interval/--flush_max_changes are parsed
+    - Invalid values raise ValueError
+
+    Test Status: PASS if options are parsed and validated
+    """
+    config = parse_args([])
+    assert config.persistence_mode == "write-through"
+
+    config = parse_args([
+        "--persistence_mode", "write-behind",
+        "--flush_interval", "0.5",
+        "--flush_max_changes", "10",
+    ])
+    assert config.persistence_mode == "write-behind"
+    assert config.flush_interval == 0.5
+    assert config.flush_max_changes == 10
+
+    with pytest.raises(ValueError, match="persistence_mode must be one of"):
+        Config(persistence_mode="sometimes")
+    with pytest.raises(ValueError, match="flush_interval must be positive"):
+        Config(flush_interval=0)
+    with pytest.raises(ValueError, match="flush_max_changes must be at least 1"):
+        Config(flush_max_changes=0)
+
+
+def test_parse_args_storage():
+    """
+    Test storage backend selection.
+
+    Component: parse_args / Config validation
+    Purpose: --storage/--state-path 옵션이 파싱되고 지원하지 않는 백엔드는 거부되는지 확인
+
+    Expected Results:
+    - Defaults to the JSON log backend in the project root
+    - --storage and --state-path are parsed
+    - Unknown backends raise ValueError
+
+    Test Status: PASS if storage option is parsed and validated
+    """
+    assert parse_args([]).storage == "log"
+    assert parse_args([]).state_path is None
+    assert parse_args(["--storage", "sqlite"]).storage == "sqlite"
+
+    config = parse_args(["--storage", "memory", "--state-path", "/tmp/chill"])
+    assert config.storage == "memory"
+    assert config.state_path == "/tmp/chill"
+
+    with pytest.raises(ValueError, match="storage must be one of"):
+        Config(storage="floppy")
+
+
+def test_parse_args_history_retention():
+    """
+    Test history retention options.
+
+    Component: parse_args / Config validation
+    Purpose: 히스토리 보관 정책 옵션이 파싱되고 잘못된 값은 거부되는지 확인
+
+    Expected Results:
+    - Retention is unbounded by default
+    - --history_max_events/--history_max_age are parsed
+    - Non-positive limits raise ValueError
+
+    Test Status: PASS if options are parsed and validated
+    """
+    config = parse_args([])
+    assert config.history_max_events is None
+    assert config.history_max_age is None
+
+    config = parse_args(["--history_max_events", "1000", "--history_max_age", "86400"])
+    assert config.history_max_events == 1000
+    assert config.history_max_age == 86400
+
+    with pytest.raises(ValueError, match="history_max_events must be at least 1"):
+        Config(history_max_events=0)
+    with pytest.raises(ValueError, match="history_max_age must be positive"):
+        Config(history_max_age=0)
+
+
+def test_parse_args_durability():
+    """
+    Test durability option.
+
+    Component: parse_args / Config validation
+    Purpose: --durability 옵션이 파싱되고 지원하지 않는 값은 거부되는지 확인
+
+    Expected Results:
+    - Defaults to on-flush
+    - none/every-write are parsed
+    - Unknown modes raise ValueError
+
+    Test Status: PASS if durability option is parsed and validated
+    """
+    assert parse_args([]).durability == "on-flush"
+    assert parse_args(["--durability", "none"]).durability == "none"
+    assert parse_args(["--durability", "every-write"]).durability == "every-write"
+
+    with pytest.raises(ValueError, match="durability must be one of"):
+        Config(durability="always")
+
+
+def test_parse_args_sessions():
+    """
+    Test session options.
+
+    Component: parse_args / Config validation
+    Purpose: --session_mode, --max_sessions, --session_shards 옵션이 파싱되고 잘못된 값은 거부되는지 확인
+
+    Expected Results:
+    - Defaults to shared mode with 1000 live sessions in 16 shards
+    - isolated mode, max_sessions and session_shards are parsed
+    - Unknown modes and out-of-range bounds raise ValueError
+
+    Test Status: PASS if session options are parsed and validated
+    """
+    config = parse_args([])
+    assert config.session_mode == "shared"
+    assert config.max_sessions == 1000
+    assert config.session_shards == 16
+
+    config = parse_args(["--session_mode", "isolated", "--max_sessions", "5", "--session_shards", "4"])
+    assert config.session_mode == "isolated"
+    assert config.max_sessions == 5
+    assert config.session_shards == 4
+
+    with pytest.raises(ValueError, match="session_mode must be one of"):
+        Config(session_mode="per-user")
+    with pytest.raises(ValueError, match="max_sessions must be at least 1"):
+        Config(max_sessions=0)
+    with pytest.raises(ValueError, match="session_shards must be between 1 and 256"):
+        Config(session_shards=0)
+
+
+def test_parse_args_max_delayed_calls():
+    """
+    Test boss delay queue bound option.
+
+    Component: parse_args / Config validation
+    Purpose: --max_delayed_calls 옵션이 파싱되고 0 이하 값은 거부되는지 확인
+
+    Expected Results:
+    - Defaults to 1000
+    - Custom values are parsed
+    - Values below 1 raise ValueError
+
+    Test Status: PASS if the queue bound is parsed and validated
+    """
+    assert parse_args([]).max_delayed_calls == 1000
+    assert parse_args(["--max_delayed_calls", "10"]).max_delayed_calls == 10
+
+    with pytest.raises(ValueError, match="max_delayed_calls must be at least 1"):
+        Config(max_delayed_calls=0)
+
+
+def test_parse_args_shared_state():
+    """
+    Test multi-process shared state option.
+
+    Component: parse_args / Config validation
+    Purpose: --shared_state 옵션이 파싱되고 함께 쓸 수 없는 설정은 거부되는지 확인
+
+    Expected Results:
+    - Off by default, on with --shared_state
+    - Memory storage and write-behind persistence are rejected
+
+    Test Status: PASS if the option is parsed and validated
+    """
+    assert parse_args([]).shared_state is False
+    assert parse_args(["--shared_state"]).shared_state is True
+
+    with pytest.raises(ValueError, match="shared_state needs a file-backed storage"):
+        Config(shared_state=True, storage="memory")
+    with pytest.raises(ValueError, match="shared_state needs persistence_mode write-through"):
+        Config(shared_state=True, persistence_mode="write-behind")
+
+
+def test_parse_args_checkpoint_interval():
+    """
+    Test state checkpoint interval option.
+
+    Component: parse_args / Config validation
+    Purpose: --checkpoint_interval 옵션이 파싱되고 0 이하 값은 거부되는지 확인
+
+    Expected Results:
+    - Defaults to 1000
+    - Custom values are parsed
+    - Values below 1 raise ValueError
+
+    Test Status: PASS if the interval is parsed and validated
+    """
+    assert parse_args([]).checkpoint_interval == 1000
+    assert parse_args(["--checkpoint_interval", "50"]).checkpoint_interval == 50
+
+    with pytest.raises(ValueError, match="checkpoint_interval must be at least 1"):
+        Config(checkpoint_interval=0)
+
+
+def test_parse_args_notify_window():
+    """
+    Test state notification window option.
+
+    Component: parse_args / Config validation
+    Purpose: --notify_window 옵션이 파싱되고 음수 값은 거부되는지 확인
+
+    Expected Results:
+    - Defaults to 0.1 seconds
+    - Custom values are parsed (0 notifies on the next event loop turn)
+    - Negative values raise ValueError
+
+    Test Status: PASS if the window is parsed and validated
+    """
+    assert parse_args([]).notify_window == 0.1
+    assert parse_args(["--notify_window", "0"]).notify_window == 0.0
+
+    with pytest.raises(ValueError, match="notify_window must not be negative"):
+        Config(notify_window=-1)
+
+
+def test_parse_args_verbosity():
+    """
+    Test response verbosity option.
+
+    Component: parse_args / Config validation
+    Purpose: --verbosity 옵션이 파싱되고 지원하지 않는 값은 거부되는지 확인
+
+    Expected Results:
+    - Defaults to full
+    - compact and minimal are parsed
+    - Unknown levels raise ValueError (Config) or exit (argparse)
+
+    Test Status: PASS if the verbosity is parsed and validated
+    """
+    assert parse_args([]).verbosity == "full"
+    assert parse_args(["--verbosity", "minimal"]).verbosity == "minimal"
+
+    with pytest.raises(ValueError, match="verbosity must be one of"):
+        Config(verbosity="loud")
+    with pytest.raises(SystemExit):
+        parse_args(["--verbosity", "loud"])
+
+
+def test_parse_args_art_pack():
+    """
+    Test ASCII art pack option.
+
+    Component: parse_args
+    Purpose: --art_pack 옵션이 파싱되고 기본값은 기본 아트 팩(None)인지 확인
+
+    Expected Results:
+    - Defaults to None (the default pack)
+    - Pack names and directories are passed through
+
+    Test Status: PASS if the art pack is parsed
+    """
+    assert parse_args([]).art_pack is None
+    assert parse_args(["--art_pack", "./packs/winter"]).art_pack == "./packs/winter"
+
+
+def test_parse_args_response_budget():
+    """
+    Test response budget options.
+
+    Component: parse_args / Config validation
+    Purpose: --max_response_bytes / --max_response_tokens 옵션이 파싱되고 1 미만 값은 거부되는지 확인
+
+    Expected Results:
+    - Both default to None (no budget)
+    - Custom values are parsed
+    - Values below 1 raise ValueError
+
+    Test Status: PASS if the budgets are parsed and validated
+    """
+    config = parse_args([])
+    assert config.max_response_bytes is None and config.max_response_tokens is None
+    config = parse_args(["--max_response_bytes", "2000", "--max_response_tokens", "300"])
+    assert (config.max_response_bytes, config.max_response_tokens) == (2000, 300)
+
+    with pytest.raises(ValueError, match="max_response_bytes must be at least 1"):
+        Config(max_response_bytes=0)
+    with pytest.raises(ValueError, match="max_response_tokens must be at least 1"):
+        Config(max_response_tokens=0)
@@ -0,0 +1,193 @@
+"""
+Tests for history module.
+
+This module tests the columnar in-memory break history:
+- List-like read view (len, indexing, slicing, iteration)
+- Slice deletion used by compaction
+- Aggregates computed directly over the columns
+- Running totals maintained per event
+"""
+
+import json
+import time
+from collections import Counter
+from datetime import datetime
+
+import pytest
+
+from src.history import BreakAggregates, HistoryColumns
+from src.storage import merge_rollups
+
+
+def make_events(count, start=None):
+    """Create `count` events one minute apart, cycling through three tools."""
+    start = start if start is not None else time.time() - count * 60
+    tools = ["take_a_break", "coffee_mission", "chimaek"]
+    return [
+        {
+            "tool_name": tools[i % 3],
+            "timestamp": start + i * 60,
+            "stress_change": -(i % 100),
+            "boss_alert_change": i % 3 - 1,
+        }
+        for i in range(count)
+    ]
+
+
+def test_list_like_view():
+    """
+    Test HistoryColumns reads back exactly like the list of dicts.
+
+    Component: HistoryColumns
+    Purpose: 컬럼 저장소가 기존 dict 리스트와 동일하게 읽히는지 확인
+
+    Expected Results:
+    - len, indexing (incl. negative), slicing and iteration match the list
+    - Tool names are interned (3 tools)
+
+    Test Status: PASS if the view is indistinguishable from the list
+    """
+    events = make_events(10)
+    history = HistoryColumns(events)
+
+    assert len(history) == 10
+    assert history[0] == events[0]
+    assert history[-1] == events[-1]
+    assert history[2:5] == events[2:5]
+    assert list(history) == events
+    assert history == events
+    assert "3 tools" in repr(history)
+
+    with pytest.raises(IndexError):
+        history[10]
+
+
+def test_delete_oldest():
+    """
+    Test deleting the oldest events (as compaction does).
+
+    Component: HistoryColumns.__delitem__()
+    Purpose: 압축 시 사용하는 앞부분 슬라이스 삭제가 모든 컬럼에 적용되는지 확인
+
+    Expected Results:
+    - Remaining events are the newest ones, in order
+
+    Test Status: PASS if columns stay aligned after deletion
+    """
+    events = make_events(10)
+    history = HistoryColumns(events)
+
+    del history[:4]
+    assert history == events[4:]
+
+
+def test_aggregates_match_counters():
+    """
+    Test column aggregates match Counters built from the dicts.
+
+    Component: HistoryColumns.count() / tool_counts() / hour_counts()
+    Purpose: 컬럼 기반 집계가 기존 Counter 기반 집계와 동일한지 확인
+
+    Expected Results:
+    - Totals, per-tool and per-hour counts are identical
+    - Time-range counts use the sorted timestamp column
+
+    Test Status: PASS if all aggregates agree
+    """
+    events = make_events(500)
+    history = HistoryColumns(events)
+
+    assert history.count() == 500
+    assert history.tool_counts() == Counter(e["tool_name"] for e in events)
+    assert list(history.tool_counts()) == ["take_a_break", "coffee_mission", "chimaek"]
+    assert history.hour_counts() == Counter(datetime.fromtimestamp(e["timestamp"]).hour for e in events)
+
+    start, end = events[100]["timestamp"], events[200]["timestamp"]
+    assert history.count(start, end) == 100
+    assert history.tool_counts(start, end) == Counter(e["tool_name"] for e in events[100:200])
+
+
+def test_memory_per_event():
+    """
+    Test the columns use a small, fixed number of bytes per event.
+
+    Component: HistoryColumns.nbytes()
+    Purpose: 이벤트당 메모리 사용량이 dict 대비 크게 줄었는지 확인
+
+    Expected Results:
+    - Less than 32 bytes per event (1 + 8 + 2 + 1 for the break, 1 + 1 + 8 + 8
+      for the levels it left behind, plus array over-allocation)
+
+    Test Status: PASS if memory per event stays small
+    """
+    history = HistoryColumns(make_events(10000))
+    assert history.nbytes() / len(history) < 32
+
+
+def test_break_aggregates_match_history():
+    """
+    Test running totals equal totals rebuilt from history and rollups.
+
+    Component: BreakAggregates
+    Purpose: 이벤트마다 갱신한 누적 통계가 히스토리 전체 재계산 결과와 같은지 확인
+
+    Expected Results:
+    - Incremental and rebuilt totals agree, including compacted events
+    - Totals survive a to_dict()/from_dict() round trip
+
+    Test Status: PASS if all totals match
+    """
+    events = make_events(500)
+    incremental = BreakAggregates()
+    for event in events:
+        incremental.add(event)
+
+    rebuilt = BreakAggregates.from_history(HistoryColumns(events[200:]), merge_rollups([], events[:200]))
+    restored = BreakAggregates.from_dict(json.loads(json.dumps(incremental.to_dict())))
+
+    for totals in (rebuilt, restored):
+        assert totals.total == 500
+        assert totals.tool_counts == incremental.tool_counts
+        assert totals.hour_counts == incremental.hour_counts
+        assert totals.stress_change == sum(e["stress_change"] for e in events)
+        assert totals.boss_alert_change == incremental.boss_alert_change
+
+
+def test_query_pages_by_time_and_tool():
+    """
+    Test time-window queries with a tool filter and cursor pagination.
+
+    Component: HistoryColumns.query()
+    Purpose: 타임스탬프 이진 탐색과 도구별 위치 목록으로 구간 조회/페이지네이션이 되는지 확인
+
+    Expected Results:
+    - Pages cover exactly the matching events, in order, without gaps
+    - Cursors stay valid after the oldest events are compacted away
+
+    Test Status: PASS if paged results equal a full scan
+    """
+    events = make_events(1000)
+    history = HistoryColumns(events)
+    start, end = events[100]["timestamp"], events[700]["timestamp"]
+
+    def scan(tool_name=None):
+        return [
+            e for e in events
+            if start <= e["timestamp"] < end and tool_name in (None, e["tool_name"])
+        ]
+
+    for tool_name in (None, "chimaek", "unknown_tool"):
+        collected, cursor = [], None
+        while True:
+            page, cursor = history.query(start, end, tool_name, cursor, limit=64)
+            collected.extend(page)
+            if cursor is None:
+                break
+        assert [{k: v for k, v in e.items() if k != "seq"} for e in collected] == scan(tool_name)
+
+    page, cursor = history.query(start, end, "chimaek", limit=10)
+    del history[:100]  # compact everything before the window
+    rest, _ = history.query(start, end, "chimaek", cursor, limit=1000)
+    assert [e["seq"] for e in page + rest] == [
+        i for i, e in enumerate(events) if e in scan("chimaek")
+    ]
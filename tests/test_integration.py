@@ -12,14 +12,19 @@ Tests are organized by README requirements:
 - Test 5 (REQUIRED): Response parsing
 - Test 6 (REQUIRED): Boss alert cooldown
 
-Additional tests verify boundary conditions and full scenarios.
+Additional tests verify boundary conditions, full scenarios,
+structured tool results, shutdown and session ids over MCP.
 """
 
 import asyncio
 import pytest
 import re
-import time
+from fastmcp import Client, FastMCP
+from fastmcp.exceptions import ToolError
+from mcp.types import SubscribeRequestParams
 from src.config import Config, parse_args
+from src.response_formatter import RESPONSE_SCHEMA
+from src.server import add_request_handler, create_server
 from src.state_manager import StateManager
 from src import tools
 
@@ -102,7 +107,7 @@ async def test_command_line_arguments():
 
 
 @pytest.mark.asyncio
-async def test_continuous_break_sequence():
+async def test_continuous_break_sequence(clock):
     """
     ═══════════════════════════════════════════════════════════
     Test 2 (REQUIRED): Continuous break test
@@ -130,7 +135,7 @@ async def test_continuous_break_sequence():
     """
     # Setup: 100% alertness to guarantee boss notices
     config = Config(boss_alertness=100, boss_alertness_cooldown=300)
-    state_manager = StateManager(config)
+    state_manager = StateManager(config, clock=clock)
     state_manager._stress_level = 50
 
     initial_boss_alert = state_manager.boss_alert_level
@@ -147,7 +152,7 @@ async def test_continuous_break_sequence():
 
 
 @pytest.mark.asyncio
-async def test_stress_accumulation():
+async def test_stress_accumulation(clock):
     """
     ═══════════════════════════════════════════════════════════
     Test 3 (REQUIRED): Stress accumulation test
@@ -174,13 +179,13 @@ async def test_stress_accumulation():
     """
     # Setup: no boss interference
     config = Config(boss_alertness=0, boss_alertness_cooldown=300)
-    state_manager = StateManager(config)
-
-    # Simulate 3 minutes of work
-    state_manager._last_stress_update = time.time() - 180  # 180 seconds = 3 minutes
+    state_manager = StateManager(config, clock=clock)
 
     initial_stress = state_manager.stress_level
 
+    # Simulate 3 minutes of work
+    clock.advance(180)  # 180 seconds = 3 minutes
+
     # Update stress based on elapsed time
     await state_manager.update_stress_level()
 
@@ -189,7 +194,7 @@ async def test_stress_accumulation():
 
 
 @pytest.mark.asyncio
-async def test_delay_at_boss_alert_5():
+async def test_delay_at_boss_alert_5(clock):
     """
     ═══════════════════════════════════════════════════════════
     Test 4 (REQUIRED): Boss Alert Level 5 delay test
@@ -217,14 +222,14 @@ async def test_delay_at_boss_alert_5():
     """
     # Setup: boss alert at maximum
     config = Config(boss_alertness=0, boss_alertness_cooldown=300)
-    state_manager = StateManager(config)
+    state_manager = StateManager(config, clock=clock)
     state_manager._boss_alert_level = 5
     state_manager._stress_level = 50
 
-    # Measure execution time
-    start_time = time.time()
+    # Measure execution time (virtual: the wait takes no real time)
+    start_time = clock.monotonic()
     response = await tools.take_a_break(state_manager)
-    elapsed_time = time.time() - start_time
+    elapsed_time = clock.monotonic() - start_time
 
     # Validate response
     is_valid, stress, boss_alert, msg = validate_response(response)
@@ -235,7 +240,7 @@ async def test_delay_at_boss_alert_5():
 
 
 @pytest.mark.asyncio
-async def test_response_parsing():
+async def test_response_parsing(clock):
     """
     ═══════════════════════════════════════════════════════════
     Test 5 (REQUIRED): Response parsing test
@@ -270,7 +275,7 @@ async def test_response_parsing():
     """
     # Setup
     config = Config(boss_alertness=50, boss_alertness_cooldown=300)
-    state_manager = StateManager(config)
+    state_manager = StateManager(config, clock=clock)
     state_manager._stress_level = 75
 
     # List of all tools to test
@@ -295,7 +300,7 @@ async def test_response_parsing():
 
 
 @pytest.mark.asyncio
-async def test_boss_alert_cooldown():
+async def test_boss_alert_cooldown(clock):
     """
     ═══════════════════════════════════════════════════════════
     Test 6 (REQUIRED): Boss alert cooldown test
@@ -322,11 +327,11 @@ async def test_boss_alert_cooldown():
     """
     # Setup: fast cooldown for testing
     config = Config(boss_alertness=0, boss_alertness_cooldown=5)  # 5 second cooldown
-    state_manager = StateManager(config)
+    state_manager = StateManager(config, clock=clock)
     state_manager._boss_alert_level = 3
 
     # Simulate 10 seconds elapsed (2 cooldown periods)
-    state_manager._last_boss_cooldown = time.time() - 10
+    clock.advance(10)
 
     # Apply cooldown
     await state_manager.update_boss_cooldown()
@@ -336,7 +341,7 @@ async def test_boss_alert_cooldown():
 
 
 @pytest.mark.asyncio
-async def test_boss_alertness_probability():
+async def test_boss_alertness_probability(clock):
     """
     ═══════════════════════════════════════════════════════════
     Additional Test: Boss alertness probability verification
@@ -364,7 +369,7 @@ async def test_boss_alertness_probability():
     """
     # Test Case 1: 100% alertness - boss always notices
     config_high = Config(boss_alertness=100, boss_alertness_cooldown=300)
-    state_manager_high = StateManager(config_high)
+    state_manager_high = StateManager(config_high, clock=clock)
 
     increased_count = 0
     for _ in range(10):
@@ -378,7 +383,7 @@ async def test_boss_alertness_probability():
 
     # Test Case 2: 0% alertness - boss never notices
     config_low = Config(boss_alertness=0, boss_alertness_cooldown=300)
-    state_manager_low = StateManager(config_low)
+    state_manager_low = StateManager(config_low, clock=clock)
 
     increased_count = 0
     for _ in range(10):
@@ -390,7 +395,7 @@ async def test_boss_alertness_probability():
 
 
 @pytest.mark.asyncio
-async def test_stress_level_bounds():
+async def test_stress_level_bounds(clock):
     """
     ═══════════════════════════════════════════════════════════
     Additional Test: Stress level boundary verification
@@ -417,11 +422,11 @@ async def test_stress_level_bounds():
     Test Status: PASS if both bounds are respected
     """
     config = Config(boss_alertness=0, boss_alertness_cooldown=300)
-    state_manager = StateManager(config)
+    state_manager = StateManager(config, clock=clock)
 
     # Test Case 1: Upper bound (ceiling at 100)
     state_manager._stress_level = 95
-    state_manager._last_stress_update = time.time() - 600  # 10 minutes ago
+    clock.advance(600)  # 10 minutes later
     await state_manager.update_stress_level()
     assert state_manager.stress_level <= 100, f"Stress exceeded ceiling: {state_manager.stress_level}"
 
@@ -432,7 +437,7 @@ async def test_stress_level_bounds():
 
 
 @pytest.mark.asyncio
-async def test_boss_alert_level_bounds():
+async def test_boss_alert_level_bounds(clock):
     """
     ═══════════════════════════════════════════════════════════
     Additional Test: Boss alert level boundary verification
@@ -459,7 +464,7 @@ async def test_boss_alert_level_bounds():
     Test Status: PASS if both bounds are respected
     """
     config = Config(boss_alertness=100, boss_alertness_cooldown=1)
-    state_manager = StateManager(config)
+    state_manager = StateManager(config, clock=clock)
 
     # Test Case 1: Upper bound (ceiling at 5)
     for _ in range(10):
@@ -468,13 +473,13 @@ async def test_boss_alert_level_bounds():
 
     # Test Case 2: Lower bound (floor at 0)
     state_manager._boss_alert_level = 2
-    state_manager._last_boss_cooldown = time.time() - 100
+    clock.advance(100)
     await state_manager.update_boss_cooldown()
     assert state_manager.boss_alert_level >= 0, f"Boss alert went below floor: {state_manager.boss_alert_level}"
 
 
 @pytest.mark.asyncio
-async def test_full_scenario():
+async def test_full_scenario(clock):
     """
     ═══════════════════════════════════════════════════════════
     Additional Test: Full integration scenario
@@ -511,7 +516,7 @@ async def test_full_scenario():
     """
     # Setup: realistic scenario
     config = Config(boss_alertness=50, boss_alertness_cooldown=10)
-    state_manager = StateManager(config)
+    state_manager = StateManager(config, clock=clock)
 
     # Start with high stress (typical stressed agent)
     state_manager._stress_level = 80
@@ -530,3 +535,133 @@ async def test_full_scenario():
     final_state = await state_manager.get_state()
     assert 0 <= final_state["stress_level"] <= 100, f"Final stress out of range: {final_state['stress_level']}"
     assert 0 <= final_state["boss_alert_level"] <= 5, f"Final boss alert out of range: {final_state['boss_alert_level']}"
+
+
+@pytest.mark.asyncio
+async def test_structured_tool_results():
+    """
+    Test structured tool results over MCP.
+
+    Component: create_server / every tool
+    Purpose: 모든 도구가 출력 스키마를 선언하고, 텍스트와 같은 값의 구조화된 결과를 함께 반환하는지 확인
+
+    Expected Results:
+    - Every tool declares RESPONSE_SCHEMA as its output schema
+    - Each call returns structured content with the required fields
+    - Summary and levels match the parseable lines of the text
+
+    Test Status: PASS if clients can skip regex parsing
+    """
+    server = create_server(Config(boss_alertness=0, storage="memory"))
+    async with Client(server) as client:
+        listed = await client.list_tools()
+        assert listed and all(tool.output_schema == RESPONSE_SCHEMA for tool in listed)
+
+        arguments = {"state_at": {"at": "2000-01-01T00:00:00"}}
+        for tool in listed:
+            result = await client.call_tool(tool.name, arguments.get(tool.name, {}))
+            structured = result.structured_content
+            assert set(RESPONSE_SCHEMA["required"]) <= set(structured)
+            assert structured["tool_name"] == tool.name
+
+            is_valid, stress, boss_alert, msg = validate_response(result.content[0].text)
+            assert is_valid, f"{tool.name} - Invalid response: {msg}"
+            assert (structured["stress_level"], structured["boss_alert_level"]) == (stress, boss_alert)
+            assert f"Break Summary: {structured['break_summary']}\n" in result.content[0].text
+
+
+@pytest.mark.asyncio
+async def test_response_budget_over_mcp():
+    """
+    Test response budgets over MCP.
+
+    Component: create_server / max_tokens argument / --max_response_bytes
+    Purpose: 서버 기본 예산과 호출별 max_tokens가 도구 응답 크기에 적용되고 구조화된 결과로 보고되는지 확인
+
+    Expected Results:
+    - The configured byte budget shapes every response
+    - A per-call max_tokens overrides it
+    - The structured result reports the degradation level and bytes saved
+
+    Test Status: PASS if responses stay within the budget
+    """
+    server = create_server(Config(boss_alertness=0, storage="memory", max_response_bytes=400))
+    async with Client(server) as client:
+        result = await client.call_tool("take_a_break", {})
+        text = result.content[0].text
+        assert len(text.encode()) <= 400
+        assert "```" not in text
+        assert result.structured_content["degradation"] in ("tool_art", "progress_bars")
+        assert result.structured_content["bytes_saved"] > 0
+        assert validate_response(text)[0]
+
+        result = await client.call_tool("take_a_break", {"max_tokens": 10_000})
+        assert "```" in result.content[0].text
+        assert result.structured_content["degradation"] == "none"
+
+
+def test_missing_low_level_server_is_reported(monkeypatch):
+    """
+    Test registering protocol handlers on an unsupported FastMCP.
+
+    Component: server.add_request_handler()
+    Purpose: FastMCP 내부 API(_mcp_server.add_request_handler)가 없을 때 명확한 오류로 알려주는지 확인
+
+    Expected Results:
+    - Registering raises RuntimeError naming the missing API and method
+
+    Test Status: PASS if the failure points at the FastMCP version
+    """
+    server = FastMCP("ChillMCP")
+    monkeypatch.setattr(server, "_mcp_server", None)
+    with pytest.raises(RuntimeError, match="resources/subscribe.*add_request_handler"):
+        add_request_handler(server, "resources/subscribe", SubscribeRequestParams, None)
+
+
+@pytest.mark.asyncio
+async def test_shutdown_closes_sessions(tmp_path):
+    """
+    Test server shutdown over MCP.
+
+    Component: create_server lifespan / SessionRegistry.close()
+    Purpose: 서버가 종료될 때 write-behind로 미뤄둔 상태 변경을 저장하고 세션을 닫는지 확인
+
+    Expected Results:
+    - A change still waiting for the write-behind flush is on disk once the server stops
+
+    Test Status: PASS if no change is lost at shutdown
+    """
+    config = Config(
+        boss_alertness=0, storage="json", state_path=str(tmp_path),
+        persistence_mode="write-behind", flush_interval=3600,
+    )
+    server = create_server(config)
+    async with Client(server) as client:
+        await client.call_tool("take_a_break", {})
+        await client.call_tool("chimaek", {})
+
+    state_manager = StateManager(config)
+    assert state_manager.count_history() == 2
+    await state_manager.close()
+
+
+@pytest.mark.asyncio
+async def test_default_client_id_is_rejected_in_isolated_mode():
+    """
+    Test the reserved client id in isolated session mode.
+
+    Component: create_server / isolated_session_key()
+    Purpose: client_id가 "default"인 클라이언트가 공유 세션(루트 상태)에 접근하지 못하는지 확인
+
+    Expected Results:
+    - A tool call with client_id "default" fails instead of using the shared session
+    - Other client ids still get their own session
+
+    Test Status: PASS if isolated clients cannot reach the shared state
+    """
+    server = create_server(Config(boss_alertness=0, storage="memory", session_mode="isolated"))
+    async with Client(server) as client:
+        with pytest.raises(ToolError, match="reserved"):
+            await client.call_tool("chimaek", {}, meta={"client_id": "default"})
+        result = await client.call_tool("take_a_break", {}, meta={"client_id": "alice"})
+        assert result.structured_content["tool_name"] == "take_a_break"
@@ -10,6 +10,7 @@ if sys.platform == 'win32':
     sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
     sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding='utf-8')
 
+from src.clock import VirtualClock
 from src.config import Config
 from src.state_manager import StateManager
 from src import tools
@@ -22,8 +23,9 @@ async def test_new_tools():
     print("="*60)
 
     # Create config and state manager
+    # Virtual clock: boss delays don't take real time
     config = Config(boss_alertness=50, boss_alertness_cooldown=300)
-    state_manager = StateManager(config)
+    state_manager = StateManager(config, clock=VirtualClock(auto_advance=True))
 
     # Test chimaek
     print("\n\n🍗🍺 Testing: chimaek")
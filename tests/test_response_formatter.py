@@ -0,0 +1,300 @@
+"""
+Tests for response_formatter module.
+
+This module tests response rendering:
+- Parseable trailer lines and ASCII art precedence
+- Rendering caches: identical output, hit/miss counters, bounded size
+- Verbosity levels (full, compact, minimal) and the per-call verbosity context
+- Structured results collected alongside the text
+- Response budgets: degradation order, kept trailer lines, metrics
+"""
+
+import pytest
+
+from src import ascii_art
+from src import response_formatter
+from src.response_formatter import (
+    BYTES_PER_TOKEN,
+    RENDER_CACHE_SIZE,
+    budget_bytes,
+    budget_stats,
+    cache_stats,
+    clear_cache,
+    format_response,
+    record_structured,
+    reset_budget_stats,
+    response_budget,
+    response_verbosity,
+    structured_response,
+)
+
+
+@pytest.fixture(autouse=True)
+def empty_cache():
+    """Start every test with empty rendering caches and budget counters."""
+    clear_cache()
+    reset_budget_stats()
+    yield
+    clear_cache()
+    reset_budget_stats()
+
+
+def test_response_sections():
+    """
+    Test response contents.
+
+    Component: format_response
+    Purpose: 응답에 요약, 상태 바, ASCII 아트, 파싱용 마지막 3줄이 올바르게 들어가는지 확인
+
+    Expected Results:
+    - The response ends with the Break Summary / Stress Level / Boss Alert Level lines
+    - Tool art and boss art (level 3+) are shown, strike art replaces both at stress 100
+    - Custom art replaces the tool art; show_ascii_art=False drops every art block
+    - Out-of-range levels are clamped
+
+    Test Status: PASS if every section follows the rules
+    """
+    response = format_response("Coffee time", 42, 3, tool_name="coffee_mission", old_boss_alert_level=2)
+    assert response.endswith("---\nBreak Summary: Coffee time\nStress Level: 42\nBoss Alert Level: 3\n")
+    assert "Stress Level: 42% [████░░░░░░]" in response
+    assert ascii_art.get_tool_ascii_art("coffee_mission").strip() in response
+    assert ascii_art.get_boss_state_art(3).strip() in response
+    assert "Boss alert Level 3" in response
+
+    strike = format_response("Strike", 100, 3, tool_name="coffee_mission")
+    assert ascii_art.get_strike_art().strip() in strike
+    assert ascii_art.get_tool_ascii_art("coffee_mission").strip() not in strike
+
+    chimaek_art = ascii_art.get_tool_ascii_art("chimaek")
+    custom = format_response("Dinner", 10, 0, tool_name="coffee_mission", custom_ascii_art=chimaek_art)
+    assert chimaek_art.strip() in custom
+    assert ascii_art.get_tool_ascii_art("coffee_mission").strip() not in custom
+
+    plain = format_response("Plain", 150, 9, tool_name="coffee_mission", show_ascii_art=False)
+    assert "```" not in plain
+    assert plain.endswith("Stress Level: 100\nBoss Alert Level: 5\n")
+
+
+def test_cached_rendering_matches_uncached():
+    """
+    Test rendering cache correctness.
+
+    Component: format_response rendering caches
+    Purpose: 캐시에서 꺼낸 응답이 처음 렌더링한 응답과 똑같은지 확인
+
+    Expected Results:
+    - Repeated calls return identical responses
+    - The second round is served entirely from the caches
+
+    Test Status: PASS if cached responses are identical
+    """
+    calls = [
+        dict(break_summary=f"Break {i}", stress_level=i * 7 % 101, boss_alert_level=i % 6,
+             tool_name=tool, old_boss_alert_level=i % 6 - 1)
+        for i, tool in enumerate(ascii_art.tool_names() + [None, "unknown_tool"])
+    ]
+    first = [format_response(**call) for call in calls]
+    misses = cache_stats()["misses"]
+
+    assert [format_response(**call) for call in calls] == first
+    stats = cache_stats()
+    assert stats["misses"] == misses
+    assert stats["hits"] >= 2 * len(calls)
+
+
+def test_cache_is_bounded():
+    """
+    Test rendering cache bound.
+
+    Component: format_response rendering caches
+    Purpose: 입력이 아무리 많아도 캐시 크기가 상한을 넘지 않는지 확인
+
+    Expected Results:
+    - Unique custom art beyond the bound evicts old entries
+    - Every cache stays within RENDER_CACHE_SIZE entries
+
+    Test Status: PASS if the caches stay bounded
+    """
+    for i in range(RENDER_CACHE_SIZE + 100):
+        format_response("Art", 10, 0, custom_ascii_art=f"art #{i}")
+
+    assert response_formatter._art_section.cache_info().currsize == RENDER_CACHE_SIZE
+    assert cache_stats()["size"] <= 4 * RENDER_CACHE_SIZE
+
+
+def test_verbosity_levels():
+    """
+    Test response verbosity.
+
+    Component: format_response(verbosity=...)
+    Purpose: compact/minimal 응답이 ASCII 아트 없이 파싱용 줄을 유지하며 크기가 크게 줄어드는지 확인
+
+    Expected Results:
+    - compact keeps one status line and the boss warning, drops art, header and bars
+    - minimal is exactly the three parseable lines
+    - With art in the full response, minimal is over 10x and compact over 5x smaller
+    - Unknown levels raise ValueError
+
+    Test Status: PASS if each level renders only its sections
+    """
+    args = dict(break_summary="Coffee time", stress_level=42, boss_alert_level=3,
+                tool_name="coffee_mission", old_boss_alert_level=2)
+    trailer = "Break Summary: Coffee time\nStress Level: 42\nBoss Alert Level: 3\n"
+    full = format_response(**args)
+
+    compact = format_response(**args, verbosity="compact")
+    assert compact.endswith("---\n" + trailer)
+    assert "Boss alert Level 3" in compact
+    assert "Stress 42%" in compact
+    assert "```" not in compact and "█" not in compact and "**AI Agent" not in compact
+
+    minimal = format_response(**args, verbosity="minimal")
+    assert minimal == trailer
+
+    assert len(compact.encode()) * 5 < len(full.encode())
+    assert len(minimal.encode()) * 10 < len(full.encode())
+
+    with pytest.raises(ValueError, match="verbosity must be one of"):
+        format_response(**args, verbosity="loud")
+
+
+def test_response_verbosity_context():
+    """
+    Test the verbosity context.
+
+    Component: response_verbosity
+    Purpose: 호출 단위로 설정한 응답 상세도가 블록 안의 모든 응답에 적용되는지 확인
+
+    Expected Results:
+    - Responses inside the block use its level; an explicit argument still wins
+    - The previous level is restored after the block
+    - Unknown levels raise ValueError
+
+    Test Status: PASS if the context sets the default level
+    """
+    with response_verbosity("minimal"):
+        assert format_response("Break", 10, 0).startswith("Break Summary:")
+        assert "📊" in format_response("Break", 10, 0, verbosity="full")
+    assert "📊" in format_response("Break", 10, 0)
+
+    with pytest.raises(ValueError, match="verbosity must be one of"):
+        with response_verbosity("loud"):
+            pass
+
+
+def test_structured_response():
+    """
+    Test structured result collection.
+
+    Component: structured_response / record_structured
+    Purpose: 텍스트 응답과 같은 값이 구조화된 결과에 담기고, 수집 중이 아닐 때는 아무것도 기록하지 않는지 확인
+
+    Expected Results:
+    - The summary and clamped levels match the parseable lines, at every verbosity
+    - Changes and delay default to zero; recorded fields are added
+    - Nothing is recorded outside the block
+
+    Test Status: PASS if the structured result matches the text
+    """
+    with structured_response("coffee_mission") as structured:
+        response = format_response("Coffee time", 150, 9, tool_name="coffee_mission", verbosity="minimal")
+        record_structured(stress_change=-20)
+
+    assert response == "Break Summary: Coffee time\nStress Level: 100\nBoss Alert Level: 5\n"
+    assert structured == {
+        "tool_name": "coffee_mission",
+        "break_summary": "Coffee time",
+        "stress_level": 100,
+        "boss_alert_level": 5,
+        "stress_change": -20,
+        "boss_alert_change": 0,
+        "delay_applied": 0.0,
+        "degradation": "none",
+        "bytes_saved": 0,
+    }
+    assert set(response_formatter.RESPONSE_SCHEMA["required"]) <= set(structured)
+
+    record_structured(stress_change=-30)
+    format_response("Later", 10, 0)
+    assert structured["stress_change"] == -20
+    assert structured["break_summary"] == "Coffee time"
+
+
+def test_budget_degrades_in_order():
+    """
+    Test response budget degradation.
+
+    Component: format_response(max_bytes=...)
+    Purpose: 예산을 넘는 응답이 Boss 아트 → 도구 아트 → 진행 바 순으로 줄고, 파싱용 3줄은 항상 남는지 확인
+
+    Expected Results:
+    - A budget the full response fits in changes nothing
+    - Tighter budgets drop boss art, then tool art, then the bars, then all but the trailer
+    - Every shaped response fits its budget, except the trailer alone which is always kept
+    - The structured result reports the level and bytes saved
+
+    Test Status: PASS if each step drops only its section
+    """
+    args = dict(break_summary="Coffee time", stress_level=42, boss_alert_level=4,
+                tool_name="coffee_mission", old_boss_alert_level=3)
+    trailer = "Break Summary: Coffee time\nStress Level: 42\nBoss Alert Level: 4\n"
+    tool_art = ascii_art.get_tool_ascii_art("coffee_mission").strip()
+    boss_art = ascii_art.get_boss_state_art(4).strip()
+    full = format_response(**args)
+    size = len(full.encode())
+
+    assert format_response(**args, max_bytes=size) == full
+
+    no_boss = format_response(**args, max_bytes=size - 1)
+    assert boss_art not in no_boss and tool_art in no_boss
+
+    no_art = format_response(**args, max_bytes=len(no_boss.encode()) - 1)
+    assert "```" not in no_art and "█" in no_art and "Boss alert Level 4" in no_art
+
+    with structured_response("coffee_mission") as structured:
+        no_bars = format_response(**args, max_bytes=len(no_art.encode()) - 1)
+    assert "█" not in no_bars and "Stress 42%" in no_bars and "Boss alert Level 4" in no_bars
+    assert no_bars.endswith("---\n" + trailer)
+    assert structured["degradation"] == "progress_bars"
+    assert structured["bytes_saved"] == size - len(no_bars.encode())
+
+    assert format_response(**args, max_bytes=len(no_bars.encode()) - 1) == trailer
+    assert format_response(**args, max_bytes=1) == trailer
+    assert format_response(**args, max_bytes=1, verbosity="compact") == trailer
+
+    for shaped in (no_boss, no_art, no_bars):
+        assert shaped.endswith(trailer)
+
+
+def test_budget_context_and_stats():
+    """
+    Test the budget context and its metrics.
+
+    Component: response_budget / budget_bytes / budget_stats
+    Purpose: 호출 단위 예산이 블록 안의 응답에 적용되고, 단계별 횟수와 절약한 바이트가 집계되는지 확인
+
+    Expected Results:
+    - Token budgets convert at BYTES_PER_TOKEN, the smaller budget wins
+    - Responses inside the block are shaped; outside they are not counted
+    - Counters report responses, degraded responses, levels and bytes saved
+
+    Test Status: PASS if the budget applies and is measured
+    """
+    assert budget_bytes() is None
+    assert budget_bytes(max_tokens=100) == 100 * BYTES_PER_TOKEN
+    assert budget_bytes(max_bytes=50, max_tokens=100) == 50
+    with pytest.raises(ValueError, match="max_tokens must be at least 1"):
+        budget_bytes(max_tokens=0)
+
+    full = format_response("Break", 10, 0, tool_name="take_a_break")
+    with response_budget(budget_bytes(max_tokens=40)):
+        shaped = format_response("Break", 10, 0, tool_name="take_a_break")
+        unshaped = format_response("Break", 10, 0, tool_name="take_a_break", max_bytes=10_000)
+    assert len(shaped.encode()) <= 40 * BYTES_PER_TOKEN < len(full.encode())
+    assert unshaped == full
+    assert format_response("Break", 10, 0, tool_name="take_a_break") == full
+
+    stats = budget_stats()
+    assert stats["responses"] == 2 and stats["degraded"] == 1
+    assert stats["levels"]["none"] == 1
+    assert stats["bytes_saved"] == len(full.encode()) - len(shaped.encode())
@@ -0,0 +1,181 @@
+"""
+Tests for scheduler module.
+
+This module tests the boss-delay queue:
+- Release order by due time and arrival
+- Bounded queue with priority displacement
+- Cancellation without partial state updates
+- check_status / leave_work bypassing the queue
+"""
+
+import asyncio
+
+import pytest
+
+from src import tools
+from src.clock import VirtualClock
+from src.config import Config
+from src.scheduler import DelayQueueFull, DelayScheduler
+from src.state_manager import StateManager
+
+
+async def settle():
+    """Let woken tasks (and the scheduler's timer task) run."""
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+@pytest.mark.asyncio
+async def test_calls_are_released_in_order():
+    """
+    Test release order.
+
+    Component: DelayScheduler.wait
+    Purpose: 대기 중인 호출이 만료 시각 순서로, 같은 시각이면 도착 순서로 풀리는지 확인
+
+    Expected Results:
+    - Shorter delays are released first
+    - Among equal due times, earlier arrivals go first whatever their priority
+    - Queue depth and wait time are reported
+
+    Test Status: PASS if calls are released in order with metrics
+    """
+    clock = VirtualClock()
+    scheduler = DelayScheduler(clock=clock)
+    released = []
+
+    async def call(name, delay, priority=0):
+        await scheduler.wait(delay, priority)
+        released.append(name)
+
+    tasks = [
+        asyncio.create_task(call("first", 20)),
+        asyncio.create_task(call("urgent", 20, priority=1)),
+        asyncio.create_task(call("short", 5)),
+    ]
+    await settle()
+    assert scheduler.stats()["depth"] == 3
+
+    clock.advance(5)
+    await settle()
+    assert released == ["short"]
+    assert scheduler.stats()["oldest_wait"] == 5
+
+    clock.advance(15)
+    await asyncio.gather(*tasks)
+
+    assert released == ["short", "first", "urgent"]
+    stats = scheduler.stats()
+    assert stats["depth"] == 0
+    assert stats["max_depth"] == 3
+    assert stats["released"] == 3
+    assert stats["mean_wait"] == pytest.approx(15)
+
+
+@pytest.mark.asyncio
+async def test_full_queue_rejects_or_displaces():
+    """
+    Test the queue bound.
+
+    Component: DelayScheduler.wait
+    Purpose: 대기열이 가득 차면 새 호출은 거절되고, 우선순위가 높으면 가장 낮은 호출을 밀어내는지 확인
+
+    Expected Results:
+    - A call of equal priority is rejected with DelayQueueFull
+    - A higher-priority call displaces the newest lowest-priority waiter
+    - Depth never exceeds max_pending
+
+    Test Status: PASS if the queue stays bounded
+    """
+    clock = VirtualClock()
+    scheduler = DelayScheduler(max_pending=2, clock=clock)
+    first = asyncio.create_task(scheduler.wait(20))
+    second = asyncio.create_task(scheduler.wait(20))
+    await asyncio.sleep(0)
+
+    with pytest.raises(DelayQueueFull):
+        await scheduler.wait(20)
+
+    urgent = asyncio.create_task(scheduler.wait(20, priority=1))
+    await asyncio.sleep(0)
+    assert scheduler.stats()["depth"] == 2
+
+    with pytest.raises(DelayQueueFull, match="displaced"):
+        await second
+    clock.advance(20)
+    await asyncio.gather(first, urgent)
+
+    stats = scheduler.stats()
+    assert stats["max_depth"] == 2
+    assert stats["rejected"] == 2
+    assert stats["released"] == 2
+
+
+@pytest.mark.asyncio
+async def test_cancelled_break_leaves_no_changes():
+    """
+    Test cancelling a delayed break.
+
+    Component: run_break / DelayScheduler
+    Purpose: Boss 대기 중 취소된 휴식이 상태나 히스토리를 바꾸지 않고 대기열에서 빠지는지 확인
+
+    Expected Results:
+    - The break waits in the queue at boss alert level 5
+    - Cancelling it frees the queue slot
+    - Stress, boss alert and history are unchanged
+
+    Test Status: PASS if cancellation is clean
+    """
+    state_manager = StateManager(Config(boss_alertness=0, storage="memory"))
+    state_manager._stress_level = 60
+    state_manager._boss_alert_level = 5
+
+    task = asyncio.create_task(tools.take_a_break(state_manager))
+    await asyncio.sleep(0.01)
+    assert state_manager.scheduler.stats()["depth"] == 1
+
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+
+    stats = state_manager.scheduler.stats()
+    assert stats["depth"] == 0
+    assert stats["cancelled"] == 1
+    assert state_manager.stress_level == 60
+    assert state_manager.boss_alert_level == 5
+    assert state_manager.count_history() == 0
+
+
+@pytest.mark.asyncio
+async def test_status_and_leave_work_bypass_queue():
+    """
+    Test queue bypass.
+
+    Component: tools / DelayScheduler
+    Purpose: 대기열이 가득 차도 상태 확인과 퇴근은 기다리지 않고, 넘친 휴식은 즉시 거절 응답을 받는지 확인
+
+    Expected Results:
+    - A break beyond max_delayed_calls returns immediately with unchanged levels
+    - leave_work completes at once while a break is queued
+    - The queued break is applied after leave_work, without the wait being lost
+
+    Test Status: PASS if status and leave_work are never queued
+    """
+    state_manager = StateManager(Config(boss_alertness=0, storage="memory", max_delayed_calls=1))
+    state_manager._boss_alert_level = 5
+
+    queued = asyncio.create_task(tools.take_a_break(state_manager))
+    await asyncio.sleep(0.01)
+
+    response = await asyncio.wait_for(tools.show_meme(state_manager), timeout=1)
+    assert "대기 중인 휴식이 너무 많아요" in response
+    assert "Boss Alert Level: 5" in response
+
+    response = await asyncio.wait_for(tools.leave_work(state_manager), timeout=1)
+    assert "Boss Alert Level: 0" in response
+    assert (await state_manager.get_state())["boss_alert_level"] == 0
+    assert state_manager.scheduler.stats()["depth"] == 1
+
+    queued.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await queued
+    assert state_manager.count_history() == 1
@@ -0,0 +1,311 @@
+"""
+Tests for sessions module.
+
+This module tests the per-session state registry:
+- Isolation between sessions
+- LRU eviction with hibernation to storage and lazy rehydration
+- Session directories and the default session
+- Sharding of the session map
+"""
+
+import asyncio
+import threading
+
+import pytest
+
+from src import tools
+from src.config import Config
+from src.sessions import DEFAULT_SESSION, SESSIONS_DIRNAME, SessionRegistry
+from src.state_manager import StateManager
+
+
+@pytest.fixture
+def config(tmp_path):
+    """Create a configuration with JSON snapshots in a temporary directory."""
+    return Config(boss_alertness=0, storage="json", state_path=str(tmp_path), session_mode="isolated")
+
+
+@pytest.mark.asyncio
+async def test_sessions_are_isolated(config):
+    """
+    Test that sessions don't share state.
+
+    Component: SessionRegistry
+    Purpose: 세션마다 독립된 스트레스/히스토리를 가지는지 확인
+
+    Expected Results:
+    - A break in one session doesn't change another session
+    - Each session has its own history
+
+    Test Status: PASS if sessions are independent
+    """
+    registry = SessionRegistry(config)
+
+    async with registry.session("agent-a") as manager:
+        manager._stress_level = 80
+    async with registry.session("agent-b") as manager:
+        manager._stress_level = 80
+        await tools.take_a_break(manager)
+
+    assert registry.get("agent-a").stress_level == 80
+    assert registry.get("agent-b").stress_level < 80
+    assert registry.get("agent-a").count_history() == 0
+    assert registry.get("agent-b").count_history() == 1
+    await registry.close()
+
+
+@pytest.mark.asyncio
+async def test_lru_eviction_hibernates_and_rehydrates(config):
+    """
+    Test LRU eviction.
+
+    Component: SessionRegistry
+    Purpose: 최대 세션 수를 넘으면 가장 오래 안 쓴 세션이 저장 후 해제되고, 다시 호출하면 복원되는지 확인
+
+    Expected Results:
+    - Live sessions never exceed max_sessions
+    - The least recently used session is hibernated first
+    - A hibernated session comes back with its levels and history
+
+    Test Status: PASS if evicted sessions are restored from storage
+    """
+    registry = SessionRegistry(config, max_sessions=2, shards=1)
+
+    async with registry.session("agent-a") as manager:
+        manager._stress_level = 70
+        await tools.take_a_break(manager)
+        stress = manager.stress_level
+    async with registry.session("agent-b"):
+        pass
+    registry.get("agent-a")  # agent-b is now least recently used
+    async with registry.session("agent-c"):
+        pass
+
+    assert len(registry) == 2
+    assert "agent-b" not in registry
+    assert "agent-a" in registry
+
+    async with registry.session("agent-d"):
+        pass
+    assert "agent-a" not in registry
+    assert registry.hibernations == 2
+
+    async with registry.session("agent-a") as manager:
+        assert manager.stress_level == stress
+        assert manager.count_history() == 1
+    assert len(registry) == 2
+    await registry.close()
+
+
+@pytest.mark.asyncio
+async def test_sessions_in_use_are_not_evicted(config):
+    """
+    Test that sessions in use are pinned.
+
+    Component: SessionRegistry.session
+    Purpose: 호출 중인 세션은 한도를 넘어도 해제되지 않고 호출이 끝난 뒤 정리되는지 확인
+
+    Expected Results:
+    - A session in use survives eviction
+    - The registry shrinks back to the bound after the call ends
+
+    Test Status: PASS if pinned sessions are kept until released
+    """
+    registry = SessionRegistry(config, max_sessions=1, shards=1)
+
+    async with registry.session("agent-a") as manager:
+        async with registry.session("agent-b"):
+            assert "agent-a" in registry
+            assert "agent-b" in registry
+        manager._stress_level = 10
+    assert len(registry) == 1
+    await registry.close()
+
+
+@pytest.mark.asyncio
+async def test_hibernation_runs_off_the_event_loop(config, monkeypatch):
+    """
+    Test where evicted sessions are flushed.
+
+    Component: SessionRegistry eviction / StateManager.hibernate()
+    Purpose: 세션 해제 시 저장이 샤드 락 밖의 작업 스레드에서 실행되고, 저장이 끝나기 전 다시 열면 저장 완료를 기다리는지 확인
+
+    Expected Results:
+    - hibernate() runs in a worker thread with the shard lock released
+    - Reopening a session whose hibernation is still running waits for it
+    - The reopened session has the state the hibernation stored
+
+    Test Status: PASS if eviction never flushes on the event loop
+    """
+    registry = SessionRegistry(config, max_sessions=1, shards=1)
+    shard = registry.shards[0]
+    loop_thread = threading.get_ident()
+    release = threading.Event()
+    calls = []
+    real_hibernate = StateManager.hibernate
+
+    def hibernate(manager):
+        calls.append((threading.get_ident(), shard.lock.locked()))
+        release.wait(timeout=5)
+        real_hibernate(manager)
+
+    monkeypatch.setattr(StateManager, "hibernate", hibernate)
+
+    async with registry.session("agent-a") as manager:
+        await manager.increase_stress(55)
+    evicting = asyncio.create_task(registry.acquire("agent-b"))
+    while "agent-a" not in shard.hibernating:
+        await asyncio.sleep(0.01)
+    reopening = asyncio.create_task(registry.acquire("agent-a"))
+    await asyncio.sleep(0.05)
+    assert not reopening.done()
+
+    release.set()
+    await evicting
+    manager = await reopening
+    assert manager.stress_level == 55
+    assert calls and all(thread != loop_thread and not locked for thread, locked in calls)
+    await registry.close()
+
+
+@pytest.mark.asyncio
+async def test_memory_sessions_survive_eviction():
+    """
+    Test eviction with the memory backend.
+
+    Component: SessionRegistry
+    Purpose: memory 백엔드에서도 해제된 세션이 상태를 잃지 않는지 확인
+
+    Expected Results:
+    - A rehydrated memory session keeps its levels
+
+    Test Status: PASS if memory sessions are restored
+    """
+    registry = SessionRegistry(Config(storage="memory", session_mode="isolated"), max_sessions=1, shards=1)
+
+    registry.get("agent-a")._stress_level = 42
+    registry.get("agent-b")
+    assert "agent-a" not in registry
+    assert registry.get("agent-a").stress_level == 42
+    await registry.close()
+
+
+def test_session_directories(config, tmp_path):
+    """
+    Test session state locations.
+
+    Component: SessionRegistry.session_dir
+    Purpose: 기본 세션은 기존 상태 경로를, 다른 세션은 해시된 하위 디렉토리를 쓰는지 확인
+
+    Expected Results:
+    - The default session uses the configured state path
+    - Other sessions get distinct directories under sessions/
+    - Client-supplied ids never become path components
+
+    Test Status: PASS if session directories are derived safely
+    """
+    registry = SessionRegistry(config)
+
+    assert registry.session_dir(DEFAULT_SESSION) == tmp_path
+    path = registry.session_dir("../../etc")
+    assert path.parent.parent == tmp_path / SESSIONS_DIRNAME
+    assert path.parent.name == path.name[:2]
+    assert ".." not in path.name
+    assert path != registry.session_dir("agent-b")
+
+
+@pytest.mark.asyncio
+async def test_session_state_survives_shard_count_change(config, tmp_path):
+    """
+    Test changing session_shards between runs.
+
+    Component: SessionRegistry.session_dir
+    Purpose: 샤드 수를 바꿔 재시작해도 세션 상태가 같은 디렉토리에서 복원되는지 확인
+
+    Test Action:
+    - Save a session's state with 16 shards and close
+    - Restart with 4 shards
+    - Move a session directory to the old shard-index layout and restart again
+
+    Expected Results:
+    - The session keeps its stress level after the shard count changes
+    - A directory in the old layout is moved to the new location and loaded
+
+    Test Status: PASS if session state doesn't depend on the shard count
+    """
+    registry = SessionRegistry(config, shards=16)
+    async with registry.session("agent-a") as manager:
+        await manager.increase_stress(42)
+    await registry.close()
+
+    registry = SessionRegistry(config, shards=4)
+    assert registry.get("agent-a").stress_level == 42
+    await registry.close()
+
+    path = registry.session_dir("agent-a")
+    # Old layout: sessions/<shard index>/<digest>, here shard 9 of 16
+    old = path.parent.parent / f"{SessionRegistry(config, shards=16).shard_for('agent-a').index:02x}" / path.name
+    assert old.parent != path.parent
+    old.parent.mkdir(parents=True)
+    path.rename(old)
+    registry = SessionRegistry(config, shards=4)
+    assert registry.get("agent-a").stress_level == 42
+    assert path.is_dir() and not old.exists()
+    await registry.close()
+
+
+@pytest.mark.asyncio
+async def test_sessions_are_sharded(config):
+    """
+    Test sharding of the session map.
+
+    Component: SessionRegistry shards
+    Purpose: 세션이 해시로 여러 샤드에 분산되고, 전체 한도가 유지되는지 확인
+
+    Expected Results:
+    - A session always maps to the same shard
+    - Many sessions spread over every shard
+    - The registry keeps at most max_sessions live
+
+    Test Status: PASS if sessions are spread and bounded per shard
+    """
+    registry = SessionRegistry(config, max_sessions=40, shards=4)
+    assert registry.shard_for("agent-1") is registry.shard_for("agent-1")
+
+    for i in range(200):
+        async with registry.session(f"agent-{i}"):
+            pass
+
+    assert all(len(shard) > 0 for shard in registry.shards)
+    assert sum(len(shard) for shard in registry.shards) == len(registry) == 40
+    assert registry.hibernations == 160
+    await registry.close()
+
+
+@pytest.mark.asyncio
+async def test_concurrent_calls_open_session_once(config):
+    """
+    Test concurrent rehydration.
+
+    Component: SessionRegistry.acquire
+    Purpose: 같은 새 세션에 동시에 호출이 몰려도 상태가 한 번만 로드되는지 확인
+
+    Expected Results:
+    - Every concurrent call gets the same StateManager
+    - Concurrent breaks are all recorded in that session
+
+    Test Status: PASS if a session is opened exactly once
+    """
+    registry = SessionRegistry(config, shards=2)
+
+    async def call():
+        async with registry.session("agent-a") as manager:
+            await tools.take_a_break(manager)
+            return manager
+
+    managers = await asyncio.gather(*(call() for _ in range(10)))
+
+    assert all(manager is managers[0] for manager in managers)
+    assert managers[0].count_history() == 10
+    await registry.flush()
+    await registry.close()
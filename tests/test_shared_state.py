@@ -0,0 +1,218 @@
+"""
+Tests for multi-process shared state.
+
+This module tests optimistic concurrency on the stored state:
+- Version counter and compare-and-swap commits
+- Reload and retry of a transaction that lost a race
+- Growth and cooldown references carried across processes
+- History cursors that stay valid after another process compacts
+- Several processes hammering the same state directory
+"""
+
+import asyncio
+import multiprocessing
+
+import pytest
+
+from src.clock import VirtualClock
+from src.config import Config
+from src.state_manager import StateManager, VersionConflict
+
+pytest.importorskip("fcntl")
+
+
+def shared_config(tmp_path, storage="log"):
+    """Create a shared-state configuration in a temporary directory."""
+    return Config(boss_alertness=0, storage=storage, state_path=str(tmp_path), shared_state=True)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("storage", ["json", "log", "sqlite"])
+async def test_stale_commit_conflicts(tmp_path, storage):
+    """
+    Test compare-and-swap on commit.
+
+    Component: StateManager.transaction (shared_state)
+    Purpose: 다른 프로세스가 먼저 커밋하면 오래된 트랜잭션이 거부되고 롤백되는지 확인
+
+    Expected Results:
+    - Every save increases the stored version
+    - A transaction whose state went stale raises VersionConflict
+    - The stale change is rolled back; the other process's change wins
+
+    Test Status: PASS if stale commits are rejected
+    """
+    a = StateManager(shared_config(tmp_path, storage))
+    b = StateManager(shared_config(tmp_path, storage))
+    version = a.storage.load_version()
+
+    with pytest.raises(VersionConflict):
+        async with a.transaction() as tx:
+            tx.increase_stress(5)
+            await b.increase_stress(10)
+
+    assert a.storage.load_version() == version + 1
+    assert a.stress_level == 0
+    assert (await a.get_state())["stress_level"] == 10
+
+    await a.increase_stress(5)
+    assert (await b.get_state())["stress_level"] == 15
+
+
+@pytest.mark.asyncio
+async def test_atomic_reloads_and_retries(tmp_path):
+    """
+    Test retry after a lost race.
+
+    Component: StateManager.atomic (shared_state)
+    Purpose: 경쟁에서 진 트랜잭션이 최신 상태를 다시 읽고 재실행되는지 확인
+
+    Expected Results:
+    - The mutation runs twice and commits on the second run
+    - Neither process's history event is lost
+
+    Test Status: PASS if the losing transaction is re-applied on fresh state
+    """
+    a = StateManager(shared_config(tmp_path))
+    b = StateManager(shared_config(tmp_path))
+    runs = []
+
+    def apply(tx):
+        if not runs:
+            # Another process commits while this transaction is open
+            b.add_history_event("coffee_mission", -10, 0)
+        runs.append(tx.stress_level)
+        tx.increase_stress(5)
+        tx.add_history_event("take_a_break", 5, 0)
+
+    await a.atomic(apply)
+
+    assert len(runs) == 2
+    assert a.conflicts == 1
+    assert a.count_history() == 2
+    assert StateManager(shared_config(tmp_path)).tool_counts() == {"coffee_mission": 1, "take_a_break": 1}
+
+
+@pytest.mark.asyncio
+async def test_reload_keeps_growth_reference(tmp_path):
+    """
+    Test stress growth across processes.
+
+    Component: StateManager.refresh (shared_state)
+    Purpose: 다른 프로세스가 저장한 상태를 다시 읽어도 시간에 따른 스트레스 증가가 이어지는지 확인
+
+    Expected Results:
+    - Minutes elapsed since the other process's save count toward stress
+
+    Test Status: PASS if the reloaded level keeps growing from the saved reference
+    """
+    clock_a = VirtualClock(start=1_700_000_000)
+    clock_b = VirtualClock(start=1_700_000_000)
+    a = StateManager(shared_config(tmp_path), clock=clock_a)
+    b = StateManager(shared_config(tmp_path), clock=clock_b)
+
+    await a.increase_stress(10)
+    clock_a.advance(150)
+    clock_b.advance(150)
+
+    assert (await b.get_state())["stress_level"] == 12
+
+
+
+@pytest.mark.asyncio
+async def test_history_cursor_survives_reload(tmp_path):
+    """
+    Test query_history cursors across processes.
+
+    Component: StateManager.query_history (shared_state)
+    Purpose: 다른 프로세스가 히스토리를 추가하고 압축한 뒤에도 이전 페이지의 커서로 다음 이벤트부터 이어지는지 확인
+
+    Expected Results:
+    - Sequence numbers count compacted events, so they don't change on reload
+    - The next page starts right after the last event already returned
+
+    Test Status: PASS if no event is skipped or repeated
+    """
+    config = Config(
+        boss_alertness=0, storage="log", state_path=str(tmp_path), shared_state=True, history_max_events=3
+    )
+    a = StateManager(config)
+    b = StateManager(config)
+
+    def record(name):
+        return lambda tx: tx.add_history_event(name, 0, 0)
+
+    for name in ("e0", "e1", "e2"):
+        await a.atomic(record(name))
+    page = a.query_history(limit=2)
+    assert [e["tool_name"] for e in page["events"]] == ["e0", "e1"]
+
+    # Another process appends and compacts the two oldest events away
+    for name in ("e3", "e4"):
+        await b.atomic(record(name))
+    b.compact_history()
+
+    await a.get_state()
+    page = a.query_history(cursor=page["next_cursor"], limit=2)
+    assert [(e["seq"], e["tool_name"]) for e in page["events"]] == [(2, "e2"), (3, "e3")]
+
+
+def _hammer(state_path: str, storage: str, calls: int, barrier, results) -> None:
+    """Worker process: apply `calls` increments to the shared state."""
+    first = [True]
+
+    def apply(tx) -> None:
+        if first:
+            # Every process has loaded the same version before any commits,
+            # so all but one of these first commits conflict
+            first.clear()
+            barrier.wait()
+        tx.increase_stress(1)
+        tx.add_history_event("stress_test", 1, 0)
+
+    async def run() -> int:
+        manager = StateManager(Config(boss_alertness=0, storage=storage, state_path=state_path, shared_state=True))
+        for _ in range(calls):
+            await manager.atomic(apply)
+        manager.hibernate()
+        return manager.conflicts
+
+    results.put(asyncio.run(run()))
+
+
+@pytest.mark.parametrize("storage", ["json", "log", "sqlite"])
+def test_processes_lose_no_updates(tmp_path, storage):
+    """
+    Stress test with several processes.
+
+    Component: StateManager (shared_state)
+    Purpose: 여러 프로세스가 같은 상태 파일을 동시에 수정해도 갱신이 하나도 사라지지 않는지 확인
+
+    Expected Results:
+    - Stress equals the total number of increments
+    - Every history event is stored once and the stored totals agree
+    - Processes that committed on a stale version retried (conflicts counted)
+
+    Test Status: PASS if concurrent processes lose no updates
+    """
+    processes, calls = 4, 25
+    context = multiprocessing.get_context("fork")
+    barrier = context.Barrier(processes)
+    results = context.Queue()
+    workers = [
+        context.Process(target=_hammer, args=(str(tmp_path), storage, calls, barrier, results))
+        for _ in range(processes)
+    ]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join(timeout=60)
+        assert worker.exitcode == 0
+    conflicts = sum(results.get(timeout=5) for _ in workers)
+
+    manager = StateManager(shared_config(tmp_path, storage))
+    assert manager.stress_level == processes * calls
+    assert manager.storage.count_history() == processes * calls
+    assert manager.count_history() == processes * calls
+    assert manager.storage.load_version() >= processes * calls
+    assert conflicts >= processes - 1
@@ -13,10 +13,17 @@ stress and the boss's suspicion level throughout the workday.
 """
 
 import asyncio
+import json
 import pytest
 import time
+from src import statistics, tools
+from src.clock import VirtualClock
 from src.config import Config
 from src.state_manager import StateManager
+from src.storage import DEFAULT_STATE_DIR, HISTORY_FILENAME, STATE_FILENAME
+
+STATE_FILE = DEFAULT_STATE_DIR / STATE_FILENAME
+HISTORY_FILE = DEFAULT_STATE_DIR / HISTORY_FILENAME
 
 
 @pytest.fixture
@@ -26,9 +33,9 @@ def config():
 
 
 @pytest.fixture
-def state_manager(config):
-    """Create a state manager instance."""
-    return StateManager(config)
+def state_manager(config, clock):
+    """Create a state manager instance on a virtual clock."""
+    return StateManager(config, clock=clock)
 
 
 @pytest.mark.asyncio
@@ -136,7 +143,7 @@ async def test_decrease_stress_floor(state_manager):
 
 
 @pytest.mark.asyncio
-async def test_stress_auto_increase(state_manager):
+async def test_stress_auto_increase(state_manager, clock):
     """
     Test automatic stress increase over time.
 
@@ -156,8 +163,8 @@ async def test_stress_auto_increase(state_manager):
 
     Test Status: PASS if stress increased by at least 2
     """
-    # Set last update to 2 minutes ago
-    state_manager._last_stress_update = time.time() - 120
+    # Let 2 minutes pass
+    clock.advance(120)
 
     await state_manager.update_stress_level()
     assert state_manager.stress_level >= 2, f"Expected stress >= 2 after 2 minutes, got {state_manager.stress_level}"
@@ -226,7 +233,7 @@ async def test_boss_alert_max_level(state_manager):
 
 
 @pytest.mark.asyncio
-async def test_boss_alert_cooldown(state_manager):
+async def test_boss_alert_cooldown(state_manager, clock):
     """
     Test boss alert cooldown decreases alert level.
 
@@ -248,14 +255,14 @@ async def test_boss_alert_cooldown(state_manager):
     Test Status: PASS if level is 1 after cooldown
     """
     state_manager._boss_alert_level = 3
-    state_manager._last_boss_cooldown = time.time() - 10  # 10 seconds ago (2 cooldown periods)
+    clock.advance(10)  # 10 seconds (2 cooldown periods)
 
     await state_manager.update_boss_cooldown()
     assert state_manager.boss_alert_level == 1, f"Expected boss alert=1 after cooldown, got {state_manager.boss_alert_level}"
 
 
 @pytest.mark.asyncio
-async def test_boss_alert_cooldown_floor(state_manager):
+async def test_boss_alert_cooldown_floor(state_manager, clock):
     """
     Test boss alert level floor (cannot go below 0).
 
@@ -277,7 +284,7 @@ async def test_boss_alert_cooldown_floor(state_manager):
     Test Status: PASS if level is 0
     """
     state_manager._boss_alert_level = 1
-    state_manager._last_boss_cooldown = time.time() - 20  # 20 seconds ago
+    clock.advance(20)  # 20 seconds (4 cooldown periods)
 
     await state_manager.update_boss_cooldown()
     assert state_manager.boss_alert_level == 0, f"Expected boss alert floor=0, got {state_manager.boss_alert_level}"
@@ -394,3 +401,760 @@ async def test_reset(state_manager):
     await state_manager.reset()
     assert state_manager.stress_level == 0, f"Expected stress=0 after reset, got {state_manager.stress_level}"
     assert state_manager.boss_alert_level == 0, f"Expected boss alert=0 after reset, got {state_manager.boss_alert_level}"
+
+
+@pytest.mark.asyncio
+async def test_history_is_append_only(state_manager):
+    """
+    Test history events are appended to the log instead of the snapshot.
+
+    Component: StateManager.add_history_event()
+    Purpose: 히스토리 이벤트가 JSONL 로그에 한 줄씩 추가되고 스냅샷에는 포함되지 않는지 확인
+
+    Test Action:
+    - Add 3 history events
+
+    Expected Results:
+    - History log has exactly 3 lines
+    - State snapshot contains only stress/boss levels (no history)
+
+    Test Status: PASS if history lives only in the append-only log
+    """
+    for _ in range(3):
+        state_manager.add_history_event("take_a_break", -10, 0)
+
+    with open(HISTORY_FILE) as f:
+        lines = f.readlines()
+    assert len(lines) == 3, f"Expected 3 history lines, got {len(lines)}"
+
+    with open(STATE_FILE) as f:
+        snapshot = json.load(f)
+    assert "history" not in snapshot, "Snapshot should not embed history"
+
+
+@pytest.mark.asyncio
+async def test_history_reload_from_log(config):
+    """
+    Test history is rebuilt from the log on startup.
+
+    Component: StateManager._load_state()
+    Purpose: 재시작 시 로그에서 히스토리를 복원하고, 잘린 마지막 줄은 무시하는지 확인
+
+    Initial Conditions:
+    - 2 events appended, followed by a truncated line (simulated crash)
+
+    Expected Results:
+    - New StateManager loads exactly 2 events
+
+    Test Status: PASS if history survives restart
+    """
+    first = StateManager(config)
+    first.add_history_event("coffee_mission", -20, 1)
+    first.add_history_event("show_meme", -5, 0)
+    with open(HISTORY_FILE, 'a') as f:
+        f.write('{"tool_name": "trunc')
+
+    second = StateManager(config)
+    assert [e["tool_name"] for e in second.history] == ["coffee_mission", "show_meme"]
+
+
+@pytest.mark.asyncio
+async def test_legacy_history_migration(config):
+    """
+    Test history embedded in an old-format state file is migrated to the log.
+
+    Component: StateManager._load_state() migration
+    Purpose: 이전 버전의 상태 파일에 포함된 히스토리가 로그로 이전되는지 확인
+
+    Expected Results:
+    - Levels are restored, history is loaded and written to the log
+    - Snapshot is rewritten without the history key
+
+    Test Status: PASS if legacy history is preserved
+    """
+    legacy = {
+        "stress_level": 30,
+        "boss_alert_level": 2,
+        "history": [
+            {"tool_name": "chimaek", "timestamp": time.time(), "stress_change": -40, "boss_alert_change": 2},
+        ],
+    }
+    with open(STATE_FILE, 'w') as f:
+        json.dump(legacy, f)
+
+    manager = StateManager(config)
+    assert manager.stress_level == 30
+    assert manager.boss_alert_level == 2
+    assert len(manager.history) == 1
+    assert HISTORY_FILE.exists()
+
+    with open(STATE_FILE) as f:
+        assert "history" not in json.load(f)
+
+
+@pytest.mark.asyncio
+async def test_write_behind_coalesces_writes(monkeypatch):
+    """
+    Test write-behind mode coalesces many changes into one flush.
+
+    Component: StateManager write-behind persistence
+    Purpose: write-behind 모드에서 여러 번의 변경이 한 번의 저장으로 합쳐지는지 확인
+
+    Initial Conditions:
+    - persistence_mode=write-behind, flush_interval=0.05s
+
+    Test Action:
+    - Change stress/boss levels and add a history event several times
+
+    Expected Results:
+    - Nothing is written until the flush window closes
+    - Exactly one snapshot write after the window, history log complete
+
+    Test Status: PASS if writes are coalesced
+    """
+    config = Config(persistence_mode="write-behind", flush_interval=0.05, flush_max_changes=1000)
+    clock = VirtualClock()
+    manager = StateManager(config, clock=clock)
+
+    writes = []
+    original_save = manager._save_state
+    monkeypatch.setattr(manager, "_save_state", lambda: (writes.append(1), original_save()))
+
+    await manager.increase_stress(40)
+    await manager.decrease_stress(10)
+    await manager.change_boss_alert(2)
+    manager.add_history_event("take_a_break", -10, 0)
+    manager.add_history_event("show_meme", -5, 1)
+
+    assert writes == [], "No writes expected inside the flush window"
+    assert not HISTORY_FILE.exists(), "History should still be buffered"
+
+    await asyncio.sleep(0)
+    assert writes == [], "Still inside the flush window"
+
+    clock.advance(0.05)
+    await asyncio.sleep(0)
+    await asyncio.sleep(0)
+    assert len(writes) == 1, f"Expected one coalesced write, got {len(writes)}"
+    with open(HISTORY_FILE) as f:
+        assert len(f.readlines()) == 2
+
+    with open(STATE_FILE) as f:
+        snapshot = json.load(f)
+    assert snapshot["stress_level"] == 30
+    assert snapshot["boss_alert_level"] == 2
+    await manager.close()
+
+
+@pytest.mark.asyncio
+async def test_write_behind_flushes_after_max_changes():
+    """
+    Test write-behind mode flushes early once flush_max_changes is reached.
+
+    Component: StateManager write-behind persistence
+    Purpose: 대기 중인 변경이 flush_max_changes에 도달하면 즉시 저장되는지 확인
+
+    Expected Results:
+    - History is on disk right after the 3rd change, without waiting
+
+    Test Status: PASS if the early flush happens
+    """
+    config = Config(persistence_mode="write-behind", flush_interval=60, flush_max_changes=3)
+    manager = StateManager(config)
+
+    for _ in range(3):
+        manager.add_history_event("desk_yoga", -10, 0)
+
+    with open(HISTORY_FILE) as f:
+        assert len(f.readlines()) == 3
+    await manager.close()
+
+
+@pytest.mark.asyncio
+async def test_write_behind_close_flushes_pending():
+    """
+    Test close() flushes pending changes on shutdown.
+
+    Component: StateManager.close()
+    Purpose: 종료 시 대기 중인 변경 사항이 모두 저장되는지 확인
+
+    Expected Results:
+    - Snapshot and history reflect pending changes after close()
+
+    Test Status: PASS if nothing is lost on shutdown
+    """
+    config = Config(persistence_mode="write-behind", flush_interval=60)
+    manager = StateManager(config)
+
+    await manager.increase_stress(25)
+    manager.add_history_event("window_gazing", -5, 0)
+    await manager.close()
+
+    reloaded = StateManager(Config())
+    assert reloaded.stress_level == 25
+    assert len(reloaded.history) == 1
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("kind", ["memory", "json", "log", "sqlite"])
+async def test_history_retention_max_events(kind, tmp_path):
+    """
+    Test history is bounded by history_max_events with exact report totals.
+
+    Component: StateManager.compact_history()
+    Purpose: 보관 개수를 넘는 히스토리가 도구/시간별 집계로 압축되고 리포트 합계는 유지되는지 확인
+
+    Initial Conditions:
+    - history_max_events=10
+
+    Test Action:
+    - Add 30 events and let background compaction run
+
+    Expected Results:
+    - At most 10% over the limit stays in memory and storage
+    - Report totals still count all 30 events
+
+    Test Status: PASS if history is bounded and totals are exact
+    """
+    config = Config(storage=kind, state_path=str(tmp_path), history_max_events=10)
+    manager = StateManager(config)
+
+    for i in range(30):
+        manager.add_history_event("coffee_mission" if i % 3 else "show_meme", -5, 0)
+        await asyncio.sleep(0)
+    await asyncio.sleep(0)
+
+    assert len(manager.history) <= 11, f"History should be bounded, got {len(manager.history)}"
+    assert len(manager.storage.load_history()) == len(manager.history)
+    assert sum(r["count"] for r in manager.rollups) + len(manager.history) == 30
+
+    stats = statistics.get_break_statistics(manager.storage)
+    assert stats["total_breaks"] == 30
+    assert stats["breaks_by_tool"] == {"show_meme": 10, "coffee_mission": 20}
+    await manager.close()
+
+    if kind != "memory":
+        reloaded = StateManager(config)
+        assert statistics.get_break_statistics(reloaded.storage)["total_breaks"] == 30
+        await reloaded.close()
+
+
+@pytest.mark.asyncio
+async def test_history_retention_max_age(monkeypatch):
+    """
+    Test events older than history_max_age are rolled up.
+
+    Component: StateManager.compact_history()
+    Purpose: 보관 기간이 지난 이벤트가 집계로 압축되는지 확인
+
+    Initial Conditions:
+    - history_max_age=3600 (1 hour)
+    - 3 events from 2 hours ago, 2 recent events
+
+    Expected Results:
+    - Only the 2 recent events stay as raw history
+    - Rollups account for the 3 old events
+
+    Test Status: PASS if aged events are compacted
+    """
+    clock = VirtualClock(start=time.time() - 7200)
+    manager = StateManager(Config(storage="memory", history_max_age=3600), clock=clock)
+    for _ in range(3):
+        manager.add_history_event("urgent_call", -5, 1)
+    clock.advance(7200)
+    for _ in range(2):
+        manager.add_history_event("take_a_break", -5, 0)
+    await asyncio.sleep(0)
+    await asyncio.sleep(0)
+
+    assert [e["tool_name"] for e in manager.history] == ["take_a_break", "take_a_break"]
+    assert sum(r["count"] for r in manager.rollups) == 3
+    assert manager.rollups[0]["boss_alert_change"] == 3
+
+
+@pytest.mark.asyncio
+async def test_lazy_history_loading(config, monkeypatch):
+    """
+    Test startup loads only the levels and skips the redundant initial write.
+
+    Component: StateManager.__init__() / history property
+    Purpose: 시작 시 레벨만 읽고, 히스토리는 처음 필요할 때 불러오며, 기존 파일은 다시 쓰지 않는지 확인
+
+    Initial Conditions:
+    - Stored state with stress 35 and 2 history events
+
+    Expected Results:
+    - No history load and no write during startup
+    - History is loaded on first access and on the first history write
+
+    Test Status: PASS if history is loaded lazily
+    """
+    first = StateManager(config)
+    first._stress_level = 35
+    first.add_history_event("show_meme", -5, 0)
+    first.add_history_event("desk_yoga", -5, 0)
+
+    writes = []
+    monkeypatch.setattr(StateManager, "_save_state", lambda self, *events: writes.append(1))
+
+    second = StateManager(config)
+    assert second.stress_level == 35
+    assert not second.history_loaded, "History should not be loaded at startup"
+    assert writes == [], "Existing state should not be rewritten at startup"
+
+    assert len(second.history) == 2
+    assert second.history_loaded
+
+    third = StateManager(config)
+    third.add_history_event("window_gazing", -5, 0)
+    assert third.history_loaded
+    assert len(third.history) == 3
+
+
+@pytest.mark.asyncio
+async def test_report_without_loading_history(tmp_path):
+    """
+    Test reports use storage aggregates while history is not loaded.
+
+    Component: StateManager.count_history() / tool_counts()
+    Purpose: 히스토리를 불러오지 않은 상태에서는 저장소(SQL) 집계로 리포트를 만드는지 확인
+
+    Expected Results:
+    - Report totals are correct and history stays unloaded
+
+    Test Status: PASS if the report doesn't load history
+    """
+    config = Config(storage="sqlite", state_path=str(tmp_path))
+    first = StateManager(config)
+    for _ in range(3):
+        first.add_history_event("coffee_mission", -10, 0)
+    await first.close()
+
+    second = StateManager(config)
+    stats = statistics.get_break_statistics(second)
+    assert stats["total_breaks"] == 3
+    assert stats["breaks_by_tool"] == {"coffee_mission": 3}
+    assert not second.history_loaded
+    await second.close()
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("kind", ["json", "log", "sqlite"])
+async def test_report_uses_running_totals(kind, tmp_path, monkeypatch):
+    """
+    Test all-time reports come from the persisted running totals.
+
+    Component: StateManager.aggregates / statistics.get_break_statistics()
+    Purpose: 리포트가 히스토리나 저장소 집계 없이 누적 통계만으로 만들어지는지 확인
+
+    Expected Results:
+    - Totals survive a restart with the snapshot
+    - The report never reads history or runs storage aggregates
+
+    Test Status: PASS if the report matches without touching history
+    """
+    config = Config(storage=kind, state_path=str(tmp_path))
+    first = StateManager(config)
+    first.add_history_event("show_meme", -10, 1)
+    first.add_history_event("coffee_mission", -20, 0)
+    first.add_history_event("show_meme", -5, 1)
+    await first.close()
+
+    second = StateManager(config)
+
+    def fail(*args, **kwargs):
+        raise AssertionError("report should not query history")
+
+    for method in ("load_history", "count_history", "tool_counts", "hour_counts", "change_totals"):
+        monkeypatch.setattr(second.storage, method, fail)
+
+    stats = statistics.get_break_statistics(second)
+    assert stats["total_breaks"] == 3
+    assert stats["breaks_by_tool"] == {"show_meme": 2, "coffee_mission": 1}
+    assert stats["total_stress_relieved"] == 35
+    assert stats["total_boss_alert_change"] == 2
+    assert not second.history_loaded
+    monkeypatch.undo()
+    await second.close()
+
+
+@pytest.mark.asyncio
+async def test_stale_running_totals_are_rebuilt(tmp_path):
+    """
+    Test totals are rebuilt when the snapshot lags the history log.
+
+    Component: StateManager._load_history()
+    Purpose: 로그 추가 후 스냅샷 저장 전에 중단된 경우 누적 통계를 히스토리로부터 다시 계산하는지 확인
+
+    Expected Results:
+    - An event appended without a snapshot save is counted once history loads
+
+    Test Status: PASS if totals match the log
+    """
+    config = Config(state_path=str(tmp_path))
+    first = StateManager(config)
+    first.add_history_event("show_meme", -10, 0)
+    # Simulate a crash right after the append
+    first.storage.append_history(
+        {"tool_name": "nap", "timestamp": time.time(), "stress_change": -3, "boss_alert_change": 0}
+    )
+
+    second = StateManager(config)
+    assert len(second.history) == 2
+    assert second.count_history() == 2
+    assert second.tool_counts() == {"show_meme": 1, "nap": 1}
+
+
+@pytest.mark.asyncio
+async def test_tool_call_is_one_transaction(monkeypatch):
+    """
+    Test a break tool takes the lock once and writes once.
+
+    Component: StateManager.transaction() / tools.execute_break_tool()
+    Purpose: 도구 호출 한 번이 하나의 트랜잭션(락 1회, 저장 1회)으로 처리되는지 확인
+
+    Expected Results:
+    - One lock acquisition and one storage commit per call
+    - The committed levels and history event match the response
+
+    Test Status: PASS if each call is a single unit of work
+    """
+    manager = StateManager(Config(boss_alertness=100, storage="memory"))
+    manager._stress_level = 80
+
+    acquisitions = []
+    original_acquire = manager._lock.acquire
+
+    async def counting_acquire():
+        acquisitions.append(1)
+        return await original_acquire()
+
+    commits = []
+    original_commit = manager.storage.commit
+    monkeypatch.setattr(manager._lock, "acquire", counting_acquire)
+    monkeypatch.setattr(
+        manager.storage, "commit", lambda *args: (commits.append(args), original_commit(*args))
+    )
+
+    await tools.take_a_break(manager)
+    assert len(acquisitions) == 1
+    assert len(commits) == 1
+    stress, boss, _, events, *_ = commits[0]
+    expected_stress = max(0, 80 + events[0]["stress_change"])
+    assert (stress, boss) == (manager.stress_level, manager.boss_alert_level) == (expected_stress, 1)
+
+
+@pytest.mark.asyncio
+async def test_concurrent_tool_calls_are_atomic():
+    """
+    Test concurrent break tools don't interleave.
+
+    Component: StateManager.transaction()
+    Purpose: 동시에 여러 도구를 호출해도 각 호출이 원자적으로 적용되는지 확인
+
+    Expected Results:
+    - Every call records one event
+    - Final stress equals the start value plus all recorded changes
+
+    Test Status: PASS if no update is lost
+    """
+    manager = StateManager(Config(boss_alertness=0, storage="memory"))
+    manager._stress_level = 100
+
+    await asyncio.gather(*(tools.take_a_break(manager) for _ in range(11)),
+                         *(tools.desk_yoga(manager) for _ in range(11)))
+
+    # Replay the recorded deltas in commit order, clamping like the setter does
+    expected = 100
+    for event in manager.history:
+        expected = max(0, min(100, expected + event["stress_change"]))
+    assert len(manager.history) == 22
+    assert manager.stress_level == expected
+
+
+@pytest.mark.asyncio
+async def test_transaction_rolls_back_on_error():
+    """
+    Test a failing transaction leaves state and storage untouched.
+
+    Component: StateManager.transaction()
+    Purpose: 트랜잭션 중 예외가 발생하면 레벨과 히스토리가 원래대로 돌아가는지 확인
+
+    Expected Results:
+    - Levels are restored, no event is recorded, nothing is written
+
+    Test Status: PASS if the failed transaction has no effect
+    """
+    manager = StateManager(Config(boss_alertness=0))
+    await manager.increase_stress(40)
+
+    with pytest.raises(RuntimeError):
+        async with manager.transaction() as tx:
+            tx.decrease_stress(30)
+            tx.change_boss_alert(2)
+            tx.add_history_event("take_a_break", -30, 2)
+            raise RuntimeError("boom")
+
+    assert (manager.stress_level, manager.boss_alert_level) == (40, 0)
+    assert len(manager.history) == 0
+    with open(STATE_FILE) as f:
+        assert json.load(f)["stress_level"] == 40
+
+
+@pytest.mark.asyncio
+async def test_levels_decay_in_closed_form(monkeypatch):
+    """
+    Test stress growth and boss cooldown are computed on read.
+
+    Component: StateManager._stress_at() / _boss_alert_at()
+    Purpose: 시간 경과에 따른 스트레스/Boss Alert 변화가 읽기 시점에 계산되고 저장을 유발하지 않는지 확인
+
+    Expected Results:
+    - get_state() reflects elapsed time without any write
+    - Fractional minutes/periods carry over after a mutation
+
+    Test Status: PASS if reads are pure and remainders are kept
+    """
+    manager = StateManager(Config(boss_alertness=0, boss_alertness_cooldown=10, storage="memory"))
+    await manager.increase_stress(10)
+    await manager.change_boss_alert(3)
+
+    writes = []
+    monkeypatch.setattr(manager.storage, "commit", lambda *args: writes.append(args))
+
+    now = manager.clock.monotonic()
+    manager._last_stress_update = now - 150  # 2.5 minutes
+    manager._last_boss_cooldown = now - 25  # 2.5 cooldown periods
+    for _ in range(3):
+        assert await manager.get_state() == {"stress_level": 12, "boss_alert_level": 1}
+    assert writes == [], "Reads should not write"
+
+    # A mutation rebases the levels but keeps the half minute / half period
+    await manager.decrease_stress(2)
+    await manager.change_boss_alert(1)
+    assert (manager.stress_level, manager.boss_alert_level) == (10, 2)
+    assert manager._last_stress_update == pytest.approx(now - 30, abs=1)
+    assert manager._last_boss_cooldown == pytest.approx(now - 5, abs=1)
+    assert len(writes) == 2
+
+
+@pytest.mark.asyncio
+async def test_reads_use_published_snapshot():
+    """
+    Test lock-free snapshot reads.
+
+    Component: StateManager.snapshot / get_state()
+    Purpose: 트랜잭션 진행 중에도 상태 조회가 락 없이 마지막 커밋 상태를 읽고, 커밋 시에만 버전이 오르는지 확인
+
+    Expected Results:
+    - get_state() returns at once while a transaction holds the lock
+    - Uncommitted changes are invisible to readers
+    - Each commit publishes one new snapshot version; rollbacks publish nothing
+
+    Test Status: PASS if readers only ever see committed snapshots
+    """
+    manager = StateManager(Config(boss_alertness=0, storage="memory"))
+    await manager.increase_stress(30)
+    version = manager.snapshot.version
+
+    async with manager.transaction() as tx:
+        tx.decrease_stress(20)
+        tx.change_boss_alert(2)
+        await asyncio.sleep(0)
+        state = await asyncio.wait_for(manager.get_state(), timeout=0.1)
+        assert state == {"stress_level": 30, "boss_alert_level": 0}
+        assert manager.snapshot.version == version
+
+    assert await manager.get_state() == {"stress_level": 10, "boss_alert_level": 2}
+    assert manager.snapshot.version == version + 1
+    assert (manager.snapshot.stress_level, manager.snapshot.boss_alert_level) == (10, 2)
+
+    with pytest.raises(RuntimeError):
+        async with manager.transaction() as tx:
+            tx.increase_stress(50)
+            raise RuntimeError("tool failed")
+    assert manager.snapshot.version == version + 1
+    assert await manager.get_state() == {"stress_level": 10, "boss_alert_level": 2}
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("kind", ["memory", "json", "log", "sqlite"])
+async def test_state_at_reconstructs_past_levels(kind, tmp_path):
+    """
+    Test point-in-time reconstruction.
+
+    Component: StateManager.state_at()
+    Purpose: 과거 임의 시점의 스트레스/Boss Alert 수준이 당시 실제로 조회된 값과 정확히 일치하는지 확인
+
+    Test Action:
+    - Mix breaks, direct level changes and idle time (growth and cooldown)
+    - Record get_state() every 17 virtual seconds
+    - Restart the server halfway (growth pauses while it is off)
+
+    Expected Results:
+    - state_at() returns exactly the recorded levels at every observation,
+      before and after the restart
+    - Nothing is returned before the first recorded state
+
+    Test Status: PASS if every observation is reproduced
+    """
+    clock = VirtualClock(start=1_700_000_000)
+    config = Config(boss_alertness=100, boss_alertness_cooldown=90, storage=kind,
+                    state_path=str(tmp_path), checkpoint_interval=4)
+    manager = StateManager(config, clock=clock)
+    before_start = clock.time() - 1
+    observed = []
+
+    async def idle(seconds):
+        for _ in range(seconds // 17):
+            clock.advance(17)
+            observed.append((clock.time(), await manager.get_state()))
+        clock.advance(1)  # state_at includes changes made at exactly the queried time
+
+    for round in range(6):
+        await tools.take_a_break(manager)
+        await idle(100)
+        await tools.coffee_mission(manager)
+        await manager.increase_stress(7)
+        await idle(200)
+
+    if kind != "memory":
+        await manager.close()
+        clock.advance(3600)  # server off: no growth, no cooldown
+        manager = StateManager(config, clock=clock)
+        await idle(150)
+        await tools.watch_netflix(manager)
+        await idle(150)
+
+    for timestamp, state in observed:
+        reconstructed = manager.state_at(timestamp)
+        assert {k: reconstructed[k] for k in state} == state, f"mismatch at {timestamp}"
+        assert reconstructed["as_of"] <= timestamp
+    assert manager.state_at(before_start) is None
+    assert len(manager.checkpoints) >= 6
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("kind", ["json", "log", "sqlite"])
+async def test_plain_restart_writes_nothing(kind, tmp_path):
+    """
+    Test restarts without a state change.
+
+    Component: StateManager._load_state()
+    Purpose: 상태 변화 없이 재시작하면 저장 파일을 다시 쓰거나 체크포인트를 추가하지 않는지 확인
+
+    Test Action:
+    - Take a break and shut down
+    - Restart, read the state and shut down again (twice)
+    - Restart once more and take a break
+
+    Expected Results:
+    - Plain restarts leave every state file's mtime and the checkpoint count unchanged
+    - The restart's checkpoint is stored with the next save, so state_at still sees the pause
+
+    Test Status: PASS if loading is read-only
+    """
+    clock = VirtualClock(start=1_700_000_000)
+    config = Config(boss_alertness=0, storage=kind, state_path=str(tmp_path))
+    manager = StateManager(config, clock=clock)
+    await tools.take_a_break(manager)
+    checkpoints = len(manager.storage.load_checkpoints())
+    await manager.close()
+
+    def files():
+        return {path.name: path.stat().st_mtime_ns for path in tmp_path.iterdir() if path.is_file()}
+
+    written = files()
+    for _ in range(2):
+        clock.advance(600)
+        manager = StateManager(config, clock=clock)
+        await manager.get_state()
+        assert len(manager.storage.load_checkpoints()) == checkpoints
+        await manager.close()
+        assert files() == written
+
+    clock.advance(600)
+    manager = StateManager(config, clock=clock)
+    restarted = clock.time()
+    await tools.take_a_break(manager)
+    stored = manager.storage.load_checkpoints()
+    await manager.close()
+    assert len(stored) > checkpoints
+    assert any(c["timestamp"] == restarted for c in stored)
+
+
+@pytest.mark.asyncio
+async def test_startup_replays_log_ahead_of_levels(tmp_path):
+    """
+    Test the history log is the source of truth after a crash.
+
+    Component: StateManager._load_state()
+    Purpose: 히스토리 로그 추가 후 레벨 스냅샷 저장 전에 죽은 경우, 재시작 시 로그에서 레벨을 복원하는지 확인
+
+    Test Action:
+    - Take a break, then put back the level snapshot from before it
+      (as if the process died between the log append and the snapshot write)
+
+    Expected Results:
+    - The restarted server has the levels the last logged event left behind
+    - Running totals are rebuilt to include that event
+
+    Test Status: PASS if the log wins over the stale snapshot
+    """
+    clock = VirtualClock(auto_advance=True)
+    config = Config(boss_alertness=100, storage="log", state_path=str(tmp_path))
+    manager = StateManager(config, clock=clock)
+    manager._stress_level = 90
+    stale_snapshot = (tmp_path / STATE_FILENAME).read_text()
+
+    clock.advance(5)
+    await tools.take_a_break(manager)
+    expected = await manager.get_state()
+    (tmp_path / STATE_FILENAME).write_text(stale_snapshot)
+
+    restarted = StateManager(config, clock=clock)
+    assert await restarted.get_state() == expected
+    assert restarted.count_history() == 1
+
+
+@pytest.mark.asyncio
+async def test_state_at_survives_compaction(tmp_path):
+    """
+    Test point-in-time reconstruction across compacted history.
+
+    Component: StateManager.state_at() / compact_history()
+    Purpose: 오래된 이벤트가 압축된 뒤에도 남은 구간은 정확히 복원되고, 압축 구간의 오래된 체크포인트는 기준점 하나만 남기고 정리되는지 확인
+
+    Expected Results:
+    - Observations after the last compacted event are reproduced exactly
+    - One checkpoint older than the oldest raw event is kept as the anchor,
+      in memory and in storage; earlier observations return None
+
+    Test Status: PASS if compaction keeps reconstruction exact where raw events remain
+    """
+    clock = VirtualClock(start=1_700_000_000, auto_advance=True)
+    config = Config(boss_alertness=100, storage="log", state_path=str(tmp_path), history_max_events=5)
+    manager = StateManager(config, clock=clock)
+    observed = []
+    for _ in range(12):
+        await tools.take_a_break(manager)
+        clock.advance(45)
+        observed.append((clock.time(), await manager.get_state()))
+        clock.advance(1)
+
+    assert manager.compact_history() > 0
+    oldest_raw = manager.history.timestamps[0]
+    older = [c for c in manager.storage.load_checkpoints() if c["timestamp"] < oldest_raw]
+    assert len(older) == 1
+    assert [c for c in manager.checkpoints if c["timestamp"] < oldest_raw] == older
+    anchor = older[0]["timestamp"]
+    for timestamp, state in observed:
+        reconstructed = manager.state_at(timestamp)
+        if timestamp >= anchor:
+            assert {k: reconstructed[k] for k in state} == state
+        else:
+            assert reconstructed is None
+
+    restarted = StateManager(config, clock=clock)
+    timestamp, state = observed[-1]
+    assert {k: restarted.state_at(timestamp)[k] for k in state} == state
@@ -0,0 +1,439 @@
+"""
+Tests for storage module.
+
+This module tests the storage backends used by StateManager and the
+statistics module:
+- Memory, JSON snapshot, append-log and SQLite backends
+- Automatic migration from the JSON state file and history log
+- Indexed SQL aggregates for reports
+- Atomic snapshot writes and the fsync durability policy
+"""
+
+import json
+import os
+import time
+
+import pytest
+
+from src import statistics, tools
+from src.config import Config
+from src.state_manager import StateManager
+from src import storage as storage_module
+from src.storage import (
+    DEFAULT_STATE_DIR,
+    STATE_FILENAME,
+    AppendLogStorage,
+    JsonSnapshotStorage,
+    MemoryStorage,
+    SQLiteStorage,
+    create_storage,
+)
+
+
+@pytest.fixture
+def sqlite_config():
+    """Create a configuration that uses the SQLite backend."""
+    return Config(boss_alertness=0, storage="sqlite")
+
+
+@pytest.mark.asyncio
+async def test_sqlite_round_trip(sqlite_config):
+    """
+    Test levels and history survive a restart with the SQLite backend.
+
+    Component: StateManager with SQLiteStorage
+    Purpose: SQLite 백엔드에서 레벨과 히스토리가 재시작 후에도 유지되는지 확인
+
+    Expected Results:
+    - Reloaded manager has the same stress, boss alert and history
+
+    Test Status: PASS if state is restored from the database
+    """
+    manager = StateManager(sqlite_config)
+    await manager.increase_stress(40)
+    await manager.change_boss_alert(3)
+    manager.add_history_event("coffee_mission", -15, 1)
+    await manager.close()
+
+    reloaded = StateManager(sqlite_config)
+    assert reloaded.stress_level == 40
+    assert reloaded.boss_alert_level == 3
+    assert [e["tool_name"] for e in reloaded.history] == ["coffee_mission"]
+    assert not (DEFAULT_STATE_DIR / STATE_FILENAME).exists(), "JSON snapshot should not be written"
+    await reloaded.close()
+
+
+@pytest.mark.asyncio
+async def test_sqlite_migrates_json_state(sqlite_config):
+    """
+    Test existing JSON state is migrated into a new database.
+
+    Component: create_storage("sqlite") migration
+    Purpose: 기존 JSON 상태 파일과 히스토리 로그가 SQLite로 자동 이전되는지 확인
+
+    Initial Conditions:
+    - JSON snapshot (stress 55, boss 2) and 2 logged events
+
+    Expected Results:
+    - SQLite-backed manager starts with the migrated levels and history
+
+    Test Status: PASS if nothing is lost in the migration
+    """
+    json_manager = StateManager(Config())
+    json_manager._stress_level = 55
+    json_manager._boss_alert_level = 2
+    json_manager.add_history_event("show_meme", -5, 0)
+    json_manager.add_history_event("chimaek", -40, 2)
+
+    manager = StateManager(sqlite_config)
+    assert manager.stress_level == 55
+    assert manager.boss_alert_level == 2
+    assert len(manager.history) == 2
+    await manager.close()
+
+
+def test_sqlite_migration_is_atomic(tmp_path, monkeypatch):
+    """
+    Test a migration interrupted half-way.
+
+    Component: create_storage("sqlite") / SQLiteStorage.migrate_from()
+    Purpose: 이전 중 실패하면 아무것도 저장되지 않아, 다음 시작 때 전체 이전이 다시 실행되는지 확인
+
+    Initial Conditions:
+    - Log backend with levels, 2 events, rollups and a checkpoint
+
+    Expected Results:
+    - A failure while importing history leaves the database empty
+    - The next create_storage("sqlite") imports everything
+
+    Test Status: PASS if an interrupted migration is retried in full
+    """
+    now = time.time()
+    source = create_storage("log", tmp_path)
+    source.save_levels(55, 2, version=3)
+    source.append_history(
+        {"tool_name": "show_meme", "timestamp": now - 60, "stress_change": -5, "boss_alert_change": 0},
+        {"tool_name": "chimaek", "timestamp": now, "stress_change": -40, "boss_alert_change": 2},
+    )
+    source.compact_history(0, [
+        {"tool_name": "take_a_break", "hour": int(now // 3600) - 5, "count": 3, "stress_change": -15, "boss_alert_change": 0},
+    ])
+    source.append_checkpoint(
+        {"timestamp": now - 30, "stress_level": 50, "boss_alert_level": 2, "since": [now - 30, now - 30], "events": 4}
+    )
+
+    def fail(self, *events):
+        raise OSError("disk full")
+
+    with monkeypatch.context() as patch:
+        patch.setattr(SQLiteStorage, "append_history", fail)
+        storage = create_storage("sqlite", tmp_path)
+        assert storage.is_empty()
+        assert storage.load_levels() is None
+        storage.close()
+
+    storage = create_storage("sqlite", tmp_path)
+    assert storage.load_levels() == source.load_levels()
+    assert storage.load_history() == source.load_history()
+    assert storage.load_rollups() == source.load_rollups()
+    assert storage.load_checkpoints() == source.load_checkpoints()
+    storage.close()
+
+
+@pytest.mark.asyncio
+async def test_sqlite_statistics_match_log(sqlite_config):
+    """
+    Test SQL aggregates produce the same report as the JSONL log.
+
+    Component: statistics.get_break_statistics() with SQLiteStorage
+    Purpose: SQL 집계 결과가 JSONL 로그 기반 통계(기본 구현)와 동일한지 확인
+
+    Expected Results:
+    - total_breaks, most_common_tool, most_common_hour and breaks_by_tool match
+
+    Test Status: PASS if both report paths agree
+    """
+    json_manager = StateManager(Config())
+    for tool_name in ["show_meme", "coffee_mission", "show_meme", "desk_yoga"]:
+        json_manager.add_history_event(tool_name, -10, 0)
+    expected = statistics.get_break_statistics(json_manager.storage)
+
+    manager = StateManager(sqlite_config)
+    actual = statistics.get_break_statistics(manager.storage)
+    assert actual == expected
+    assert actual["breaks_by_tool"] == {"show_meme": 2, "coffee_mission": 1, "desk_yoga": 1}
+    await manager.close()
+
+
+def test_sqlite_time_range_counts(tmp_path):
+    """
+    Test time-range aggregates on the timestamp index.
+
+    Component: SQLiteStorage.count_history() / tool_counts()
+    Purpose: 시간 범위 조건이 있는 집계가 올바르게 동작하는지 확인
+
+    Expected Results:
+    - Only events within [start, end) are counted
+
+    Test Status: PASS if range filters are applied
+    """
+    storage = SQLiteStorage(tmp_path / "state.db")
+    now = time.time()
+    storage.append_history(
+        {"tool_name": "take_a_break", "timestamp": now - 7200, "stress_change": -5, "boss_alert_change": 0},
+        {"tool_name": "urgent_call", "timestamp": now - 60, "stress_change": -5, "boss_alert_change": 1},
+        {"tool_name": "take_a_break", "timestamp": now - 30, "stress_change": -5, "boss_alert_change": 0},
+    )
+
+    assert storage.count_history() == 3
+    assert storage.count_history(start=now - 3600) == 2
+    assert storage.tool_counts(start=now - 3600, end=now - 45) == {"urgent_call": 1}
+    storage.close()
+
+
+@pytest.mark.parametrize("durability, synchronous", [
+    ("none", 1),
+    ("on-flush", 1),
+    ("every-write", 2),
+])
+def test_sqlite_durability_pragmas(durability, synchronous, tmp_path):
+    """
+    Test the SQLite journal and sync settings of each durability mode.
+
+    Component: SQLiteStorage with --durability
+    Purpose: SQLite가 WAL 모드로 열리고 내구성 설정에 맞는 synchronous 값을 쓰는지 확인
+
+    Expected Results:
+    - journal_mode is wal in every mode
+    - synchronous is FULL (2) for every-write and NORMAL (1) otherwise
+    - sync() checkpoints the WAL so committed data reaches the database file
+
+    Test Status: PASS if the pragmas match the mode
+    """
+    storage = SQLiteStorage(tmp_path / "state.db", durability)
+    assert storage._conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    assert storage._conn.execute("PRAGMA synchronous").fetchone()[0] == synchronous
+
+    storage.save_levels(12, 3)
+    storage.sync()
+    busy, wal_frames, checkpointed = storage._conn.execute("PRAGMA wal_checkpoint(PASSIVE)").fetchone()
+    assert busy == 0 and wal_frames == checkpointed
+    storage.close()
+
+
+@pytest.mark.asyncio
+async def test_generate_report_with_sqlite(sqlite_config):
+    """
+    Test generate_report works with the SQLite backend.
+
+    Component: tools.generate_report()
+    Purpose: SQLite 백엔드에서 리포트가 생성되는지 확인
+
+    Expected Results:
+    - Report lists the tools that were used
+
+    Test Status: PASS if report contains the break counts
+    """
+    manager = StateManager(sqlite_config)
+    await tools.take_a_break(manager)
+    await tools.take_a_break(manager)
+
+    response = await tools.generate_report(manager)
+    assert "Total Breaks Taken:** 2" in response
+    assert "take_a_break: 2" in response
+    await manager.close()
+
+
+@pytest.mark.parametrize("kind", ["memory", "json", "log", "sqlite"])
+def test_backend_round_trip(kind, tmp_path):
+    """
+    Test every backend stores levels and history.
+
+    Component: StorageBackend implementations
+    Purpose: 모든 저장소 백엔드가 동일한 인터페이스로 레벨과 히스토리를 저장하는지 확인
+
+    Expected Results:
+    - A new backend is empty
+    - Saved levels and appended events are read back unchanged
+    - Aggregates count the events
+
+    Test Status: PASS if every backend behaves the same
+    """
+    storage = create_storage(kind, tmp_path)
+    assert storage.name == kind
+    assert storage.is_empty()
+
+    event = {"tool_name": "show_meme", "timestamp": time.time(), "stress_change": -7, "boss_alert_change": 1}
+    storage.save_levels(12, 3)
+    storage.append_history(event, dict(event))
+
+    assert storage.load_levels() == {"stress_level": 12, "boss_alert_level": 3}
+    assert storage.load_history() == [event, event]
+    assert storage.count_history() == 2
+    assert storage.tool_counts() == {"show_meme": 2}
+    storage.close()
+
+
+def test_json_version_check_skips_unchanged_snapshot(tmp_path, monkeypatch):
+    """
+    Test the version check of the JSON snapshot backend.
+
+    Component: JsonSnapshotStorage.load_version() / refresh()
+    Purpose: 스냅샷 파일이 바뀌지 않았으면 버전 확인 시 전체 파일을 다시 파싱하지 않는지 확인
+
+    Expected Results:
+    - load_version() doesn't parse the snapshot when nothing changed, not even after its own writes
+    - A write by another instance is picked up on the next check
+
+    Test Status: PASS if only changed snapshots are re-read
+    """
+    reader = JsonSnapshotStorage(tmp_path)
+    writer = JsonSnapshotStorage(tmp_path)
+    writer.save_levels(10, 1, version=1)
+
+    parses = []
+    real_load = json.load
+    monkeypatch.setattr(storage_module.json, "load", lambda f: parses.append(f) or real_load(f))
+
+    assert reader.load_version() == 1
+    assert len(parses) == 1
+    assert reader.load_version() == 1
+    reader.save_levels(20, 2, version=2)
+    assert reader.load_version() == 2
+    assert len(parses) == 1
+
+    writer.refresh()
+    writer.save_levels(30, 3, version=3)
+    assert reader.load_version() == 3
+    assert reader.load_levels()["stress_level"] == 30
+
+
+def test_file_backends_use_state_path(tmp_path):
+    """
+    Test file-based backends write inside the configured state directory.
+
+    Component: create_storage(state_dir=...)
+    Purpose: --state-path로 지정한 디렉토리에 상태 파일이 생성되는지 확인
+
+    Expected Results:
+    - json/log/sqlite write their files under the given directory
+    - Nothing is written to the project root
+
+    Test Status: PASS if state stays inside the directory
+    """
+    for kind in ["json", "log", "sqlite"]:
+        state_dir = tmp_path / kind
+        storage = create_storage(kind, state_dir)
+        storage.save_levels(1, 0)
+        storage.close()
+        assert any(state_dir.iterdir()), f"{kind} backend wrote nothing to {state_dir}"
+
+    assert not (DEFAULT_STATE_DIR / STATE_FILENAME).exists()
+
+
+@pytest.mark.asyncio
+async def test_memory_backend_does_no_io():
+    """
+    Test the memory backend keeps state without touching the filesystem.
+
+    Component: StateManager with MemoryStorage
+    Purpose: memory 백엔드가 파일 I/O 없이 동작하는지 확인 (부하 테스트용)
+
+    Expected Results:
+    - Tools run normally and no state file is created
+
+    Test Status: PASS if no state file exists after tool calls
+    """
+    manager = StateManager(Config(boss_alertness=0, storage="memory"))
+    assert isinstance(manager.storage, MemoryStorage)
+    await tools.take_a_break(manager)
+    assert len(manager.storage.load_history()) == 1
+    assert not (DEFAULT_STATE_DIR / STATE_FILENAME).exists()
+
+
+def test_switching_between_json_backends(tmp_path):
+    """
+    Test history is kept when switching between the json and log backends.
+
+    Component: JsonSnapshotStorage / AppendLogStorage
+    Purpose: json ↔ log 백엔드 전환 시 히스토리가 유지되는지 확인
+
+    Expected Results:
+    - History written by the json backend is migrated into the log
+    - History written by the log backend is picked up by the json backend
+
+    Test Status: PASS if no history is lost either way
+    """
+    event = {"tool_name": "deep_thinking", "timestamp": time.time(), "stress_change": -3, "boss_alert_change": 0}
+
+    snapshot = JsonSnapshotStorage(tmp_path)
+    snapshot.save_levels(5, 1)
+    snapshot.append_history(event)
+
+    log = AppendLogStorage(tmp_path)
+    assert log.load_levels() == {"stress_level": 5, "boss_alert_level": 1}
+    assert log.load_history() == [event]
+    log.append_history(event)
+
+    assert JsonSnapshotStorage(tmp_path).load_history() == [event, event]
+
+
+@pytest.mark.parametrize("kind", ["json", "log"])
+def test_snapshot_survives_failed_write(kind, tmp_path, monkeypatch):
+    """
+    Test an interrupted snapshot write leaves the previous snapshot intact.
+
+    Component: atomic_write (temp file + rename)
+    Purpose: 스냅샷 저장 도중 실패해도 기존 상태 파일이 잘리지 않는지 확인
+
+    Expected Results:
+    - A failing rename raises and the old levels are still readable
+
+    Test Status: PASS if the previous snapshot survives
+    """
+    storage = create_storage(kind, tmp_path)
+    storage.save_levels(30, 2)
+
+    def crash(src, dst):
+        raise OSError("simulated crash")
+
+    monkeypatch.setattr(storage_module.os, "replace", crash)
+    with pytest.raises(OSError):
+        storage.save_levels(99, 5)
+    monkeypatch.undo()
+
+    assert create_storage(kind, tmp_path).load_levels() == {"stress_level": 30, "boss_alert_level": 2}
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("durability, writes_synced, flush_synced", [
+    ("none", False, False),
+    ("on-flush", False, True),
+    ("every-write", True, False),
+])
+async def test_durability_modes(durability, writes_synced, flush_synced, tmp_path, monkeypatch):
+    """
+    Test when each durability mode calls fsync.
+
+    Component: StateManager / AppendLogStorage with --durability
+    Purpose: 내구성 설정별로 fsync가 매 쓰기 / flush 시점 / 호출 안 됨으로 동작하는지 확인
+
+    Expected Results:
+    - none never fsyncs
+    - on-flush fsyncs only when the manager flushes
+    - every-write fsyncs during each write
+
+    Test Status: PASS if fsync happens exactly where the mode says
+    """
+    fsyncs = []
+    real_fsync = os.fsync
+    monkeypatch.setattr(storage_module.os, "fsync", lambda fd: fsyncs.append(fd) or real_fsync(fd))
+
+    manager = StateManager(Config(boss_alertness=0, state_path=str(tmp_path), durability=durability))
+    await manager.increase_stress(10)
+    manager.add_history_event("take_a_break", -5, 0)
+    assert bool(fsyncs) == writes_synced
+
+    fsyncs.clear()
+    await manager.close()
+    assert bool(fsyncs) == flush_synced
@@ -0,0 +1,301 @@
+"""
+Tests for subscriptions module.
+
+This module tests chill://state subscriptions:
+- Coalescing a burst of changes into one notification
+- No notification when the levels end up unchanged
+- Notifications for stress growth and boss cooldown without any event
+- Per-session subscribers and dropping clients that went away
+- subscriptions/listen and resources/subscribe / unsubscribe through an MCP client
+"""
+
+import asyncio
+import types
+import warnings
+
+import pytest
+from fastmcp import Client
+from mcp.client.subscriptions import listen
+from mcp.shared.exceptions import MCPDeprecationWarning
+
+from src.clock import VirtualClock
+from src.config import Config
+from src.server import create_server, request_connection
+from src.sessions import SessionRegistry
+from src.state_manager import StateManager
+from src.subscriptions import STATE_URI, StateSubscriptions
+
+
+async def settle():
+    """Let woken tasks (the coalescing window and timers) run."""
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+async def tick(clock, seconds):
+    """Let pending tasks start waiting, move time forward and let them run."""
+    await settle()
+    clock.advance(seconds)
+    await settle()
+
+
+class FakeClient:
+    """Subscriber that records the notifications it gets."""
+
+    def __init__(self, fail: bool = False):
+        self.updates = []
+        self.fail = fail
+
+    async def send_resource_updated(self, uri: str) -> None:
+        if self.fail:
+            raise ConnectionError("client disconnected")
+        self.updates.append(uri)
+
+
+@pytest.fixture
+def clock():
+    """Virtual clock that only moves when the test advances it."""
+    return VirtualClock(start=1_700_000_000)
+
+
+@pytest.fixture
+def manager(clock):
+    """State manager without persistence or boss reactions."""
+    return StateManager(Config(boss_alertness=0, storage="memory"), clock=clock)
+
+
+def subscribe(manager, clock, window=1.0):
+    """Subscribe a fake client to the manager's state."""
+    subscriptions = StateSubscriptions(window, manager.config.boss_alertness_cooldown, clock)
+    manager.add_listener(lambda: subscriptions.changed("default", manager))
+    client = FakeClient()
+    subscriptions.subscribe(None, client, manager)
+    return subscriptions, client
+
+
+@pytest.mark.asyncio
+async def test_burst_is_coalesced(manager, clock):
+    """
+    Test coalescing.
+
+    Component: StateSubscriptions.changed / flush
+    Purpose: 짧은 시간 안의 여러 상태 변경이 하나의 알림으로 합쳐지는지 확인
+
+    Expected Results:
+    - Nothing is sent before the window closes
+    - Five changes make exactly one notification for chill://state
+
+    Test Status: PASS if a burst produces a single notification
+    """
+    subscriptions, client = subscribe(manager, clock)
+
+    for _ in range(5):
+        await manager.increase_stress(10)
+    await settle()
+    assert client.updates == []
+
+    await tick(clock, 1)
+    assert client.updates == [STATE_URI]
+    assert subscriptions.changes == 5
+    assert subscriptions.notifications == 1
+    await subscriptions.close()
+
+
+@pytest.mark.asyncio
+async def test_unchanged_levels_are_not_notified(manager, clock):
+    """
+    Test suppression.
+
+    Component: StateSubscriptions.flush
+    Purpose: 변경이 있었더라도 최종 수준이 같으면 알림을 보내지 않는지 확인
+
+    Expected Results:
+    - A change that is undone within the window sends nothing
+    - The check is counted as suppressed
+
+    Test Status: PASS if unchanged levels produce no notification
+    """
+    subscriptions, client = subscribe(manager, clock)
+
+    await manager.increase_stress(10)
+    await manager.decrease_stress(10)
+    await tick(clock, 1)
+
+    assert client.updates == []
+    assert subscriptions.suppressed == 1
+    await subscriptions.close()
+
+
+@pytest.mark.asyncio
+async def test_time_driven_changes_are_notified(manager, clock):
+    """
+    Test notifications without events.
+
+    Component: StateSubscriptions timers / StateSnapshot.next_change
+    Purpose: 이벤트 없이 시간에 따라 스트레스가 오르거나 Boss 경계가 내려갈 때도 알림이 오는지 확인
+
+    Expected Results:
+    - Stress growth after a full minute sends a notification
+    - Boss cooldown steps send notifications
+    - Nothing more is sent once both levels are at rest
+
+    Test Status: PASS if subscribers never need to poll
+    """
+    subscriptions, client = subscribe(manager, clock)
+
+    await tick(clock, 60)
+    await tick(clock, 1)
+    assert client.updates == [STATE_URI]
+
+    # At rest: stress capped, boss at 0
+    await manager.increase_stress(100)
+    await tick(clock, 1)
+    assert manager.snapshot.next_change(clock.monotonic(), 300) is None
+    notified = len(client.updates)
+    await tick(clock, 3600)
+    assert len(client.updates) == notified
+
+    # Boss cooldown is the only thing moving
+    await manager.change_boss_alert(1)
+    await tick(clock, 1)
+    await tick(clock, 300)
+    await tick(clock, 1)
+    assert len(client.updates) == notified + 2
+    assert manager.boss_alert_level == 0
+    await subscriptions.close()
+
+
+@pytest.mark.asyncio
+async def test_sessions_are_notified_separately(clock):
+    """
+    Test per-session subscriptions through the registry.
+
+    Component: StateSubscriptions / SessionRegistry listener
+    Purpose: 세션별 구독자가 자기 세션의 변경만 알림받고, 끊긴 클라이언트는 정리되는지 확인
+
+    Expected Results:
+    - A change in one session notifies only that session's subscribers
+    - A client whose notification fails is dropped
+    - An unsubscribed client gets nothing
+
+    Test Status: PASS if notifications follow session boundaries
+    """
+    config = Config(boss_alertness=0, storage="memory", session_mode="isolated")
+    subscriptions = StateSubscriptions(1.0, config.boss_alertness_cooldown, clock)
+    registry = SessionRegistry(config, clock=clock, listener=subscriptions.changed)
+    a, b, gone = FakeClient(), FakeClient(), FakeClient(fail=True)
+    subscriptions.subscribe("agent-a", a, registry.get("agent-a"))
+    subscriptions.subscribe("agent-a", gone, registry.get("agent-a"))
+    subscriptions.subscribe("agent-b", b, registry.get("agent-b"))
+    assert len(subscriptions) == 3
+
+    async with registry.session("agent-a") as manager:
+        await manager.increase_stress(10)
+    await tick(clock, 1)
+    assert a.updates == [STATE_URI]
+    assert b.updates == []
+    assert len(subscriptions) == 2
+
+    subscriptions.unsubscribe("agent-a", a)
+    async with registry.session("agent-a") as manager:
+        await manager.increase_stress(10)
+    await tick(clock, 1)
+    assert a.updates == [STATE_URI]
+    assert subscriptions.stats()["subscribers"] == 1
+
+    await subscriptions.close()
+    await registry.close()
+
+
+def server_config():
+    """Server configuration with a short coalescing window and no boss reactions."""
+    return Config(boss_alertness=0, storage="memory", notify_window=0.05)
+
+
+async def next_update(subscription, timeout=0.5):
+    """The next event of a listen stream, or None if none arrives within timeout seconds."""
+    try:
+        return await asyncio.wait_for(subscription.__anext__(), timeout)
+    except asyncio.TimeoutError:
+        return None
+
+
+@pytest.mark.asyncio
+async def test_listen_over_mcp():
+    """
+    Test subscriptions/listen end to end.
+
+    Component: create_server / subscriptions/listen
+    Purpose: MCP 클라이언트의 listen 스트림이 상태 변화마다 하나로 합쳐진 알림을 받고, 변화가 없으면 받지 않는지 확인
+
+    Expected Results:
+    - The server honors a chill://state subscription
+    - chimaek produces exactly one ResourceUpdated for chill://state
+    - take_a_break at zero stress (levels unchanged) produces none
+
+    Test Status: PASS if listeners hear about every change and nothing else
+    """
+    async with Client(create_server(server_config())) as client:
+        async with listen(client.session, resource_subscriptions=[STATE_URI]) as subscription:
+            assert subscription.honored.resource_subscriptions == [STATE_URI]
+
+            await client.call_tool("chimaek", {})
+            update = await next_update(subscription)
+            assert update is not None and update.uri == STATE_URI
+            assert await next_update(subscription) is None
+
+            await client.call_tool("take_a_break", {})
+            assert await next_update(subscription) is None
+
+
+@pytest.mark.asyncio
+async def test_subscribe_and_unsubscribe_over_mcp():
+    """
+    Test resources/subscribe and resources/unsubscribe end to end.
+
+    Component: create_server / resources/subscribe / resources/unsubscribe
+    Purpose: 이전 버전 프로토콜 클라이언트가 구독하면 알림을 받고, 구독을 해지하면 더 이상 받지 않는지 확인
+
+    Expected Results:
+    - A subscribed client gets one notifications/resources/updated after chimaek
+    - After unsubscribing, another chimaek sends nothing
+
+    Test Status: PASS if unsubscribe matches the subscription it ends
+    """
+    updates = []
+
+    async def on_message(message):
+        params = getattr(message, "params", None)
+        if getattr(message, "method", None) == "notifications/resources/updated":
+            updates.append(str(params.uri))
+
+    async with Client(create_server(server_config()), message_handler=on_message, mode="legacy") as client:
+        with warnings.catch_warnings():
+            # Deprecated as of 2026-07-28, still served to older clients
+            warnings.simplefilter("ignore", MCPDeprecationWarning)
+            await client.session.subscribe_resource(STATE_URI)
+            await client.call_tool("chimaek", {})
+            await asyncio.sleep(0.3)
+            assert updates == [STATE_URI]
+
+            await client.session.unsubscribe_resource(STATE_URI)
+            await client.call_tool("chimaek", {})
+            await asyncio.sleep(0.3)
+            assert updates == [STATE_URI]
+
+
+def test_subscriber_without_connection_fails_loudly():
+    """
+    Test identifying a subscriber on an unsupported mcp.
+
+    Component: server.request_connection()
+    Purpose: 요청에서 클라이언트 연결을 찾을 수 없으면 조용히 다른 값으로 대체하지 않고 오류를 내는지 확인
+
+    Expected Results:
+    - RuntimeError instead of falling back to the per-request session
+
+    Test Status: PASS if a missing connection is reported
+    """
+    request = types.SimpleNamespace(session=object())
+    with pytest.raises(RuntimeError, match="_connection"):
+        request_connection(request)
@@ -2,9 +2,11 @@
 
 import pytest
 import re
+from datetime import datetime
 from src.config import Config
 from src.state_manager import StateManager
 from src import tools
+from src.response_formatter import response_verbosity, structured_response
 
 
 @pytest.fixture
@@ -14,9 +16,9 @@ def config():
 
 
 @pytest.fixture
-def state_manager(config):
-    """Create a state manager instance."""
-    return StateManager(config)
+def state_manager(config, clock):
+    """Create a state manager instance on a virtual clock."""
+    return StateManager(config, clock=clock)
 
 
 def validate_response(response_text):
@@ -284,7 +286,7 @@ async def test_email_organizing(state_manager):
 
 
 @pytest.mark.asyncio
-async def test_boss_alert_delay(state_manager):
+async def test_boss_alert_delay(config, clock):
     """
     Test boss alert level 5 delay mechanism.
 
@@ -303,19 +305,169 @@ async def test_boss_alert_delay(state_manager):
 
     Test Status: PASS if delay >= 20.0 seconds and response is valid
     """
-    import time
+    # Virtual clock: the 20 second wait takes no real time
+    state_manager = StateManager(config, clock=clock)
 
     # Set boss alert to maximum level
     state_manager._boss_alert_level = 5
     state_manager._stress_level = 50
 
     # Measure execution time
-    start_time = time.time()
+    start_time = clock.monotonic()
     response = await tools.take_a_break(state_manager)
-    elapsed_time = time.time() - start_time
+    elapsed_time = clock.monotonic() - start_time
 
     # Validate response format
     assert validate_response(response), "Response format validation failed"
 
     # Verify 20 second delay was applied
     assert elapsed_time >= 20.0, f"Expected 20 second delay, but got {elapsed_time:.2f} seconds"
+
+
+@pytest.mark.asyncio
+async def test_query_history(state_manager):
+    """
+    Test query_history tool.
+
+    Tool: query_history
+    Purpose: 시간 범위와 도구 필터로 휴식 기록을 페이지 단위로 조회하는 도구 테스트
+
+    Initial Conditions:
+    - 5 coffee_mission and 5 show_meme events in history
+
+    Expected Results:
+    - Response format is valid
+    - Tool filter only lists matching breaks
+    - A next cursor is offered when more breaks remain
+    - A limit over QUERY_HISTORY_MAX_LIMIT is clamped to it
+    - Invalid dates produce an error summary instead of raising
+
+    Test Status: PASS if the listed breaks match the query
+    """
+    for _ in range(5):
+        state_manager.add_history_event("coffee_mission", -10, 0)
+        state_manager.add_history_event("show_meme", -5, 0)
+
+    response = await tools.query_history(state_manager, tool_name="coffee_mission", limit=3)
+    assert validate_response(response), "Response format validation failed"
+    summary = response.split("Break Summary:")[-1]
+    assert summary.count("coffee_mission (stress -10, boss +0)") == 3
+    assert "show_meme (" not in summary
+    assert "next cursor" in response
+
+    response = await tools.query_history(state_manager, start="2000-01-01T00:00:00", end="2000-01-02")
+    assert "No breaks found" in response
+
+    for _ in range(tools.QUERY_HISTORY_MAX_LIMIT + 10):
+        state_manager.add_history_event("desk_yoga", -1, 0)
+    response = await tools.query_history(state_manager, tool_name="desk_yoga", limit=10**9)
+    assert response.split("Break Summary:")[-1].count("desk_yoga (") == tools.QUERY_HISTORY_MAX_LIMIT
+    assert "next cursor" in response
+
+    response = await tools.query_history(state_manager, start="last tuesday")
+    assert validate_response(response)
+    assert "Invalid history query" in response
+
+
+@pytest.mark.asyncio
+async def test_state_at(state_manager):
+    """
+    Test state_at tool.
+
+    Tool: state_at
+    Purpose: 과거 특정 시점의 스트레스/상사 경계 수준을 조회하는 도구 테스트
+
+    Initial Conditions:
+    - One coffee_mission event in history
+
+    Expected Results:
+    - Response format is valid
+    - The current moment reports the levels after the last change
+    - A time before any record reports that nothing is known
+    - Invalid dates produce an error summary instead of raising
+
+    Test Status: PASS if the reported levels match the recorded state
+    """
+    await state_manager.increase_stress(30)
+    state_manager.add_history_event("coffee_mission", -10, 0)
+    state = await state_manager.get_state()
+
+    state_manager.clock.advance(1)
+    now = datetime.fromtimestamp(state_manager.clock.time()).isoformat()
+    response = await tools.state_at(state_manager, now)
+    assert validate_response(response), "Response format validation failed"
+    assert f"- Stress Level: {state['stress_level']}" in response
+
+    response = await tools.state_at(state_manager, "2000-01-01T00:00:00")
+    assert "No recorded state" in response
+
+    response = await tools.state_at(state_manager, "last tuesday")
+    assert validate_response(response)
+    assert "Invalid point in time" in response
+
+
+@pytest.mark.asyncio
+async def test_tools_follow_response_verbosity(state_manager):
+    """
+    Test per-call response verbosity.
+
+    Tool: take_a_break, chimaek, company_dinner
+    Purpose: 호출별 상세도 설정이 도구 응답에 그대로 적용되는지 확인
+
+    Initial Conditions:
+    - Responses formatted inside response_verbosity("minimal")
+
+    Expected Results:
+    - Responses are only the parseable lines, even for tools with custom art
+    - Response format is still valid
+
+    Test Status: PASS if every tool response is minimal
+    """
+    with response_verbosity("minimal"):
+        for tool in (tools.take_a_break, tools.chimaek, tools.company_dinner):
+            response = await tool(state_manager)
+            assert response.startswith("Break Summary:")
+            assert response.count("\n") == 3
+            assert validate_response(response), "Response format validation failed"
+
+
+@pytest.mark.asyncio
+async def test_tools_record_structured_results(config, clock):
+    """
+    Test structured results of tool calls.
+
+    Tool: chimaek, take_a_break (boss watching), company_dinner
+    Purpose: 도구가 실제로 적용한 수준 변화, 대기 시간, 회식 이벤트를 구조화된 결과로 남기는지 확인
+
+    Initial Conditions:
+    - Stress Level: 10 (chimaek would take off more than is left)
+    - Boss Alert Level: 5 for the delayed call
+
+    Expected Results:
+    - Changes are the applied ones (clamped), not the nominal ones
+    - delay_applied is the 20 second wait when the boss was watching
+    - company_dinner records the event it rolled
+    - Levels match the parseable lines
+
+    Test Status: PASS if the structured results match what happened
+    """
+    state_manager = StateManager(config, clock=clock)
+    state_manager._stress_level = 10
+
+    with structured_response("chimaek") as structured:
+        response = await tools.chimaek(state_manager)
+    assert structured["stress_change"] == -10
+    assert structured["delay_applied"] == 0.0
+    assert f"Stress Level: {structured['stress_level']}\n" in response
+
+    state_manager._boss_alert_level = 5
+    with structured_response("take_a_break") as structured:
+        await tools.take_a_break(state_manager)
+    assert structured["delay_applied"] == 20.0
+    assert structured["boss_alert_level"] == state_manager.boss_alert_level
+
+    with structured_response("company_dinner") as structured:
+        response = await tools.company_dinner(state_manager)
+    event = structured["event"]
+    assert event["title"] in response
+    assert event["positive"] == (event["stress_change"] < 0)